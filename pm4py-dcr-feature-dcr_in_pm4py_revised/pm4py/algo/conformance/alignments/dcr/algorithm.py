@@ -1,4 +1,4 @@
-from pm4py.algo.conformance.alignments.dcr.variants import optimal
+from pm4py.algo.conformance.alignments.dcr.variants import optimal, prefix_trie
 from enum import Enum
 from pm4py.util import exec_utils
 from pm4py.objects.dcr.obj import DcrGraph
@@ -10,6 +10,7 @@ import pandas as pd
 
 class Variants(Enum):
     OPTIMAL = optimal
+    PREFIX_TRIE = prefix_trie
 
 
 def apply(obj: Union[EventLog, Trace], G: DcrGraph, variant=Variants.OPTIMAL, parameters: Optional[Dict[Any, Any]] = None) -> Union[typing.AlignmentResult, typing.ListAlignments]:
@@ -25,6 +26,7 @@ def apply(obj: Union[EventLog, Trace], G: DcrGraph, variant=Variants.OPTIMAL, pa
     variant
         Variant of the DCR alignments to be used. Possible values:
         - Variants.OPTIMAL
+        - Variants.PREFIX_TRIE: the optimal alignments, sharing the search of the variants with a common prefix
     parameters
         Variant-specific parameters.
 
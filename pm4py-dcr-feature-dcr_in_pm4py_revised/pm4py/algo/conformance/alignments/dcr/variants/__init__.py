@@ -1 +1 @@
-from pm4py.algo.conformance.alignments.dcr.variants import optimal
\ No newline at end of file
+from pm4py.algo.conformance.alignments.dcr.variants import optimal, prefix_trie
@@ -27,14 +27,17 @@ References
     DOI <https://doi.org/10.1007/978-3-031-41620-0_1>_.
 """
 
+import time
 import pandas as pd
-from copy import deepcopy, copy
 from typing import Optional, Dict, Any, Union, List, Tuple
 from heapq import heappop, heappush
 from enum import Enum
 
 from pm4py.objects.dcr.obj import DcrGraph
 from pm4py.objects.dcr.semantics import DcrSemantics
+from pm4py.objects.dcr.compiled.obj import iter_indices
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.utils.cache import graph_fingerprint
 from pm4py.util import constants, xes_constants, exec_utils
 from pm4py.objects.log.obj import EventLog, Trace
 from pm4py.objects.conversion.log import converter as log_converter
@@ -46,7 +49,11 @@ class LogAlignment:
     Calls TraceAlignment for each trace to compute optimal alignment for each trace.
 
     After intilializing Log alignment, can call perform_log_alignment() to execute the alignment process for all traces in log
-    which returns a list of result for each alignment procedure
+    which returns a list of result for each alignment procedure.
+    Each variant of the log is aligned once and its result is copied to the traces of the variant, a VariantCache
+    can be given as parameter to reuse the alignments of the variants across calls on graphs with the same content.
+    With a budget per trace (max_states, max_time) or a beam width, the alignments not proven optimal are not
+    put in the VariantCache.
 
     Example usage:
         \nDefine your instances of DCR graph and trace representation as 'graph' and 'trace'\n
@@ -105,9 +112,25 @@ class LogAlignment:
             List[Dict]: a list of dictionaries containing info on alignment and move fitness
         """
         aligned_traces = []
+        graph_handler = DCRGraphHandler(graph)
+        cache = exec_utils.get_param_value(Parameters.VARIANT_CACHE, parameters, None)
+        fingerprint = graph_fingerprint(graph) if cache is not None else None
+        variant_results = {}
         for trace in self.traces:
-            trace_alignment = TraceAlignment(graph, trace, parameters=parameters)
-            aligned_traces = aligned_traces + trace_alignment.perform_alignment()
+            result = variant_results.get(trace)
+            if result is None:
+                result = cache.get(fingerprint, ('alignment', trace)) if cache is not None else None
+                if result is None:
+                    trace_alignment = TraceAlignment(graph, trace, parameters=parameters, graph_handler=graph_handler)
+                    result = trace_alignment.perform_alignment()[0]
+                    # the alignments found within a budget depend on the budget, they are not shared
+                    if cache is not None and result[Outputs.OPTIMAL.value]:
+                        cache.put(fingerprint, ('alignment', trace), result)
+                variant_results[trace] = result
+            result = dict(result)
+            if result[Outputs.ALIGNMENT.value] is not None:
+                result[Outputs.ALIGNMENT.value] = list(result[Outputs.ALIGNMENT.value])
+            aligned_traces.append(result)
         return aligned_traces
 
 class TraceAlignment:
@@ -141,7 +164,7 @@ class TraceAlignment:
     """
 
     def __init__(self, graph: DcrGraph, trace: Union[List[Tuple[str]], pd.DataFrame, EventLog, Trace],
-                 parameters: Optional[Dict] = None):
+                 parameters: Optional[Dict] = None, graph_handler: Optional["DCRGraphHandler"] = None):
         """
         Initializes the facade with a DCR graph and a trace to be processed.
 
@@ -162,6 +185,9 @@ class TraceAlignment:
             A dictionary of parameters that can be used to fine-tune the handling
             of the graph and trace. The exact parameters that can be provided will
             depend on the implementation of the DCRGraphHandler and TraceHandler.
+        graph_handler : Optional[DCRGraphHandler], optional
+            A handler of the same graph to reuse, such that the graph is compiled only once
+            when aligning several traces.
 
         Attributes
         ----------
@@ -174,14 +200,15 @@ class TraceAlignment:
             perform_alignment is called. This will hold the result of the trace
             alignment against the DCR graph.
         """
-        self.graph_handler = DCRGraphHandler(graph)
+        self.graph_handler = DCRGraphHandler(graph) if graph_handler is None else graph_handler
         self.trace_handler = TraceHandler(trace, parameters)
         self.alignment = None  # This will hold an instance of Alignment class after perform_alignment is called
         self.result = None
+        self.parameters = parameters
 
     def perform_alignment(self):
         # Perform the alignment process and store the result in the self.alignment attribute
-        self.alignment = Alignment(self.graph_handler, self.trace_handler)
+        self.alignment = Alignment(self.graph_handler, self.trace_handler, parameters=self.parameters)
         self.result = self.alignment.apply_trace()
         self.get_performance_metrics()
         return [self.result]
@@ -205,12 +232,42 @@ class Parameters(Enum):
         SYNC_COST: The cost of a synchronous move during the alignment.
         MODEL_COST: The cost of a model move during the alignment.
         LOG_COST: The cost of a log move during the alignment.
+        HEURISTIC: The heuristic guiding the search, one of the values of Heuristics (default: Heuristics.NONE).
+        VARIANT_CACHE: A VariantCache to reuse the alignments of the variants across calls (default: None).
+        MAX_STATES: The maximum number of states expanded per trace, after which the best alignment found so far
+            is returned (default: None, no limit).
+        MAX_TIME: The maximum time in seconds spent per trace, after which the best alignment found so far
+            is returned (default: None, no limit).
+        BEAM_WIDTH: The maximum number of open states kept during the search, the states with the highest
+            priority are dropped beyond it (default: None, no limit).
     """
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     SYNC_COST = 0
     MODEL_COST = 1
     LOG_COST = 1
+    HEURISTIC = "heuristic"
+    VARIANT_CACHE = "variant_cache"
+    MAX_STATES = "max_states"
+    MAX_TIME = "max_time"
+    BEAM_WIDTH = "beam_width"
+
+
+class Heuristics(Enum):
+    """
+    Enumeration of the heuristics available for the search of the optimal alignment.
+
+    Attributes:
+        NONE: No heuristic, the search is a uniform-cost search on the accumulated cost.
+        LOWER_BOUND: A* search with an admissible lower bound on the remaining cost, summing
+            - the remaining trace events whose activity is not in the graph,
+            - the remaining trace events that can never be included again, according to a precomputed
+              include reachability analysis,
+            - the model moves needed for included pending events that no remaining trace event can execute,
+              exclude or make not pending.
+    """
+    NONE = "none"
+    LOWER_BOUND = "lower_bound"
 
 
 class Outputs(Enum):
@@ -226,6 +283,10 @@ class Outputs(Enum):
         MODEL_MOVE_FITNESS = the key for accessing the model move fitness
         LOG_MOVE_FITNESS = the key for accessing the log move fitness
         ALIGN_FITNESS = the key for accessing the alignment fitness
+        OPTIMAL: The key for accessing whether the alignment is known to be optimal, False if the search was stopped
+            by its budget or beam width before proving it
+        LOWER_BOUND: The key for accessing the lower bound on the optimal cost reached by the search, equal to the
+            cost if the alignment is optimal
     """
     ALIGNMENT = "alignment"
     COST = "cost"
@@ -234,6 +295,11 @@ class Outputs(Enum):
     GLOBAL_MIN = "global_min"
     ALIGN_FITNESS = 'fitness'
     BEST_WORST_COST = "bwc"
+    OPTIMAL = "optimal"
+    LOWER_BOUND = "lower_bound"
+
+# number of markings searched for the model moves completing an alignment, when the search is stopped early
+MAX_COMPLETION_STATES = 1 << 14
 
 class Performance:
     def __init__(self, alignment, graph_handler, trace_handler):
@@ -259,13 +325,19 @@ class Performance:
         ----------
         * [1] C. Josep et al., "Conformance Checking Software",  Springer International Publishing, 82-91, 2018. `DOI <https://doi.org/10.1007/978-3-319-99414-7>`_.
         """
-        # run model with empty trace
+        # run model with empty trace, the cost only depends on the graph so it is computed once per handler
         worst_case_trace = len(self.trace_handler.trace)
-        self.trace_handler.trace = ()
-        # compute worst_best_alignment
-        best_worst_alignment = Alignment(self.graph_hanlder, self.trace_handler)
-        best_worst_result = best_worst_alignment.apply_trace()
-        bwc = (worst_case_trace + best_worst_result[Outputs.COST.value])
+        empty_trace_cost = self.graph_hanlder.empty_trace_cost
+        if empty_trace_cost is None:
+            # compute worst_best_alignment, within the same budget as the alignment of the trace
+            best_worst_alignment = Alignment(self.graph_hanlder, TraceHandler((), None),
+                                             parameters=self.alignment.parameters)
+            best_worst_result = best_worst_alignment.apply_trace()
+            empty_trace_cost = best_worst_result[Outputs.COST.value]
+            # a cost found within the budget is only an upper bound, it is not kept for the other traces
+            if best_worst_result[Outputs.OPTIMAL.value]:
+                self.graph_hanlder.empty_trace_cost = empty_trace_cost
+        bwc = (worst_case_trace + empty_trace_cost)
         fitness = 1 - (self.alignment.global_min / (bwc) if bwc > 0 else 0)
         return fitness, bwc
 
@@ -354,11 +426,15 @@ class DCRGraphHandler:
 
         The DCR graph follows the semantics defined in the DCR semantics module, and this class
         acts as an interface to apply these semantics for the purpose of alignment computation.
+        The search itself runs on the compiled graph, where a marking is an immutable and hashable
+        tuple of (executed, included, pending) bitmasks.
 
         Attributes
         ----------
         graph : DcrGraph
             The DCR graph on which the operations are to be performed.
+        compiled : CompiledDcrGraph
+            The compiled graph used to compute the states of the search.
 
         Methods
         -------
@@ -372,6 +448,18 @@ class DCRGraphHandler:
             Executes an event on the DCR graph, which may result in a transition to a new state.
             If the execution is not possible, it returns the current graph state.
 
+        enabled_in(marking) -> int:
+            Mask of the enabled events in a compiled marking.
+
+        execute_in(event, marking) -> Tuple[int, int, int]:
+            Executes the event with the given index in a compiled marking, returning the successor marking.
+
+        is_accepting_in(marking) -> bool:
+            Checks if a compiled marking is accepting.
+
+        get_lower_bound_analysis() -> Dict[str, Any]:
+            Static analysis of the graph used by the lower bound heuristic, computed once per handler.
+
         Parameters
         ----------
         graph : DcrGraph
@@ -387,6 +475,9 @@ class DCRGraphHandler:
         if not isinstance(graph, DcrGraph):
             raise TypeError(f"Expected a DCR_Graph object, got {type(graph)} instead")
         self.graph = graph
+        self.compiled = graph.compile()
+        self.empty_trace_cost = None
+        self.lower_bound_analysis = None
 
     def is_enabled(self, event: Any) -> bool:
         return DcrSemantics.is_enabled(event, self.graph)
@@ -403,6 +494,61 @@ class DCRGraphHandler:
             return curr_graph
         return new_graph
 
+    def enabled_in(self, marking: Tuple[int, int, int]) -> int:
+        return CompiledSemantics.enabled(self.compiled, marking)
+
+    def is_enabled_in(self, event: int, marking: Tuple[int, int, int]) -> bool:
+        return CompiledSemantics.is_enabled(event, self.compiled, marking)
+
+    def execute_in(self, event: int, marking: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        return CompiledSemantics.execute(self.compiled, marking, event)
+
+    def is_accepting_in(self, marking: Tuple[int, int, int]) -> bool:
+        return CompiledSemantics.is_accepting(self.compiled, marking)
+
+    def get_lower_bound_analysis(self) -> Dict[str, Any]:
+        """
+        Computes the static analysis of the graph used by the lower bound heuristic:
+            - 'clears': for each event, the mask of pending events its execution resolves
+              (itself, the events it excludes and the events it makes not pending)
+            - 'max_clear': the maximum number of pending events resolved by a single execution
+            - 'never_included': the mask of events that, once excluded, can never be included again,
+              as none of their includers can ever be included from the initial marking
+
+        Returns
+        -------
+        dict
+            The analysis, computed at the first call and cached on the handler.
+        """
+        if self.lower_bound_analysis is None:
+            compiled = self.compiled
+            n = len(compiled)
+            # events that can be included in some reachable marking, over-approximated by the fixpoint of includes
+            live = compiled.initial_marking[1]
+            frontier = live
+            while frontier:
+                reached = 0
+                for i in iter_indices(frontier):
+                    reached |= compiled.includes[i]
+                frontier = reached & ~live
+                live |= frontier
+            includers = [0] * n
+            for i in iter_indices(live):
+                for j in iter_indices(compiled.includes[i]):
+                    includers[j] |= 1 << i
+            never_included = 0
+            for j in range(n):
+                if not includers[j]:
+                    never_included |= 1 << j
+            clears = [compiled.excludes[i] | compiled.noresponses[i] | (1 << i) for i in range(n)]
+            self.lower_bound_analysis = {
+                'clears': clears,
+                'max_clear': max([bin(c).count("1") for c in clears], default=1),
+                'never_included': never_included,
+            }
+        return self.lower_bound_analysis
+
+
 class Alignment:
     def __init__(self, graph_handler: DCRGraphHandler, trace_handler: TraceHandler, parameters: Optional[Dict] = None):
         """
@@ -410,6 +556,10 @@ class Alignment:
         This constructor initializes the alignment with the provided DCR graph and trace handlers. It sets up
         all necessary data structures for computing the alignment and its costs.
 
+        A state of the search is the pair (marking, position), where the marking is the compiled,
+        hashable marking of the graph and the position is the index of the next trace event to align.
+        Neither the graph nor the trace are copied while searching.
+
         Parameters
         ----------
         graph_handler : DCRGraphHandler
@@ -421,85 +571,104 @@ class Alignment:
         """
         self.graph_handler = graph_handler
 
-        if parameters is None:
+        if parameters is None or not isinstance(parameters, dict):
             parameters = {}
         activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
         parameters[Parameters.ACTIVITY_KEY.value] = activity_key
+        heuristic = exec_utils.get_param_value(Parameters.HEURISTIC, parameters, Heuristics.NONE)
 
         self.trace_handler = TraceHandler(trace_handler.trace, parameters)
+        self.trace = tuple(self.trace_handler.trace)
+        # the event ID and the compiled index of every trace event, the index is None if not in the graph
+        self.trace_events = tuple(self.graph_handler.graph.get_event(act) for act in self.trace)
+        self.trace_indices = tuple(self.graph_handler.compiled.index_of(e) for e in self.trace_events)
 
         self.open_set = []
         self.max_cost = 0
         self.global_min = float('inf')
         self.closed_set = {}
-        self.visited_states = set()
+        self.visited_states = {}
         self.new_moves = []
         self.final_alignment = []
-        self.initial_marking = deepcopy(self.graph_handler.graph.marking)
-
-    def handle_state(self, curr_cost, curr_graph, curr_trace, event, moves, move_type=None):
+        self.counter = 0
+        self.heuristic = None
+        if Heuristics(heuristic) == Heuristics.LOWER_BOUND:
+            self.init_lower_bound()
+
+        # anytime mode: the search stops after max_states expanded states or max_time seconds
+        self.parameters = parameters
+        self.max_states = exec_utils.get_param_value(Parameters.MAX_STATES, parameters, None)
+        self.max_time = exec_utils.get_param_value(Parameters.MAX_TIME, parameters, None)
+        self.beam_width = exec_utils.get_param_value(Parameters.BEAM_WIDTH, parameters, None)
+        # lowest priority of the states dropped from the beam, a lower bound on the alignments through them
+        self.pruned_bound = float('inf')
+        # the state closest to the end of the trace, from which an alignment is completed if none was found
+        self.deepest_state = None
+
+    def handle_state(self, curr_cost, curr_marking, curr_pos, event, moves, move_type=None):
         """
         Manages the transition to a new state in the alignment algorithm based on the specified move type.
-        It computes the new state, checks for execution equivalency to avoid re-processing, and if unique,
-        updates the visited states and the priority queue for further processing.
+        It computes the new state and, if it was not reached before with a lower or equal cost,
+        records it in the visited states and pushes it on the priority queue for further processing.
 
         Parameters
         ----------
         curr_cost : int
             The current cost of the alignment.
-        curr_graph : DcrGraph
-            The current state of the DCR graph.
-        curr_trace : list
-            The current state of the trace.
-        event : Any
-                The event from the trace that is being considered in the current alignment step.
-        moves : list
-            The list of moves made so far.
+        curr_marking : Tuple[int, int, int]
+            The current compiled marking of the DCR graph.
+        curr_pos : int
+            The position of the next trace event to align.
+        event : int
+            The index of the event that is being considered in the current alignment step.
+        moves : Tuple
+            The moves made so far, as a linked list of (move, previous moves).
         move_type : str, optional
             The type of move to make. This should be one of "sync", "model", or "log". Default is None.
 
-        Returns
-        -------
-        None
-
-        Raises
-        ------
-        None
-
         Notes
         -----
         - This method interfaces with the `get_new_state` method to compute the new state.
-        - It employs a heap-based priority queue to manage the processing order of states based on their costs.
-        - Execution equivalency check is performed to reduce redundant processing of similar states.
+        - It employs a heap-based priority queue to manage the processing order of states based on their costs,
+          plus the estimate of the remaining cost when a heuristic is selected.
         """
-        if moves is None:
-            moves = []
-
-        new_cost, new_graph, new_trace, new_move = self.get_new_state(curr_cost, curr_graph, curr_trace, event,
+        new_cost, new_marking, new_pos, new_move = self.get_new_state(curr_cost, curr_marking, curr_pos, event,
                                                                       move_type)
 
-        state_representation = (str(new_graph), tuple(map(str, new_trace)))
-        if state_representation not in self.visited_states:
-            self.visited_states.add(state_representation)
-            new_moves = moves + [new_move]
-            heappush(self.open_set, (new_cost, new_graph, new_trace, str(new_graph), new_moves))
+        state_representation = (new_marking, new_pos)
+        if new_cost < self.visited_states.get(state_representation, float('inf')):
+            self.visited_states[state_representation] = new_cost
+            self.counter += 1
+            priority = new_cost if self.heuristic is None else new_cost + self.heuristic(new_marking, new_pos)
+            heappush(self.open_set, (priority, self.counter, new_cost, new_marking, new_pos, (new_move, moves)))
+            if self.beam_width is not None and len(self.open_set) > 2 * self.beam_width:
+                self.prune_open_set()
 
-    def get_new_state(self, curr_cost, curr_marking, curr_trace, event, move_type):
+    def prune_open_set(self):
+        """
+        Keeps the beam_width open states with the lowest priority, and records the lowest priority dropped.
+        The open set is sorted, hence it remains a heap.
+        """
+        self.open_set.sort()
+        self.pruned_bound = min(self.pruned_bound, self.open_set[self.beam_width][0])
+        del self.open_set[self.beam_width:]
+
+    def get_new_state(self, curr_cost, curr_marking, curr_pos, event, move_type):
         """
         Computes the new state of the alignment algorithm based on the current state and
-        the specified move type. The new state includes the updated cost, graph, trace,
+        the specified move type. The new state includes the updated cost, marking, trace position
         and move. This method handles three types of moves: synchronous, model, and log.
 
         Parameters
         ----------
         curr_cost : int
             The current cost of the alignment.
-        curr_graph : DcrGraph
-            The current state of the DCR graph.
-        curr_trace : list
-            The current state of the trace.
-        moves : list
-            The list of moves made so far.
+        curr_marking : Tuple[int, int, int]
+            The current compiled marking of the DCR graph.
+        curr_pos : int
+            The position of the next trace event to align.
+        event : int
+            The index of the event of the move, None for a log move of an event not in the graph.
         move_type : str
             The type of move to make. This should be one of "sync", "model", or "log".
 
@@ -508,37 +677,96 @@ class Alignment:
         tuple
             A tuple containing four elements:
             - new_cost : int, the updated cost of the alignment.
-            - new_graph : DCR_Graph, the updated state of the DCR graph.
-            - new_trace : list, the updated state of the trace.
+            - new_marking : Tuple[int, int, int], the updated marking of the DCR graph.
+            - new_pos : int, the updated position in the trace.
             - new_move : tuple, a tuple representing the move made, formatted as (move_type, first_activity).
 
         Example
         -------
-        new_cost, new_graph, new_trace, new_move = get_new_state(curr_cost, curr_graph, curr_trace, moves, "sync")
+        new_cost, new_marking, new_pos, new_move = get_new_state(curr_cost, curr_marking, curr_pos, event, "sync")
 
         """
         new_cost = curr_cost
-        self.graph_handler.graph.marking = deepcopy(curr_marking)
-        new_graph = self.graph_handler.graph
-        new_trace = curr_trace
+        new_marking = curr_marking
+        new_pos = curr_pos
         new_move = None
         if move_type == "sync":
             new_cost += Parameters.SYNC_COST.value
-            new_move = (event, event)
-            new_trace = curr_trace[1:]
-            new_graph = self.graph_handler.execute(event, new_graph)
+            new_move = (self.trace_events[curr_pos], self.trace_events[curr_pos])
+            new_pos = curr_pos + 1
+            new_marking = self.graph_handler.execute_in(event, curr_marking)
 
         elif move_type == "model":
             new_cost += Parameters.MODEL_COST.value
-            new_move = (event, ">>")
-            new_graph = self.graph_handler.execute(event, new_graph)
+            event_id = self.graph_handler.compiled.events[event]
+            new_move = (event_id, ">>")
+            new_marking = self.graph_handler.execute_in(event, curr_marking)
 
         elif move_type == "log":
             new_cost += Parameters.LOG_COST.value
-            new_move = (">>", event)
-            new_trace = curr_trace[1:]
+            new_move = (">>", self.trace_events[curr_pos])
+            new_pos = curr_pos + 1
+
+        return new_cost, new_marking, new_pos, new_move
+
+    def init_lower_bound(self):
+        """
+        Precomputes, for every position of the trace, the data needed by the lower bound heuristic:
+        the number of remaining events not in the graph, the mask of remaining events, the mask of pending
+        events the remaining events can resolve, and the remaining occurrences of every event of the trace.
+        """
+        analysis = self.graph_handler.get_lower_bound_analysis()
+        clears = analysis['clears']
+        n = len(self.trace)
+        self.suffix_unknown = [0] * (n + 1)
+        self.suffix_present = [0] * (n + 1)
+        self.suffix_clear = [0] * (n + 1)
+        self.suffix_count = {i: [0] * (n + 1) for i in self.trace_indices if i is not None}
+        for pos in range(n - 1, -1, -1):
+            idx = self.trace_indices[pos]
+            self.suffix_unknown[pos] = self.suffix_unknown[pos + 1]
+            self.suffix_present[pos] = self.suffix_present[pos + 1]
+            self.suffix_clear[pos] = self.suffix_clear[pos + 1]
+            for i, counts in self.suffix_count.items():
+                counts[pos] = counts[pos + 1]
+            if idx is None:
+                self.suffix_unknown[pos] += 1
+            else:
+                self.suffix_present[pos] |= 1 << idx
+                self.suffix_clear[pos] |= clears[idx]
+                self.suffix_count[idx][pos] += 1
+        self.never_included = analysis['never_included']
+        self.max_clear = analysis['max_clear']
+        self.heuristic = self.lower_bound
+
+    def lower_bound(self, marking, pos):
+        """
+        Admissible estimate of the cost needed to align the rest of the trace from a state.
+        Log moves and model moves are counted separately, so the bounds add up:
+            - every remaining event not in the graph, or excluded and never included again, is a log move
+            - the included pending events that no remaining event resolves need model moves,
+              each model move resolving at most max_clear of them
+
+        Parameters
+        ----------
+        marking : Tuple[int, int, int]
+            The compiled marking of the state.
+        pos : int
+            The position of the next trace event to align.
 
-        return new_cost, deepcopy(new_graph.marking), new_trace, new_move
+        Returns
+        -------
+        int
+            The lower bound on the remaining cost.
+        """
+        executed, included, pending = marking
+        h = self.suffix_unknown[pos]
+        for i in iter_indices(~included & self.never_included & self.suffix_present[pos]):
+            h += self.suffix_count[i][pos]
+        unresolved = included & pending & ~self.suffix_clear[pos]
+        if unresolved:
+            h += -(-bin(unresolved).count("1") // self.max_clear)
+        return h
 
     def update_closed_and_visited_sets(self, curr_cost, state_repr):
         self.closed_set[state_repr] = curr_cost
@@ -546,19 +774,18 @@ class Alignment:
     def process_current_state(self, current):
         """
         Process the current state in the alignment process.
-        This method processes the current state of the alignment, updates the graph handler
-        with the current graph, and prepares the state representation for further processing.
+        This method unpacks the current state popped from the priority queue, and prepares the
+        hashable state representation for further processing.
 
         Parameters
         ----------
         current : Tuple
-            The current state, which is a tuple containing the current cost, current graph,
-            current trace, and the moves made up to this point.
+            The current state, which is a tuple containing the priority, a tie-breaking counter, the current cost,
+            the current marking, the current trace position, and the moves made up to this point.
         """
-        curr_cost, curr_marking, curr_trace, _, moves = current
-        self.graph_handler.graph.marking = deepcopy(curr_marking)
-        state_repr = (str(self.graph_handler.graph.marking), tuple(map(str, curr_trace)))
-        return curr_cost, curr_marking, curr_trace, state_repr, moves
+        _, _, curr_cost, curr_marking, curr_pos, moves = current
+        state_repr = (curr_marking, curr_pos)
+        return curr_cost, curr_marking, curr_pos, state_repr, moves
 
     def check_accepting_conditions(self, curr_cost, is_accepting):
         """
@@ -597,6 +824,8 @@ class Alignment:
             - Parameters.ACTIVITY_KEY: Specifies the key to use for activity names in the trace data.
             - Parameters.CASE_ID_KEY: Specifies the key to use for case IDs in the trace data.
             If not provided or None, default values are used.
+            The budget of the search (Parameters.MAX_STATES, Parameters.MAX_TIME) and the beam width
+            (Parameters.BEAM_WIDTH) are given at the initialization of the alignment.
 
         Returns
         -------
@@ -607,6 +836,9 @@ class Alignment:
             - 'visited': The number of states visited during the alignment algorithm.
             - 'closed': The number of closed states during the alignment algorithm.
             - 'global_min': The global minimum cost found during the alignment algorithm.
+            - 'optimal': False if the search was stopped before proving the alignment optimal, in which case the
+              alignment is the best one found or completed from the states reached.
+            - 'lower_bound': The lower bound on the optimal cost reached by the search.
 
         Example
         -------
@@ -616,39 +848,140 @@ class Alignment:
         """
 
         visited, closed, cost, self.final_alignment, final_cost = 0, 0, 0, None, float('inf')
-        self.open_set.append(
-            (cost, deepcopy(self.graph_handler.graph.marking), self.trace_handler.trace,
-             str(self.graph_handler.graph.marking), []))
+        initial_marking = self.graph_handler.compiled.initial_marking
+        self.visited_states[(initial_marking, 0)] = cost
+        priority = cost if self.heuristic is None else self.heuristic(initial_marking, 0)
+        self.open_set.append((priority, self.counter, cost, initial_marking, 0, None))
+        deadline = time.perf_counter() + self.max_time if self.max_time is not None else None
+        # lowest priority among the states left in the open set, when the search is stopped early
+        frontier_bound = float('inf')
 
         # perform while loop to iterate through all states
         while self.open_set:
+            if (self.max_states is not None and closed >= self.max_states) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                frontier_bound = self.open_set[0][0]
+                break
             current = heappop(self.open_set)
             visited += 1
             result = self.process_current_state(current)
-            # if the state has already been visited, and associated cost with the state is lower than skip
-            if self.skip_current(result) and result is not None:
-                continue
-            curr_cost, curr_trace, state_repr, moves = result[0], result[2], result[3], result[4]
-            # if curr_cost is greater than final cost, no reason to explore this branch
-            if curr_cost > final_cost:
+            # if the state has already been closed with a lower or equal cost, skip
+            if self.skip_current(result):
                 continue
+            curr_cost, curr_marking, curr_pos, state_repr, moves = result
+            # states are popped by increasing cost (plus admissible estimate), no state left can improve on the final cost
+            if current[0] >= final_cost:
+                break
             self.update_closed_and_visited_sets(curr_cost, state_repr)
             closed += 1
-            self.trace_handler.trace = curr_trace
-            if self.graph_handler.is_accepting() and self.trace_handler.is_empty():
-                self.new_moves = moves
-                final_cost = self.check_accepting_conditions(curr_cost, self.graph_handler.is_accepting())
+            if curr_pos == len(self.trace) and self.graph_handler.is_accepting_in(curr_marking):
+                self.new_moves = self.unroll_moves(moves)
+                final_cost = self.check_accepting_conditions(curr_cost, True)
                 self.max_cost = final_cost
+                continue
+            if self.deepest_state is None or (curr_pos, -curr_cost) > (self.deepest_state[2], -self.deepest_state[0]):
+                self.deepest_state = (curr_cost, curr_marking, curr_pos, moves)
 
             self.perform_moves(curr_cost, current, moves)
 
-        return self.construct_results(visited, closed, final_cost)
+        lower_bound = min(final_cost, frontier_bound, self.pruned_bound)
+        optimal = final_cost <= lower_bound
+        if not optimal:
+            # keep the best of the alignment found so far and of the alignments completed from the state closest to
+            # the end of the trace, the most promising open state and the initial state, the latter also with log
+            # moves only as in the worst case alignment of the fitness
+            starts = [(cost, initial_marking, 0, None, False), (cost, initial_marking, 0, None, True)]
+            if self.deepest_state is not None:
+                starts.append(self.deepest_state + (True,))
+            if self.open_set:
+                starts.append(self.open_set[0][2:] + (True,))
+            for start in starts:
+                completion_cost, completion = self.complete_alignment(*start)
+                if completion_cost < final_cost:
+                    final_cost, self.final_alignment, self.global_min = completion_cost, completion, completion_cost
+
+        results = self.construct_results(visited, closed, final_cost)
+        results[Outputs.OPTIMAL.value] = optimal
+        results[Outputs.LOWER_BOUND.value] = lower_bound
+        return results
+
+    def complete_alignment(self, curr_cost, curr_marking, curr_pos, moves, sync=True):
+        """
+        Completes an alignment from a state when the search is stopped before reaching the end of the trace:
+        the remaining trace events are aligned greedily, as synchronous moves when enabled and log moves otherwise,
+        then the fewest model moves reaching an accepting marking are searched breadth-first, among at most
+        MAX_COMPLETION_STATES markings.
+
+        Parameters
+        ----------
+        curr_cost : int
+            The cost of the state.
+        curr_marking : Tuple[int, int, int]
+            The compiled marking of the state.
+        curr_pos : int
+            The position of the next trace event to align.
+        moves : Tuple
+            The moves made to reach the state, as a linked list.
+        sync : bool
+            If False, the remaining trace events are aligned as log moves only.
+
+        Returns
+        -------
+        tuple
+            The cost of the completed alignment and its moves, `float('inf')` and None if no accepting marking
+            was reached.
+        """
+        for pos in range(curr_pos, len(self.trace)):
+            event = self.trace_indices[pos]
+            move_type = "log"
+            if sync and event is not None and self.graph_handler.is_enabled_in(event, curr_marking):
+                move_type = "sync"
+            curr_cost, curr_marking, _, move = self.get_new_state(curr_cost, curr_marking, pos, event, move_type)
+            moves = (move, moves)
+
+        layer = [(curr_marking, moves)]
+        seen = {curr_marking}
+        while layer and len(seen) <= MAX_COMPLETION_STATES:
+            next_layer = []
+            for marking, marking_moves in layer:
+                if self.graph_handler.is_accepting_in(marking):
+                    return curr_cost, self.unroll_moves(marking_moves)
+                for event in iter_indices(self.graph_handler.enabled_in(marking)):
+                    new_marking = self.graph_handler.execute_in(event, marking)
+                    if new_marking not in seen:
+                        seen.add(new_marking)
+                        move = (self.graph_handler.compiled.events[event], ">>")
+                        next_layer.append((new_marking, (move, marking_moves)))
+            layer = next_layer
+            curr_cost += Parameters.MODEL_COST.value
+        return float('inf'), None
 
     def skip_current(self, result):
-        # if state is visited, and cost is the same skip
+        # if state is closed, and cost is not lower skip
         curr_cost, state_repr = result[0], result[3]
-        visitCost = self.closed_set.get(state_repr, float("inf"))
-        return visitCost <= curr_cost and visitCost is not float("inf")
+        return self.closed_set.get(state_repr, float("inf")) <= curr_cost
+
+    @staticmethod
+    def unroll_moves(moves):
+        """
+        Converts the linked list of moves kept in the search states to the list of moves, in order of execution.
+
+        Parameters
+        ----------
+        moves : Tuple
+            The moves as nested (move, previous moves) tuples, None for no moves.
+
+        Returns
+        -------
+        list
+            The list of moves.
+        """
+        res = []
+        while moves is not None:
+            res.append(moves[0])
+            moves = moves[1]
+        res.reverse()
+        return res
 
     def perform_moves(self, curr_cost, current, moves):
         """
@@ -666,27 +999,25 @@ class Alignment:
             The cost associated with the current state before performing any moves.
         current : tuple
             The current state represented as a tuple containing the following:
-            - current[0]: The current cumulative cost associated with the trace.
-            - current[1]: The current state of the graph representing the model.
-            - current[2]: The current position in the trace.
-            - current[3]: A placeholder for additional information (if any).
-            - current[4]: The list of moves performed to reach this state.
-        moves : list
-            The list of moves performed so far to reach the current state. This will be updated with new moves
-            as they are performed.
-
-        """
-        self.graph_handler.graph.marking = current[1]
-        first_activity = self.graph_handler.graph.get_event(self.trace_handler.get_first_activity())
-        enabled = self.graph_handler.enabled()
-        is_enabled = self.graph_handler.is_enabled(first_activity)
-        if first_activity:
-            if is_enabled:
-                self.handle_state(curr_cost, current[1], current[2], first_activity, moves, "sync")
+            - current[0]: The priority of the state, its cost plus the estimate of the heuristic.
+            - current[1]: A tie-breaking counter for the priority queue.
+            - current[2]: The current cumulative cost associated with the trace.
+            - current[3]: The current compiled marking of the model.
+            - current[4]: The current position in the trace.
+            - current[5]: The moves performed to reach this state.
+        moves : Tuple
+            The moves performed so far to reach the current state, as a linked list.
+
+        """
+        curr_marking, curr_pos = current[3], current[4]
+        if curr_pos < len(self.trace):
+            first_activity = self.trace_indices[curr_pos]
+            if first_activity is not None and self.graph_handler.is_enabled_in(first_activity, curr_marking):
+                self.handle_state(curr_cost, curr_marking, curr_pos, first_activity, moves, "sync")
                 return
-            self.handle_state(curr_cost, current[1], current[2], first_activity, moves, "log")
-        for event in enabled:
-            self.handle_state(curr_cost, current[1], current[2], event, moves, "model")
+            self.handle_state(curr_cost, curr_marking, curr_pos, first_activity, moves, "log")
+        for event in iter_indices(self.graph_handler.enabled_in(curr_marking)):
+            self.handle_state(curr_cost, curr_marking, curr_pos, event, moves, "model")
 
     def construct_results(self, visited, closed, final_cost):
         """
@@ -713,7 +1044,6 @@ class Alignment:
             - 'model move fitness': the fitness provided that model moves are used
             - 'log move fitness': the fitness provided by the log moves
         """
-        self.graph_handler.graph.marking = self.initial_marking
         return {
             Outputs.ALIGNMENT.value: self.final_alignment,
             Outputs.COST.value: final_cost,
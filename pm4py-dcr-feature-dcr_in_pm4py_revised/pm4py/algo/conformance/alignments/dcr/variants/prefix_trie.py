@@ -0,0 +1,340 @@
+"""
+This module contains an implementation of the optimal alignments between DCR graphs and the traces of a log
+that shares the search between the variants with a common prefix, with the moves and costs of the optimal
+variant [1].
+
+Overview:
+The search of the optimal variant is on the states (marking, position), where the position is the index of the
+next trace event to align. Every move either stays at the same position (model moves) or advances by one
+(synchronous and log moves), and the moves available at a position only depend on the trace event at that position.
+Hence the states of a position, and their cost from the initial state, only depend on the prefix of the trace
+before that position.
+
+The variants of the log are stored in a prefix trie. Each node of the trie holds the states entering the position
+of its prefix, and each edge leaving a node holds a Dijkstra search of the states of the position, for the next
+activity of the edge (or for the end of the trace). The searches are resumable: a variant is aligned by settling
+the searches of its path up to an increasing cost, until an accepting marking is settled at the end of the trace.
+The states settled for a prefix are reused by every variant with that prefix, such that the work grows with the
+size of the trie rather than with the sum of the lengths of the variants.
+
+Central to the module are the following classes:
+
+- `TrieNode`: A prefix of the variants, with the states entering its position.
+- `TrieEdge`: The resumable search of the states of a position, for the next activity of a prefix.
+- `PrefixTrieAlignment`: Builds the trie of the variants and aligns them.
+
+References
+----------
+.. [1]
+    A. K. F. Christfort, T. Slaats, "Efficient Optimal Alignment Between Dynamic Condition Response Graphs and Traces",
+    in Business Process Management, Springer International Publishing, 2023, pp. 3-19.
+    DOI <https://doi.org/10.1007/978-3-031-41620-0_1>_.
+"""
+
+import pandas as pd
+from typing import Optional, Dict, Any, Union, List, Tuple
+from heapq import heappop, heappush
+
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.dcr.compiled.obj import iter_indices
+from pm4py.algo.conformance.alignments.dcr.variants.optimal import Parameters, Outputs, DCRGraphHandler, Alignment
+from pm4py.algo.conformance.alignments.dcr.variants import optimal
+from pm4py.util import constants, xes_constants, exec_utils
+from pm4py.objects.log.obj import EventLog, Trace
+from pm4py.objects.conversion.log import converter as log_converter
+
+# symbol of the edges of the trie searching the end of the trace
+END = object()
+
+
+class TrieNode:
+    """
+    A prefix of the variants of the log.
+
+    Attributes:
+        entries (List[Tuple]): The states entering the position of the prefix, as (cost, marking, moves),
+            appended by the search of the edge leading to the node, in order of settlement.
+        children (Dict[Any, TrieEdge]): The edges leaving the node, by the activity following the prefix,
+            or END for a variant ending with the prefix.
+        remaining (int): The number of variants through the node left to align, the states of the node are
+            released once all the variants are aligned.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.children = {}
+        self.remaining = 0
+
+
+class TrieEdge:
+    """
+    The resumable Dijkstra search of the states of the position of a prefix, for the activity following the prefix.
+
+    At a state of the position, a synchronous move is made if the following event is enabled, otherwise a log move
+    is made and every enabled event can be executed as a model move, as in the optimal variant. At the end of the
+    trace, only model moves are made and the accepting markings are the goals.
+
+    Attributes:
+        source (TrieNode): The node of the prefix.
+        target (Optional[TrieNode]): The node of the prefix extended with the activity, None for the end of the trace.
+        event (Optional[int]): The compiled index of the event of the activity, None if it is not in the graph.
+        event_id (Any): The event ID of the activity, as reported in the moves.
+        open_set (List[Tuple]): The heap of the states of the position to settle.
+        settled (Dict): The settled markings of the position with their cost.
+        cursor (int): The number of entries of the source node pushed on the heap.
+        threshold (float): The cost up to which the states of the position are settled.
+        goal (Optional[Tuple]): For the end of the trace, the cost and moves of the first accepting marking settled.
+        remaining (int): The number of variants through the edge left to align, the search is released once all
+            the variants are aligned.
+    """
+
+    def __init__(self, source: TrieNode, target: Optional[TrieNode], event: Optional[int], event_id: Any):
+        self.source = source
+        self.target = target
+        self.event = event
+        self.event_id = event_id
+        self.open_set = []
+        self.settled = {}
+        self.cursor = 0
+        self.counter = 0
+        self.threshold = -1
+        self.goal = None
+        self.remaining = 0
+
+    def settle(self, graph_handler: DCRGraphHandler, max_cost: int) -> Tuple[int, int]:
+        """
+        Settles the states of the position with a cost up to max_cost, after pushing the new entries of the source.
+
+        Parameters
+        ----------
+        graph_handler : DCRGraphHandler
+            The handler of the compiled graph.
+        max_cost : int
+            The cost up to which the states are settled.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of states popped and settled.
+        """
+        if max_cost <= self.threshold:
+            return 0, 0
+        entries = self.source.entries
+        for cost, marking, moves in entries[self.cursor:]:
+            self.counter += 1
+            heappush(self.open_set, (cost, self.counter, marking, moves))
+        self.cursor = len(entries)
+
+        visited, closed = 0, 0
+        open_set, settled = self.open_set, self.settled
+        while open_set and open_set[0][0] <= max_cost:
+            cost, _, marking, moves = heappop(open_set)
+            visited += 1
+            if marking in settled:
+                continue
+            settled[marking] = cost
+            closed += 1
+            if self.target is None:
+                if self.goal is None and graph_handler.is_accepting_in(marking):
+                    self.goal = (cost, moves)
+            elif self.event is not None and graph_handler.is_enabled_in(self.event, marking):
+                new_marking = graph_handler.execute_in(self.event, marking)
+                self.target.entries.append((cost + Parameters.SYNC_COST.value, new_marking,
+                                            ((self.event_id, self.event_id), moves)))
+                continue
+            else:
+                self.target.entries.append((cost + Parameters.LOG_COST.value, marking, ((">>", self.event_id), moves)))
+            for event in iter_indices(graph_handler.enabled_in(marking)):
+                new_marking = graph_handler.execute_in(event, marking)
+                if new_marking not in settled:
+                    self.counter += 1
+                    heappush(open_set, (cost + Parameters.MODEL_COST.value, self.counter, new_marking,
+                                        ((graph_handler.compiled.events[event], ">>"), moves)))
+        self.threshold = max_cost
+        return visited, closed
+
+    def release(self):
+        self.open_set = None
+        self.settled = None
+
+
+class PrefixTrieAlignment:
+    """
+    Aligns the variants of a log against a DCR graph, sharing the search of the common prefixes in a trie.
+
+    Each call of align_variants builds a new trie of the variants, and the states of a prefix are released once
+    all the variants with that prefix are aligned. The costs are the costs of the optimal variant.
+
+    Example usage:
+        trie_alignment = PrefixTrieAlignment(graph, parameters)\n
+        results = trie_alignment.align_variants(variants)\n
+
+    Attributes:
+        graph_handler (DCRGraphHandler): Handler of the compiled graph.
+        root (TrieNode): The node of the empty prefix, entered by the initial marking.
+        empty_trace_cost (int): The cost of aligning the empty trace, for the fitness.
+    """
+
+    def __init__(self, graph: DcrGraph, parameters: Optional[Dict] = None,
+                 graph_handler: Optional[DCRGraphHandler] = None):
+        self.graph_handler = DCRGraphHandler(graph) if graph_handler is None else graph_handler
+        self.parameters = parameters
+        self.root = None
+        self.empty_trace_cost = None
+
+    def new_trie(self):
+        self.root = TrieNode()
+        self.root.entries.append((0, self.graph_handler.compiled.initial_marking, None))
+
+    def get_path(self, variant: Tuple[Any, ...]) -> List[TrieEdge]:
+        """
+        Inserts the variant in the trie and returns the edges of its path, ending with the edge of the end of the trace
+        """
+        graph, compiled = self.graph_handler.graph, self.graph_handler.compiled
+        node = self.root
+        path = []
+        for activity in variant + (END,):
+            edge = node.children.get(activity)
+            if edge is None:
+                if activity is END:
+                    edge = TrieEdge(node, None, None, None)
+                else:
+                    event_id = graph.get_event(activity)
+                    edge = TrieEdge(node, TrieNode(), compiled.index_of(event_id), event_id)
+                node.children[activity] = edge
+            path.append(edge)
+            node = edge.target
+        return path
+
+    def align_path(self, path: List[TrieEdge]) -> Dict[str, Any]:
+        """
+        Settles the searches of the path up to an increasing cost, until the end of the trace settles an accepting
+        marking, or no search of the path has states left.
+        """
+        visited, closed = 0, 0
+        max_cost = 0
+        end = path[-1]
+        while end.goal is None:
+            for edge in path:
+                edge_visited, edge_closed = edge.settle(self.graph_handler, max_cost)
+                visited += edge_visited
+                closed += edge_closed
+            if end.goal is None and not any(edge.open_set or edge.cursor < len(edge.source.entries) for edge in path):
+                break
+            max_cost += 1
+        if end.goal is None:
+            cost, moves = float('inf'), None
+        else:
+            cost, moves = end.goal[0], Alignment.unroll_moves(end.goal[1])
+        return {
+            Outputs.ALIGNMENT.value: moves,
+            Outputs.COST.value: cost,
+            Outputs.VISITED.value: visited,
+            Outputs.CLOSED.value: closed,
+            Outputs.GLOBAL_MIN.value: cost,
+            Outputs.OPTIMAL.value: True,
+            Outputs.LOWER_BOUND.value: cost,
+        }
+
+    def align_variants(self, variants: List[Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+        """
+        Aligns the variants, in lexicographic order such that consecutive variants share their longest prefixes.
+        The visited and closed states of a result are the states searched for the variant, not those reused
+        from the variants aligned before.
+
+        Parameters
+        ----------
+        variants : List[Tuple[Any, ...]]
+            The variants, as tuples of activities.
+
+        Returns
+        -------
+        Dict[Tuple[Any, ...], Dict[str, Any]]
+            The result of every variant, with the keys of the optimal variant.
+        """
+        variants = sorted(set(variants), key=lambda variant: tuple(str(a) for a in variant))
+        self.new_trie()
+        paths = {}
+        for variant in variants:
+            path = self.get_path(variant)
+            for edge in path:
+                edge.remaining += 1
+                edge.source.remaining += 1
+            paths[variant] = path
+
+        if self.empty_trace_cost is None:
+            self.empty_trace_cost = self.align_path(self.get_path(()))[Outputs.COST.value]
+        results = {}
+        for variant in variants:
+            path = paths.pop(variant)
+            result = self.align_path(path)
+            bwc = len(variant) + self.empty_trace_cost
+            result[Outputs.ALIGN_FITNESS.value] = 1 - (result[Outputs.GLOBAL_MIN.value] / bwc if bwc > 0 else 0)
+            result[Outputs.BEST_WORST_COST.value] = bwc
+            results[variant] = result
+            # release the states of the prefixes without variants left to align
+            for edge in path:
+                edge.remaining -= 1
+                if edge.remaining == 0:
+                    edge.release()
+                edge.source.remaining -= 1
+                if edge.source.remaining == 0 and edge.source is not self.root:
+                    edge.source.entries = []
+        return results
+
+
+def apply(trace_or_log: Union[pd.DataFrame, EventLog, Trace], graph: DcrGraph, parameters=None):
+    """
+    Aligns a trace or the traces of a log against a DCR graph, sharing the search between the variants with a
+    common prefix.
+
+    Parameters:
+        trace_or_log (Union[pd.DataFrame, EventLog, Trace]): The event log or single trace to align.
+        graph (DcrGraph): The DCR graph against which the alignment is to be performed.
+        parameters (Optional[Dict]): A dictionary of parameters for the alignment (default is None).
+            - Parameters.ACTIVITY_KEY => the attribute used as activity
+            - Parameters.CASE_ID_KEY => the case identifier of a dataframe
+
+    Returns:
+        - If a single trace is provided, a list with the result of the trace.
+        - If an event log is provided, a list with the result of each trace, in the order of the log.
+    """
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    if isinstance(trace_or_log, Trace):
+        cases = [tuple(event[activity_key] for event in trace_or_log)]
+    elif isinstance(trace_or_log, pd.DataFrame):
+        cases = list(trace_or_log.groupby(case_id_key)[activity_key].apply(tuple))
+    else:
+        log = log_converter.apply(trace_or_log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
+        cases = [tuple(event[activity_key] for event in trace) for trace in log]
+
+    variant_results = PrefixTrieAlignment(graph, parameters=parameters).align_variants(cases)
+    aligned_traces = []
+    for case in cases:
+        result = dict(variant_results[case])
+        if result[Outputs.ALIGNMENT.value] is not None:
+            result[Outputs.ALIGNMENT.value] = list(result[Outputs.ALIGNMENT.value])
+        aligned_traces.append(result)
+    return aligned_traces
+
+
+def get_diagnostics_dataframe(log: EventLog, conf_result: List[Dict[str, Any]], parameters=None) -> pd.DataFrame:
+    """
+    Gets the diagnostics dataframe from a log and the conformance results, as in the optimal variant
+
+    Parameters
+    --------------
+    log
+        Event log
+    conf_result
+        Results of conformance checking
+    parameters
+        Variant-specific parameters
+
+    Returns
+    --------------
+    diagn_dataframe
+        Diagnostics dataframe
+    """
+    return optimal.get_diagnostics_dataframe(log, conf_result, parameters=parameters)
@@ -1,7 +1,7 @@
 import pm4py
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
-from pm4py.algo.conformance.dcr.variants import classic
+from pm4py.algo.conformance.dcr.variants import classic, timed
 from enum import Enum
 from pm4py.util import exec_utils
 from typing import Union, Any, Dict, Tuple, List, Optional
@@ -10,6 +10,7 @@ from pm4py.util import constants
 
 class Variants(Enum):
     CLASSIC = classic
+    TIMED = timed
 
 
 def apply(log: Union[pd.DataFrame, EventLog], G, variant=Variants.CLASSIC,
@@ -27,6 +28,8 @@ def apply(log: Union[pd.DataFrame, EventLog], G, variant=Variants.CLASSIC,
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.TIMED: also reports the violations of the delays and deadlines of timed DCR graphs,
+          replaying the events in the order of their timestamps
 
     parameters
         Variant-specific parameters
@@ -59,6 +62,7 @@ def get_diagnostics_dataframe(log: Union[EventLog, pd.DataFrame], conf_result: L
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.TIMED
     parameters
         Variant-specific parameters
 
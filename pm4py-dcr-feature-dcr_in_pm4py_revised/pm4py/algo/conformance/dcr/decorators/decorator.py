@@ -48,7 +48,7 @@ class Checker(ABC):
         pass
 
     @abstractmethod
-    def accepting_checker(self, graph: DcrGraph, responses: List[Tuple[str, str]], deviations:List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
+    def accepting_checker(self, graph: DcrGraph, responses: Dict[str, Dict[str, int]], deviations:List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
         pass
 
 
@@ -84,14 +84,15 @@ class ConcreteChecker(Checker):
         parameters: Optional[Dict[Union[str, Any], Any]]
             optional parameters
         """
-        CheckCondition.check_rule(event, graph, deviations)
-        CheckExclude.check_rule(event, graph, parameters['executionHistory'], deviations)
+        recorded = parameters.get('recordedDeviations')
+        CheckCondition.check_rule(event, graph, deviations, recorded)
+        CheckExclude.check_rule(event, graph, parameters['executionHistory'], deviations, recorded)
         CheckInclude.check_rule(event, graph, deviations)
 
     def all_checker(self, event: str, event_attributes: dict, graph: DcrGraph, deviations: List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
         pass
 
-    def accepting_checker(self, graph: DcrGraph, responses: List[Tuple[str, str]], deviations: List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
+    def accepting_checker(self, graph: DcrGraph, responses: Dict[str, Dict[str, int]], deviations: List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
         """
         accepting_checker is called when a DCR graph is not accepting after an execution of a trace
         checks all response deviations for a base DCR Graph
@@ -100,8 +101,9 @@ class ConcreteChecker(Checker):
         ----------
         graph: DcrGraph
             DCR Graph
-        responses: List[Tuple[str, str]]
-            list of response constraint not fulfilled
+        responses: Dict[str, Dict[str, int]]
+            response constraints not fulfilled, for each pending event the number of executions of each event
+            requiring it
         deviations: List[Any]
             the list of deviations
         parameters: Optional[Dict[Union[str, Any], Any]]
@@ -186,7 +188,7 @@ class Decorator(Checker):
         """
         self._checker.all_checker(event, event_attributes, graph, deviations, parameters=parameters)
 
-    def accepting_checker(self, graph: DcrGraph, responses: List[Tuple[str, str]], deviations: List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
+    def accepting_checker(self, graph: DcrGraph, responses: Dict[str, Dict[str, int]], deviations: List[Any], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
         """
         This method calls accepting_checker() of the underlying class to continue search for cause of deviation between Graph and event Log
 
@@ -194,8 +196,9 @@ class Decorator(Checker):
         ----------
         graph: DcrGraph
             DCR Graph
-        responses: List[Tuple[str, str]]
-            The recorded response relation between events to be executed and it originator
+        responses: Dict[str, Dict[str, int]]
+            The recorded response relation between events to be executed and the number of executions of its
+            originators
         deviations: List[Any]
             List of deviations
         parameters: Optional[Dict[Union[str, Any], Any]]
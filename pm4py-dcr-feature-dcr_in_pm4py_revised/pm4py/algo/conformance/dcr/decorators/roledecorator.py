@@ -31,7 +31,8 @@ class RoleDecorator(Decorator):
         self._checker.all_checker(event, event_attributes, graph, deviations, parameters=parameters)
         group_key = exec_utils.get_param_value(Parameters.GROUP_KEY,parameters,xes_constants.DEFAULT_GROUP_KEY)
         role = event_attributes[group_key]
-        CheckRole.check_rule(event, graph, role, deviations)
+        recorded = parameters.get('recordedDeviations') if parameters is not None else None
+        CheckRole.check_rule(event, graph, role, deviations, recorded)
 
-    def accepting_checker(self, graph: Union[DistributedDcrGraph, DcrGraph], responses: List[Tuple[str, str]], deviations: List[Tuple[str, Any]], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
+    def accepting_checker(self, graph: Union[DistributedDcrGraph, DcrGraph], responses: Dict[str, Dict[str, int]], deviations: List[Tuple[str, Any]], parameters: Optional[Dict[Union[str, Any], Any]] = None) -> None:
         self._checker.accepting_checker(graph, responses, deviations, parameters)
\ No newline at end of file
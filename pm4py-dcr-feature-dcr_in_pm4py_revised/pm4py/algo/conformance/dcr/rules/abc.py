@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple, Any, Optional, Set
 
 class CheckFrame(ABC):
     """
@@ -6,4 +7,27 @@ class CheckFrame(ABC):
     """
     @abstractmethod
     def check_rule(self, *args, **kwargs):
-        pass
\ No newline at end of file
+        pass
+
+    @staticmethod
+    def record_deviation(deviation: Tuple[str, Any], deviations: List[Tuple[str, Any]],
+                         recorded: Optional[Set[Tuple[str, Any]]] = None) -> None:
+        """
+        Appends a deviation to the deviations of the trace, if it has not been recorded yet.
+
+        Parameters
+        --------------
+        deviation: Tuple[str, Any]
+            The deviation found
+        deviations: List[Tuple[str, Any]]
+            List of deviations
+        recorded: Optional[Set[Tuple[str, Any]]]
+            Set of the deviations recorded for the trace, kept alongside the list such that the check does not
+            scan the list. If not given, the list is scanned.
+        """
+        if recorded is None:
+            if deviation not in deviations:
+                deviations.append(deviation)
+        elif deviation not in recorded:
+            recorded.add(deviation)
+            deviations.append(deviation)
@@ -1,10 +1,11 @@
 from pm4py.algo.conformance.dcr.rules.abc import CheckFrame
 from pm4py.objects.dcr.obj import DcrGraph
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional, Set
 
 class CheckCondition(CheckFrame):
     @classmethod
-    def check_rule(cls, event: str, graph: DcrGraph, deviations: List[Tuple[str, Any]]):
+    def check_rule(cls, event: str, graph: DcrGraph, deviations: List[Tuple[str, Any]],
+                   recorded: Optional[Set[Tuple[str, Any]]] = None):
         '''
         Checks if event violates the conditions relation
 
@@ -16,6 +17,8 @@ class CheckCondition(CheckFrame):
             DCR Graph
         deviations: List[Tuple[str, Any]]
             List of deviations
+        recorded: Optional[Set[Tuple[str, Any]]]
+            Set of the deviations recorded for the trace
         Returns
         --------------
         deviations: List[Tuple[str, Any]]
@@ -24,11 +27,10 @@ class CheckCondition(CheckFrame):
         # we check if conditions for activity has been executed, if not, that's a conditions violation
         # check if act is in conditions for
         if event in graph.conditions:
-            # check the conditions for event act
+            # the conditions of the event that are included and not executed are violated
+            included = graph.marking.included
+            executed = graph.marking.executed
             for event_prime in graph.conditions[event]:
-                # if conditions are included and not executed, add violation
-                if event_prime in graph.conditions[event].intersection(
-                        graph.marking.included.difference(graph.marking.executed)):
-                    if ('conditionViolation', (event_prime, event)) not in deviations:
-                        deviations.append(('conditionViolation', (event_prime, event)))
+                if event_prime in included and event_prime not in executed:
+                    cls.record_deviation(('conditionViolation', (event_prime, event)), deviations, recorded)
         return deviations
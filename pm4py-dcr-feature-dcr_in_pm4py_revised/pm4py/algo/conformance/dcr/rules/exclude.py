@@ -1,10 +1,11 @@
 from pm4py.algo.conformance.dcr.rules.abc import CheckFrame
 from pm4py.objects.dcr.obj import DcrGraph
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional, Set
 
 class CheckExclude(CheckFrame):
     @classmethod
-    def check_rule(cls, event: str, graph: DcrGraph, execution_his:List, deviations: List[Tuple[str, Any]]):
+    def check_rule(cls, event: str, graph: DcrGraph, execution_his:List, deviations: List[Tuple[str, Any]],
+                   recorded: Optional[Set[Tuple[str, Any]]] = None):
         '''
         Checks if event violates the exclude relation
 
@@ -18,6 +19,8 @@ class CheckExclude(CheckFrame):
             List to check for when event was excluded
         deviations: List[Tuple[str, Any]]
             List of deviations
+        recorded: Optional[Set[Tuple[str, Any]]]
+            Set of the deviations recorded for the trace
         Returns
         --------------
         deviations: List[Tuple[str, Any]]
@@ -33,6 +36,5 @@ class CheckExclude(CheckFrame):
                     exclude_origin = []
             #if violation exist, no need to store it
             for event_prime in exclude_origin:
-                if ('excludeViolation', (event_prime, event)) not in deviations:
-                    deviations.append(('excludeViolation', (event_prime, event)))
+                cls.record_deviation(('excludeViolation', (event_prime, event)), deviations, recorded)
         return deviations
@@ -1,11 +1,10 @@
 from pm4py.algo.conformance.dcr.rules.abc import CheckFrame
-from typing import Union
 from pm4py.objects.dcr.obj import DcrGraph
-from typing import List, Tuple, Any
+from typing import Dict, Tuple, Any, List
 
 class CheckResponse(CheckFrame):
     @classmethod
-    def check_rule(cls, graph: DcrGraph, responses: List[Tuple[str, str]], deviations: List[Tuple[str, Any]]):
+    def check_rule(cls, graph: DcrGraph, responses: Dict[str, Dict[str, int]], deviations: List[Tuple[str, Any]]):
         """
         Checks if event violates the response relation.
 
@@ -15,8 +14,8 @@ class CheckResponse(CheckFrame):
         --------------
         graph: DcrGraph
             DCR graph
-        responses:
-            responses not yet executed
+        responses: Dict[str, Dict[str, int]]
+            responses not yet executed, for each pending event the number of executions of each event requiring it
         deviations: List[Tuple[str, Any]]
             List of deviations
 
@@ -27,6 +26,7 @@ class CheckResponse(CheckFrame):
         """
         # if activities are pending, and included, thats a response violation
         if graph.marking.included.intersection(graph.marking.pending):
-            for pending in responses:
-                deviations.append(('responseViolation', tuple(pending)))
+            for response, origins in responses.items():
+                for origin, count in origins.items():
+                    deviations.extend([('responseViolation', (origin, response))] * count)
         return deviations
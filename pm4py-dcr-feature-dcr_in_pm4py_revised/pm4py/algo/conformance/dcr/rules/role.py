@@ -1,11 +1,12 @@
 from pm4py.algo.conformance.dcr.rules.abc import CheckFrame
 from pm4py.objects.dcr.distributed.obj import DistributedDcrGraph
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Optional, Set
 
 
 class CheckRole(CheckFrame):
     @classmethod
-    def check_rule(cls, event: str, graph: DistributedDcrGraph, role: str, deviations: List[Tuple[str, Any]]):
+    def check_rule(cls, event: str, graph: DistributedDcrGraph, role: str, deviations: List[Tuple[str, Any]],
+                   recorded: Optional[Set[Tuple[str, Any]]] = None):
         '''
         Checks if event violates the role assignments
             1.) if event contain role not in model
@@ -21,6 +22,8 @@ class CheckRole(CheckFrame):
             Role of the event
         deviations: List[Tuple[str, Any]]
             List of deviations
+        recorded: Optional[Set[Tuple[str, Any]]]
+            Set of the deviations recorded for the trace
         Returns
         --------------
         deviations: List[Tuple[str, Any]]
@@ -28,22 +31,13 @@ class CheckRole(CheckFrame):
         '''
         if role not in graph.roles and role == role:
             # if role doesn't exist, means that they do not have authority to perform the action
-            if ('roleViolation', role) not in deviations:
-                deviations.append(('roleViolation', role))
+            cls.record_deviation(('roleViolation', role), deviations, recorded)
             return deviations
-        else:
-            temp = {event: set()}
-            for i in graph.role_assignments:
-                if event in graph.role_assignments[i]:
-                    temp[event].add(i)
-            # if activity has no role, return, as it can be excuted by anybody
-            if not temp[event]:
-                return deviations
-            # if event in model has roles
-            # violation when:
-            # 1) when as event in model does not have role
-            res = temp[event].intersection({role})
-            if not res:
-                if ('roleViolation', (role, event)) not in deviations:
-                    deviations.append(('roleViolation', (role, event)))
+        roles = graph.event_roles.get(event)
+        # if activity has no role, return, as it can be excuted by anybody
+        if not roles:
             return deviations
+        # if event in model has roles, violation when the role of the event is not one of them
+        if role not in roles:
+            cls.record_deviation(('roleViolation', (role, event)), deviations, recorded)
+        return deviations
@@ -1 +1 @@
-from pm4py.algo.conformance.dcr.variants import classic
\ No newline at end of file
+from pm4py.algo.conformance.dcr.variants import classic, timed
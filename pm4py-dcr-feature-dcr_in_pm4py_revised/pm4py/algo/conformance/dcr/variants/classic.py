@@ -1,11 +1,15 @@
+import numpy as np
 import pandas as pd
+from collections import Counter
 from enum import Enum
 from pm4py.util import exec_utils, constants, xes_constants
 from typing import Optional, Dict, Any, Union, List, Tuple
 from pm4py.objects.log.obj import EventLog
-from pm4py.objects.dcr.semantics import DcrSemantics
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
 from pm4py.objects.dcr.obj import DcrGraph
 from pm4py.objects.dcr.distributed.obj import DistributedDcrGraph
+from pm4py.objects.dcr.utils.cache import graph_fingerprint
 from pm4py.algo.conformance.dcr.decorators.decorator import ConcreteChecker
 from pm4py.algo.conformance.dcr.decorators.roledecorator import RoleDecorator
 
@@ -14,6 +18,8 @@ from pm4py.algo.conformance.dcr.decorators.roledecorator import RoleDecorator
 class Parameters(Enum):
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    GROUP_KEY = constants.PARAMETER_CONSTANT_GROUP_KEY
+    VARIANT_CACHE = "variant_cache"
 
 class Outputs(Enum):
     FITNESS = "dev_fitness"
@@ -41,6 +47,12 @@ class RuleBasedConformance:
         where the DCR Graph will replay the provided event log. Once replay is done,
         returns a list of conformance results for each trace, such as fitness, and the deviations
 
+        Traces are replayed once per variant, the sequence of activities (and of roles for graphs with roles),
+        and the result is copied to every case of the variant. A VariantCache can be given as parameter to reuse
+        the results of the variants across calls on graphs with the same content.
+        Pandas dataframes are read column-wise: only the case, activity and role columns are integer encoded and
+        grouped by case, such that the rows do not need to be sorted by case.
+
         Example usage:
 
 
@@ -52,7 +64,6 @@ class RuleBasedConformance:
             DCR Graph: The DCR graph to be checked
             Event log: The event log to be replayed
             Checker (HandleChecker): handler for the conformance checkers for each rule.
-            Semantics (DcrSemantics()): The semantics used executing events from the event log
             Parameters: optinal parameters given by the user
 
         Methods:
@@ -62,12 +73,8 @@ class RuleBasedConformance:
     def __init__(self, log: Union[EventLog, pd.DataFrame], graph: Union[DcrGraph, DistributedDcrGraph],
                  parameters: Optional[Dict[Union[str, Any], Any]] = None):
         self.__g = graph
-        if isinstance(log, pd.DataFrame):
-            log = self.__transform_pandas_dataframe(log, exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters,
-                                                                                    constants.CASE_CONCEPT_NAME))
         self.__log = log
         self.__checker = HandleChecker(graph)
-        self.__semantics = DcrSemantics()
         self.__parameters = parameters
 
     def apply_conformance(self) -> List[Dict[str, Any]]:
@@ -111,95 +118,197 @@ class RuleBasedConformance:
         initial_marking['executed'] = set(self.__g.marking.executed)
         initial_marking['pending'] = set(self.__g.marking.pending)
 
-        # iterate through all traces in log
-        for trace in self.__log:
-            # create base dict to accumalate trace conformance data
-            ret = {Outputs.NO_CONSTR_TOTAL.value: total_num_constraints, Outputs.DEVIATIONS.value: []}
-            # execution_his for checking dynamic excludes
-            self.__parameters['executionHistory'] = []
-            # response_originator for checking reason for not accepting state
-            response_origin = []
-            # iterate through all events in a trace
-            for event in trace:
-                # get the event to be executed
-                e = self.__g.get_event(event[activity_key])
-                self.__parameters['executionHistory'].append(e)
-
-                # check for deviations
-                if e in self.__g.responses:
-                    for response in self.__g.responses[e]:
-                        response_origin.append((e, response))
-
-                self.__checker.all_checker(e, event, self.__g, ret[Outputs.DEVIATIONS.value],
-                                           parameters=self.__parameters)
-
-                if not self.__semantics.is_enabled(e, self.__g):
-                    self.__checker.enabled_checker(e, self.__g, ret[Outputs.DEVIATIONS.value],
-                                                   parameters=self.__parameters)
-
-                # execute the event
-                self.__semantics.execute(self.__g, e)
-
-                if len(response_origin) > 0:
-                    for i in response_origin:
-                        if e == i[1]:
-                            response_origin.remove(i)
-
-            # check if run is accepting
-            if not self.__semantics.is_accepting(self.__g):
-                self.__checker.accepting_checker(self.__g, response_origin, ret[Outputs.DEVIATIONS.value],
-                                                 parameters=self.__parameters)
-
-            # compute the conformance for the trace
-            ret[Outputs.NO_DEV_TOTAL.value] = len(ret[Outputs.DEVIATIONS.value])
-            ret[Outputs.FITNESS.value] = 1 - ret[Outputs.NO_DEV_TOTAL.value] / ret[Outputs.NO_CONSTR_TOTAL.value]
-            ret[Outputs.IS_FIT.value] = ret[Outputs.NO_DEV_TOTAL.value] == 0
-            conf_case.append(ret)
-
-            # reset graph
-            self.__g.marking.reset(initial_marking.copy())
+        # replay on the compiled graph, the marking of the graph is only updated when a checker needs it
+        compiled = self.__g.compile()
+        # the roles of each event are looked up in the index, rebuilt in case the assignments were modified
+        if isinstance(self.__g, DistributedDcrGraph):
+            self.__g.index_roles()
+        event_of_activity = {}
+
+        # the role of the events is only relevant to the checkers of graphs with roles
+        group_key = exec_utils.get_param_value(Parameters.GROUP_KEY, self.__parameters,
+                                               xes_constants.DEFAULT_GROUP_KEY) if hasattr(self.__g, 'roles') else None
+        cache = exec_utils.get_param_value(Parameters.VARIANT_CACHE, self.__parameters, None)
+        fingerprint = graph_fingerprint(self.__g) if cache is not None else None
+
+        if isinstance(self.__log, pd.DataFrame):
+            case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, self.__parameters,
+                                                     constants.CASE_CONCEPT_NAME)
+            traces = self.__encode_dataframe(self.__log, case_id_key, activity_key, group_key)
+        else:
+            traces = ((self.__get_variant(trace, activity_key, group_key), trace) for trace in self.__log)
+
+        # replay each variant once
+        variant_results = {}
+        for variant, trace in traces:
+            ret = variant_results.get(variant)
+            if ret is None:
+                ret = cache.get(fingerprint, ('rule_based', variant)) if cache is not None else None
+                if ret is None:
+                    ret = self.__replay_trace(trace, compiled, event_of_activity, activity_key,
+                                              total_num_constraints)
+                    if cache is not None:
+                        cache.put(fingerprint, ('rule_based', variant), ret)
+                variant_results[variant] = ret
+            conf_case.append(self.__copy_result(ret))
+
+        # reset graph
+        self.__g.marking.reset(initial_marking.copy())
 
         return conf_case
 
-    def __transform_pandas_dataframe(self, dataframe: pd.DataFrame, case_id_key: str):
+    def __replay_trace(self, trace, compiled: CompiledDcrGraph, event_of_activity: Dict[str, str], activity_key: str,
+                       total_num_constraints: int) -> Dict[str, Any]:
+        """
+        Replays a single trace on the compiled graph and collects its deviations.
+
+        Parameters:
+        - trace: The events of the trace, with their attributes.
+        - compiled (CompiledDcrGraph): The compiled DCR graph used for the replay.
+        - event_of_activity (Dict[str, str]): Cache of the event of each activity, shared across traces.
+        - activity_key (str): The attribute used as activity.
+        - total_num_constraints (int): The number of constraints of the DCR graph.
+
+        Returns:
+        - dict: The conformance result of the trace.
+        """
+        # create base dict to accumalate trace conformance data
+        ret = {Outputs.NO_CONSTR_TOTAL.value: total_num_constraints, Outputs.DEVIATIONS.value: []}
+        # execution_his for checking dynamic excludes
+        self.__parameters['executionHistory'] = []
+        # the deviations recorded so far, such that a deviation is only reported once per trace
+        self.__parameters['recordedDeviations'] = set()
+        # response_originator for checking reason for not accepting state, the executions of the events requiring
+        # each pending response
+        response_origin = {}
+        marking = compiled.initial_marking
+        # iterate through all events in a trace
+        for event in trace:
+            # get the event to be executed
+            activity = event[activity_key]
+            if activity not in event_of_activity:
+                event_of_activity[activity] = self.__g.get_event(activity)
+            e = event_of_activity[activity]
+            idx = compiled.index_of(e)
+            self.__parameters['executionHistory'].append(e)
+
+            # check for deviations
+            if e in self.__g.responses:
+                for response in self.__g.responses[e]:
+                    if response not in response_origin:
+                        response_origin[response] = Counter()
+                    response_origin[response][e] += 1
+
+            self.__checker.all_checker(e, event, self.__g, ret[Outputs.DEVIATIONS.value],
+                                       parameters=self.__parameters)
+
+            if idx is None or not CompiledSemantics.is_enabled(idx, compiled, marking):
+                self.__sync_marking(compiled, marking)
+                self.__checker.enabled_checker(e, self.__g, ret[Outputs.DEVIATIONS.value],
+                                               parameters=self.__parameters)
+
+            # execute the event
+            if idx is not None:
+                marking = CompiledSemantics.execute(compiled, marking, idx)
+
+            # the executed event fulfills the responses requiring it
+            response_origin.pop(e, None)
+
+        # check if run is accepting
+        if not CompiledSemantics.is_accepting(compiled, marking):
+            self.__sync_marking(compiled, marking)
+            self.__checker.accepting_checker(self.__g, response_origin, ret[Outputs.DEVIATIONS.value],
+                                             parameters=self.__parameters)
+
+        # compute the conformance for the trace
+        ret[Outputs.NO_DEV_TOTAL.value] = len(ret[Outputs.DEVIATIONS.value])
+        ret[Outputs.FITNESS.value] = 1 - ret[Outputs.NO_DEV_TOTAL.value] / ret[Outputs.NO_CONSTR_TOTAL.value]
+        ret[Outputs.IS_FIT.value] = ret[Outputs.NO_DEV_TOTAL.value] == 0
+        return ret
+
+    @staticmethod
+    def __get_variant(trace, activity_key: str, group_key: Optional[str]) -> Tuple:
+        """
+        Computes the variant of a trace, the sequence of its activities, paired with their roles when
+        the group key is given.
         """
-        Transforms a pandas DataFrame into a list of event logs grouped by cases.
-        Uses a snippet from __transform_dataframe_to_event_stream_new as template to transform pandas dataframe
+        if group_key is None:
+            return tuple(event[activity_key] for event in trace)
+        return tuple((event[activity_key], event.get(group_key)) for event in trace)
 
-        This function takes a pandas DataFrame where each row represents an event and converts it into a
-        list of lists, where each inner list contains all events related to a single case. The grouping
-        of events into cases is based on the case identifier specified by the 'case_id_key' parameter.
+    @staticmethod
+    def __copy_result(ret: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copies the result of a variant for one of its cases, such that the deviations of the cases are independent.
+        """
+        res = dict(ret)
+        res[Outputs.DEVIATIONS.value] = list(ret[Outputs.DEVIATIONS.value])
+        return res
+
+    def __sync_marking(self, compiled: CompiledDcrGraph, marking: Tuple[int, int, int]) -> None:
+        """
+        Writes a compiled marking back to the marking of the DCR graph, such that the checkers can inspect it.
 
         Parameters:
-        - dataframe (pd.DataFrame): The pandas DataFrame to be transformed.
+        - compiled (CompiledDcrGraph): The compiled DCR graph used for the replay.
+        - marking (Tuple[int, int, int]): The current marking as (executed, included, pending) masks.
+        """
+        self.__g.marking.executed = compiled.decode(marking[0])
+        self.__g.marking.included = compiled.decode(marking[1])
+        self.__g.marking.pending = compiled.decode(marking[2])
+
+    def __encode_dataframe(self, dataframe: pd.DataFrame, case_id_key: str, activity_key: str,
+                           group_key: Optional[str]) -> List[Tuple[Tuple, List[Dict[str, Any]]]]:
+        """
+        Computes the variant of each case of a pandas DataFrame, without creating a Python object per event.
+
+        Only the case, activity and (for graphs with roles) role columns are read. They are integer encoded, the
+        events are grouped by case with a stable sort, such that the rows do not need to be sorted by case, and
+        the cases are deduplicated on the bytes of their codes. A trace of events is only built once per variant.
+
+        Parameters:
+        - dataframe (pd.DataFrame): The pandas DataFrame to be checked.
         - case_id_key (str): The column name in the DataFrame that acts as the case identifier.
+        - activity_key (str): The column name in the DataFrame that acts as the activity.
+        - group_key (Optional[str]): The column name in the DataFrame that acts as the role, None if not needed.
 
         Returns:
-        - list: A list of event logs, where each event log is a list of events (dictionaries)
-                corresponding to a single case.
-
-        Each event in the event log is represented as a dictionary, where the keys are the column names
-        from the DataFrame and the values are the corresponding values for that event.
+        - list: For each case, in order of first occurrence in the DataFrame, its variant and a trace of the
+                variant, where each event is a dictionary with the activity (and role) of the event.
         """
-        list_events = []
-        columns_names = list(dataframe.columns)
-        columns_corr = []
-        log = []
-        last_case_key = dataframe.iloc[0][case_id_key]
-        for c in columns_names:
-            columns_corr.append(dataframe[c].to_numpy())
-        length = columns_corr[-1].size
-        for i in range(length):
-            event = {}
-            for j in range(len(columns_names)):
-                event[columns_names[j]] = columns_corr[j][i]
-            if last_case_key != event[case_id_key]:
-                log.append(list_events)
-                list_events = []
-            last_case_key = event[case_id_key]
-            list_events.append(event)
-        log.append(list_events)
-        return log
+        if len(dataframe) == 0:
+            return []
+        cases, _ = pd.factorize(dataframe[case_id_key])
+        codes, activities = pd.factorize(dataframe[activity_key], use_na_sentinel=False)
+        codes = codes.astype(np.int64)
+        keys = [activity_key]
+        labels = [np.asarray(activities, dtype=object)]
+        if group_key is not None:
+            roles, role_labels = pd.factorize(dataframe[group_key], use_na_sentinel=False)
+            codes = codes * len(role_labels) + roles
+            keys.append(group_key)
+            labels.append(np.asarray(role_labels, dtype=object))
+        order = np.argsort(cases, kind='stable')
+        codes = codes[order]
+        cases = cases[order]
+        starts = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1]]) * codes.itemsize
+        ends = np.r_[starts[1:], len(codes) * codes.itemsize]
+        buffer = codes.tobytes()
+
+        variant_index = {}
+        variant_of_case = [variant_index.setdefault(buffer[start:end], len(variant_index))
+                           for start, end in zip(starts.tolist(), ends.tolist())]
+        variants = []
+        for key in variant_index:
+            variant_codes = np.frombuffer(key, dtype=np.int64)
+            if group_key is not None:
+                variant_codes = [variant_codes // len(labels[1]), variant_codes % len(labels[1])]
+            else:
+                variant_codes = [variant_codes]
+            values = [column_labels[c].tolist() for column_labels, c in zip(labels, variant_codes)]
+            trace = [dict(zip(keys, event)) for event in zip(*values)]
+            variants.append((self.__get_variant(trace, activity_key, group_key), trace))
+        return [variants[i] for i in variant_of_case]
 
 
 class HandleChecker:
@@ -285,7 +394,7 @@ class HandleChecker:
         """
         self.checker.all_checker(event, event_attributes, graph, deviations, parameters=parameters)
 
-    def accepting_checker(self, graph: Union[DcrGraph, DistributedDcrGraph], response_origin: List[Tuple[str,str]],
+    def accepting_checker(self, graph: Union[DcrGraph, DistributedDcrGraph], response_origin: Dict[str, Dict[str, int]],
                           deviations: List[Any], parameters: Optional[Dict[Any, Any]] = None) -> None:
         """
         Accepting checker, called when the DCR graph at the end of trace execution is not not accepting
@@ -0,0 +1,300 @@
+import heapq
+import numpy as np
+import pandas as pd
+from enum import Enum
+from pm4py.util import exec_utils, constants, xes_constants
+from typing import Optional, Dict, Any, Union, List, Tuple, Iterator
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.log.util import sorting
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph, iter_indices
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.algo.conformance.dcr.variants import classic
+from pm4py.algo.conformance.dcr.variants.classic import Outputs
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    GROUP_KEY = constants.PARAMETER_CONSTANT_GROUP_KEY
+    VARIANT_CACHE = "variant_cache"
+
+
+def to_nanoseconds(timestamps) -> np.ndarray:
+    """
+    Converts a collection of timestamps to integer nanoseconds since the epoch, in a single vectorized conversion
+    """
+    return pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True)).as_unit('ns').asi8
+
+
+class TimedConformance:
+    """
+        The TimedConformance class extends rule based conformance checking to the time constraints of timed DCR graphs.
+
+        The log is first sorted by case and timestamp, and checked with the rule based conformance of the classic
+        variant on the sorted log. Each case is then replayed a second time with the timestamps of its events,
+        following the timed semantics of :class:`pm4py.objects.dcr.timed.semantics.TimedSemantics`, and the
+        violations of the time constraints are added to the deviations of the case:
+            - ('delayViolation', (e', e)): e was executed before the delay of its timed condition e' had elapsed
+            - ('deadlineViolation', (e, e')): time passed the deadline of the timed response e' of e, while e' was
+              included and pending
+
+        The timed replay is a single pass over the events of each case, on the compiled graph: the timestamps are
+        converted once to integer nanoseconds, the times of the last executions and the deadlines are kept per event
+        index, and the deadlines in a priority queue, such that no time object is created per event.
+
+        Attributes:
+            DCR Graph: The timed DCR graph to be checked
+            Event log: The event log to be replayed
+            Parameters: optional parameters given by the user
+
+        Methods:
+            apply_conformance(): performs the replays and computing of conformance of each trace
+    """
+
+    def __init__(self, log: Union[EventLog, pd.DataFrame], graph: DcrGraph,
+                 parameters: Optional[Dict[Union[str, Any], Any]] = None):
+        self.__g = graph
+        self.__log = log
+        self.__parameters = {} if parameters is None else parameters
+
+    def apply_conformance(self) -> List[Dict[str, Any]]:
+        """
+        Apply timed conformance against a timed DCR Graph, replaying each case in the order of its timestamps.
+
+        Returns
+        ----------
+        :return: List containing dictionaries with the following keys and values:
+            - no_constr_total: the total number of constraints of the DCR Graphs
+            - deviations: the list of deviations, including the violations of the delays and deadlines
+            - no_dev_total: the total number of deviations
+            - dev_fitness: the fitness (1 - no_dev_total / no_constr_total),
+            - is_fit: True if the case is perfectly fit
+        :rtype: List[Dict[str, Any]]
+        """
+        activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, self.__parameters,
+                                                  xes_constants.DEFAULT_NAME_KEY)
+        timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, self.__parameters,
+                                                   xes_constants.DEFAULT_TIMESTAMP_KEY)
+        compiled = self.__g.compile()
+
+        if isinstance(self.__log, pd.DataFrame):
+            case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, self.__parameters,
+                                                     constants.CASE_CONCEPT_NAME)
+            group_key = exec_utils.get_param_value(Parameters.GROUP_KEY, self.__parameters,
+                                                   xes_constants.DEFAULT_GROUP_KEY)
+            sorted_log, traces = self.__sort_dataframe(self.__log, compiled, case_id_key, activity_key,
+                                                       timestamp_key, group_key)
+        else:
+            # sort the events of each trace, keeping the order of the traces (and the empty ones)
+            sorted_log = EventLog([sorting.sort_timestamp_trace(trace, timestamp_key=timestamp_key)
+                                   for trace in self.__log], attributes=self.__log.attributes,
+                                  extensions=self.__log.extensions, omni_present=self.__log.omni_present,
+                                  classifiers=self.__log.classifiers, properties=self.__log.properties)
+            traces = self.__encode_log(sorted_log, compiled, activity_key, timestamp_key)
+
+        conf_case = classic.apply(sorted_log, self.__g, parameters=self.__parameters)
+
+        delays, deadlines = self.__compile_timings(compiled)
+        if not any(delays) and not any(deadlines):
+            return conf_case
+        for ret, (events, times) in zip(conf_case, traces):
+            timed_deviations = self.__replay_times(compiled, delays, deadlines, events, times)
+            if timed_deviations:
+                ret[Outputs.DEVIATIONS.value].extend(timed_deviations)
+                ret[Outputs.NO_DEV_TOTAL.value] = len(ret[Outputs.DEVIATIONS.value])
+                ret[Outputs.FITNESS.value] = 1 - ret[Outputs.NO_DEV_TOTAL.value] / ret[Outputs.NO_CONSTR_TOTAL.value]
+                ret[Outputs.IS_FIT.value] = False
+        return conf_case
+
+    def __compile_timings(self, compiled: CompiledDcrGraph) -> Tuple[List[List[Tuple[int, int]]],
+                                                                      List[List[Tuple[int, int]]]]:
+        """
+        Encodes the timed conditions and responses of the graph on the indices of the compiled graph,
+        the delays and deadlines in integer nanoseconds.
+
+        Returns:
+        - tuple: for each event, the (condition, delay) pairs of its timed conditions, and the (response, deadline)
+                 pairs of its timed responses.
+        """
+        index = compiled.index
+        delays = [[] for _ in range(len(compiled))]
+        deadlines = [[] for _ in range(len(compiled))]
+        for event, conditions in getattr(self.__g, 'timedconditions', {}).items():
+            for condition, delay in conditions.items():
+                delays[index[event]].append((index[condition], pd.Timedelta(delay).value))
+        for event, responses in getattr(self.__g, 'timedresponses', {}).items():
+            for response, deadline in responses.items():
+                deadlines[index[event]].append((index[response], pd.Timedelta(deadline).value))
+        return delays, deadlines
+
+    @staticmethod
+    def __event_indices(compiled: CompiledDcrGraph, activities) -> np.ndarray:
+        """
+        Maps the activities to the indices of their events in the compiled graph, -1 for the unknown activities.
+        """
+        indices = [compiled.index_of_activity(activity) for activity in activities]
+        return np.array([-1 if i is None else i for i in indices], dtype=np.int64)
+
+    def __sort_dataframe(self, dataframe: pd.DataFrame, compiled: CompiledDcrGraph, case_id_key: str,
+                         activity_key: str, timestamp_key: str,
+                         group_key: str) -> Tuple[pd.DataFrame, Iterator[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Sorts the events of a pandas DataFrame by case, in order of first occurrence, and by timestamp.
+
+        Returns:
+        - tuple: the columns of the DataFrame needed by the rule based conformance, in sorted order, and an iterator
+                 over the event indices and the timestamps (in nanoseconds) of each case.
+        """
+        columns = [c for c in (case_id_key, activity_key, group_key) if c in dataframe.columns]
+        if len(dataframe) == 0:
+            return dataframe[columns], iter([])
+        cases, _ = pd.factorize(dataframe[case_id_key])
+        times = to_nanoseconds(dataframe[timestamp_key])
+        order = np.lexsort((times, cases))
+        codes, activities = pd.factorize(dataframe[activity_key], use_na_sentinel=False)
+        events = self.__event_indices(compiled, activities)[codes[order]]
+        times = times[order]
+        cases = cases[order]
+        bounds = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1], True])
+        traces = ((events[start:end], times[start:end]) for start, end in zip(bounds[:-1], bounds[1:]))
+        return dataframe[columns].iloc[order], traces
+
+    def __encode_log(self, log: EventLog, compiled: CompiledDcrGraph, activity_key: str,
+                     timestamp_key: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Encodes the sorted traces of an event log as event indices and timestamps (in nanoseconds),
+        converting the timestamps of the whole log at once.
+        """
+        lengths = [len(trace) for trace in log]
+        activities = [event[activity_key] for trace in log for event in trace]
+        if not activities:
+            return iter([(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)) for _ in lengths])
+        codes, unique_activities = pd.factorize(pd.Series(activities, dtype=object), use_na_sentinel=False)
+        events = self.__event_indices(compiled, unique_activities)[codes]
+        times = to_nanoseconds([event[timestamp_key] for trace in log for event in trace])
+        bounds = np.r_[0, np.cumsum(lengths)]
+        return ((events[start:end], times[start:end]) for start, end in zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def __replay_times(compiled: CompiledDcrGraph, delays: List[List[Tuple[int, int]]],
+                       deadlines: List[List[Tuple[int, int]]], events: np.ndarray,
+                       times: np.ndarray) -> List[Tuple[str, Tuple[str, str]]]:
+        """
+        Replays a case with the timestamps of its events and collects the violations of the time constraints.
+
+        An event violates the delay of a timed condition if the condition is included and executed, and the delay
+        has not elapsed since its last execution. A deadline is violated when an event happens after it, while the
+        response is included and pending; a deadline passed while the response was excluded is moved to the time
+        of its inclusion, as the response then has to be executed right away.
+
+        Parameters:
+        - compiled (CompiledDcrGraph): The compiled DCR graph used for the replay.
+        - delays: For each event, the (condition, delay) pairs of its timed conditions.
+        - deadlines: For each event, the (response, deadline) pairs of its timed responses.
+        - events (np.ndarray): The event indices of the case, -1 for the unknown activities.
+        - times (np.ndarray): The timestamps of the case, in nanoseconds.
+
+        Returns:
+        - list: The delay and deadline violations of the case.
+        """
+        names = compiled.events
+        deviations = []
+        marking = compiled.initial_marking
+        executed_at = {}
+        deadline_at = {}
+        origin_of = {}
+        queue = []
+        for event, time in zip(events.tolist(), times.tolist()):
+            executed, included, pending = marking
+            # the deadlines passed before the event
+            while queue and queue[0][0] < time:
+                deadline, response = heapq.heappop(queue)
+                if deadline_at.get(response) != deadline:
+                    continue
+                if not (pending >> response) & 1:
+                    del deadline_at[response]
+                elif (included >> response) & 1:
+                    deviation = ('deadlineViolation', (names[origin_of[response]], names[response]))
+                    if deviation not in deviations:
+                        deviations.append(deviation)
+                    del deadline_at[response]
+            if event < 0:
+                continue
+
+            executed_included = executed & included
+            for condition, delay in delays[event]:
+                if (executed_included >> condition) & 1 and condition in executed_at and \
+                        time - executed_at[condition] < delay:
+                    deviation = ('delayViolation', (names[condition], names[event]))
+                    if deviation not in deviations:
+                        deviations.append(deviation)
+
+            marking = CompiledSemantics.execute(compiled, marking, event)
+            executed_at[event] = time
+            deadline_at.pop(event, None)
+            for response, deadline in deadlines[event]:
+                deadline_at[response] = time + deadline
+                origin_of[response] = event
+                heapq.heappush(queue, (time + deadline, response))
+            # the deadlines passed while the newly included events were excluded are due now
+            for response in iter_indices(marking[1] & ~included & marking[2]):
+                if response in deadline_at and deadline_at[response] < time:
+                    deadline_at[response] = time
+                    heapq.heappush(queue, (time, response))
+        return deviations
+
+
+def apply(log: Union[pd.DataFrame, EventLog], graph: DcrGraph, parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Applies timed conformance checking against a timed DCR graph and an event log.
+    Replays each case in the order of its timestamps, storing the deviations of the rule based conformance
+    checking, as well as the violations of the delays of the timed conditions and of the deadlines of the
+    timed responses.
+
+    Parameters
+    -----------
+    :param log: pd.DataFrame | EventLog
+        event log as :class: `EventLog` or as pandas Dataframe
+    :param graph: TimedDcrGraph
+        Timed DCR Graph, for other DCR graphs only the rule based deviations are reported
+    :param parameters: Optional[Dict[Any, Any]]
+        Possible parameters of the algorithm, including:
+            - Parameters.ACTIVITY_KEY => the attribute to be used as activity
+            - Parameters.CASE_ID_KEY => the attribute to be used as case identifier
+            - Parameters.TIMESTAMP_KEY => the attribute to be used as timestamp
+            - Parameters.GROUP_KEY => the attribute to be used as role identifier
+            - Parameters.VARIANT_CACHE => cache of the rule based results of the variants
+
+    Returns
+    ----------
+    :return: List containing dictionaries with the following keys and values:
+        - no_constr_total: the total number of constraints of the DCR Graphs
+        - deviations: the list of deviations
+        - no_dev_total: the total number of deviations
+        - dev_fitness: the fitness (1 - no_dev_total / no_constr_total),
+        - is_fit: True if the case is perfectly fit
+    """
+    if parameters is None:
+        parameters = {}
+    con = TimedConformance(log, graph, parameters=parameters)
+    return con.apply_conformance()
+
+
+def get_diagnostics_dataframe(log: Union[EventLog, pd.DataFrame], conf_result: List[Dict[str, Any]],
+                              parameters: Optional[Dict[Any, Any]] = None) -> pd.DataFrame:
+    """
+    Gets the diagnostics dataframe from a log and the results of timed conformance checking of DCR graph
+
+    Parameters
+    ---------------
+    :param log: event log as :class: `EventLog` or as pandas Dataframe
+    :param conf_result: Results of conformance checking
+    :param parameters: Optional Parameter to specify case id key
+
+    Returns
+    ---------------
+    :return: Diagnostics dataframe
+    """
+    return classic.get_diagnostics_dataframe(log, conf_result, parameters=parameters)
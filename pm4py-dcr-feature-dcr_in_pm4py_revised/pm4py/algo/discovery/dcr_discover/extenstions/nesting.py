@@ -1,10 +1,12 @@
+import time
 from copy import deepcopy
 from enum import Enum, auto
-import pandas as pd
+import numpy as np
 import networkx as nx
-from typing import Optional, Any, Union, Dict
+from typing import Optional, Any, Union, Dict, List
 
 from pm4py.objects.dcr.obj import dcr_template, DcrGraph, TemplateRelations as Relations
+from pm4py.objects.dcr.compiled.obj import iter_indices
 from pm4py.objects.dcr.hierarchical.obj import HierarchicalDcrGraph
 from pm4py.objects.log.obj import EventLog
 
@@ -28,6 +30,8 @@ def apply(graph, parameters):
     parameters
         Parameters of the algorithm, including:
             nest_variant : the nesting algorithm to use from the enum above: CHOICE|NEST|CHOICE_NEST
+            choice_time_budget : the time in seconds spent searching for the largest choice groups, after which
+                the best groups found so far are kept (default None, no limit)
     Returns
     -------
     :class:´GroupSubprocessDcrGraph`
@@ -78,17 +82,18 @@ class NestingMining:
         nest_variant = NestVariants.CHOICE_NEST
         if 'nest_variant' in parameters:
             nest_variant = parameters['nest_variant']
+        time_budget = parameters.get('choice_time_budget', None)
         # from the parameters ask which type of nesting do you want
         match nest_variant.value:
             case NestVariants.CHOICE.value:
-                return self.apply_choice(graph)
+                return self.apply_choice(graph, time_budget)
             case NestVariants.NEST.value:
                 return self.apply_nest(graph)
             case NestVariants.CHOICE_NEST.value:
-                return self.apply_nest(self.apply_choice(graph))
+                return self.apply_nest(self.apply_choice(graph, time_budget))
 
-    def apply_choice(self, graph):
-        choice = Choice()
+    def apply_choice(self, graph, time_budget: Optional[float] = None):
+        choice = Choice(time_budget)
         return choice.apply_choice(graph)
 
     def apply_nest(self, graph):
@@ -102,8 +107,9 @@ class NestingMining:
 
 class Choice(object):
 
-    def __init__(self):
+    def __init__(self, time_budget: Optional[float] = None):
         self.nesting_template = {"nestedgroups": {}, "nestedgroupsMap": {}, "subprocesses": {}}
+        self.time_budget = time_budget
 
     def apply_choice(self, graph):
         self.get_mutual_exclusions(graph)
@@ -146,6 +152,9 @@ class Choice(object):
     def get_mutual_exclusions(self, dcr, i:Optional[int]=0):
         """
         Get nested groups based on cliques. Updates the self.nesting_template dict
+        The groups are found by repeatedly taking a maximum clique of the mutual exclusion graph among the events
+        not yet in a group, until no clique of two or more events is left, which gives the same disjoint groups
+        as greedily picking the largest disjoint cliques among all the cliques of the graph.
         Parameters
         ----------
         dcr
@@ -156,46 +165,121 @@ class Choice(object):
         -------
 
         """
+        events, rel_matrix = self.get_mutually_excluding_matrix(dcr)
+        adjacency = [0] * len(events)
+        for e, e_prime in zip(*np.nonzero(rel_matrix)):
+            adjacency[e] |= 1 << int(e_prime)
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        remaining = 0
+        for e, neighbours in enumerate(adjacency):
+            if neighbours:
+                remaining |= 1 << e
+        while remaining:
+            clique = self.get_maximum_clique(adjacency, remaining, deadline)
+            if clique.bit_count() < 2:
+                break
+            # any new mutually exclusive subprocess must be disjoint from all existing ones
+            i += 1
+            self.nesting_template['nestedgroups'][f'Choice{i}'] = {events[e] for e in iter_indices(clique)}
+            remaining &= ~clique
 
-        graph = self.get_mutually_excluding_graph(dcr)
-        cliques = list(frozenset(s) for s in nx.enumerate_all_cliques(graph) if len(s) > 1)
-        cliques = sorted(cliques, key=len, reverse=True)
-        used_cliques = {}
-        for c in cliques:
-            used_cliques[c] = False
-
-        used_events = set()
-        for clique in cliques:
-            if not used_cliques[clique]:
-                if len(clique.intersection(used_events)) == 0:
-                    # any new mutually exclusive subprocess must be disjoint from all existing ones
-                    i += 1
-                    self.nesting_template['nestedgroups'][f'Choice{i}'] = set(clique)
-                    used_cliques[clique] = True
-                    used_events = used_events.union(clique)
+    def get_maximum_clique(self, adjacency: List[int], candidates: int, deadline: Optional[float] = None) -> int:
+        """
+        Bron-Kerbosch search with pivoting over bitsets for a maximum clique among the candidate events, pruning the
+        branches that cannot lead to a larger clique than the best one found so far.
+        The search starts from a greedy clique, and if the deadline is reached, the best clique found so far is returned.
+        Parameters
+        ----------
+        adjacency
+            For each event index, the mask of the events it is mutually excluding with
+        candidates
+            The mask of the events the clique is searched among
+        deadline
+            The time (as of time.perf_counter) at which the search stops, None to search until the end
+        Returns
+        -------
+        The mask of the events in the clique
+        """
+        best = self.get_greedy_clique(adjacency, candidates)
+        best_size = best.bit_count()
+        stack = [(0, 0, candidates, 0)]
+        while stack:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            clique, size, p, x = stack.pop()
+            if not p:
+                if not x and size > best_size:
+                    best, best_size = clique, size
+                continue
+            if size + p.bit_count() <= best_size:
+                continue
+            pivot = max(iter_indices(p | x), key=lambda u: (p & adjacency[u]).bit_count())
+            branches = []
+            for v in iter_indices(p & ~adjacency[pivot]):
+                bit = 1 << v
+                branches.append((clique | bit, size + 1, p & adjacency[v], x & adjacency[v]))
+                p &= ~bit
+                x |= bit
+            # explore the branches in index order
+            stack.extend(reversed(branches))
+        return best
+
+    def get_greedy_clique(self, adjacency: List[int], candidates: int) -> int:
+        clique = 0
+        while candidates:
+            e = max(iter_indices(candidates), key=lambda u: (candidates & adjacency[u]).bit_count())
+            clique |= 1 << e
+            candidates &= adjacency[e]
+        return clique
+
+    def get_mutually_excluding_matrix(self, graph):
+        """
+        Computes the mutual exclusion relation between the self-excluding events of a graph
+        Parameters
+        ----------
+        graph
+            A core Dcr Graph
+        Returns
+        -------
+        The sorted events of the graph, and a boolean matrix with e, e' set if they are distinct self-excluding events
+        excluding each other
+        """
+        events = sorted(graph.events)
+        index = {e: i for i, e in enumerate(events)}
+        rel_matrix = np.zeros((len(events), len(events)), dtype=bool)
+        for e, excluded in graph.excludes.items():
+            if e in index:
+                targets = [index[e_prime] for e_prime in excluded if e_prime in index]
+                rel_matrix[index[e], targets] = True
+
+        self_excluding = np.diagonal(rel_matrix).copy()
+        mutually_excluding = rel_matrix & rel_matrix.T & self_excluding[:, None] & self_excluding[None, :]
+        np.fill_diagonal(mutually_excluding, False)
+        return events, mutually_excluding
 
     def get_mutually_excluding_graph(self, graph):
-        ind = pd.Index(sorted(graph.events), dtype=str)
-        rel_matrix = pd.DataFrame(0, columns=ind, index=ind, dtype=int)
-        for e in graph.events:
-            for e_prime in graph.events:
-                if e in graph.excludes and e_prime in graph.excludes[e]:
-                    rel_matrix.at[e, e_prime] = 1
-
-        self_excluding = set()
-        for e in graph.events:
-            if rel_matrix.at[e, e] == 1:
-                self_excluding.add(e)
-        mutually_excluding = []
-        for e in self_excluding:
-            for e_prime in self_excluding:
-                if e != e_prime and rel_matrix.at[e, e_prime] == 1 and rel_matrix.at[e_prime, e] == 1:
-                    if (e, e_prime) not in mutually_excluding and (e_prime, e) not in mutually_excluding:
-                        mutually_excluding.append((e, e_prime))
-
-        return nx.from_edgelist(mutually_excluding)
+        events, rel_matrix = self.get_mutually_excluding_matrix(graph)
+        return nx.from_edgelist((events[e], events[e_prime]) for e, e_prime in zip(*np.nonzero(np.triu(rel_matrix))))
 
 class Nesting(object):
+    """
+    Nesting miner on an integer encoding of the relations of the graph.
+
+    Each relation of an event is a triple (other event, relation, direction) interned to a bit, such that the
+    encoding of an event is the mask of its relation triples. The relations shared by two events are the
+    intersection of their masks, and the events with identical masks are grouped before the candidate nestings
+    are searched, such that each pair of distinct masks is intersected once.
+
+    Attributes
+    ----------
+    enc: Dict[str, int]
+        For each event (and nesting), the mask of its relation triples
+    triples: List[Tuple[str, str, str]]
+        The relation triple of each bit
+    triple_index: Dict[Tuple[str, str, str], int]
+        The bit of each relation triple
+    """
 
     def __init__(self):
         self.nesting_template = {"nestedgroups": {}, "nestedgroupsMap": {}, "subprocesses": {}}
@@ -203,27 +287,42 @@ class Nesting(object):
         self.nesting_map = {}
         self.nest_id = 0
         self.enc = None
+        self.triples = []
+        self.triple_index = {}
+        self.targeting = {}
         self.in_rec_step = 0
         self.out_rec_step = 0
         self.debug = False
 
+    def get_bit(self, triple):
+        """
+        Returns the bit of a relation triple, interning it if new
+        """
+        i = self.triple_index.get(triple)
+        if i is None:
+            i = len(self.triples)
+            self.triples.append(triple)
+            self.triple_index[triple] = i
+            # keep track of the triples pointing to each event, to rename them when a nesting is removed
+            self.targeting[triple[0]] = self.targeting.get(triple[0], 0) | (1 << i)
+        return 1 << i
+
+    def decode(self, mask):
+        return {self.triples[i] for i in iter_indices(mask)}
+
     def encode(self, G):
         enc = {}
         for e in G['events']:
-            enc[e] = set()
-        for e in G['events']:
-            for e_prime in G['events']:
-                for rel in Relations:
-                    if e in G[rel.value] and e_prime in G[rel.value][e]:
-                        if rel in [Relations.C, Relations.M]:
-                            enc[e].add((e_prime, rel.value, 'in'))
-                        else:
-                            enc[e].add((e_prime, rel.value, 'out'))
-                    if e_prime in G[rel.value] and e in G[rel.value][e_prime]:
-                        if rel in [Relations.C, Relations.M]:
-                            enc[e].add((e_prime, rel.value, 'out'))
-                        else:
-                            enc[e].add((e_prime, rel.value, 'in'))
+            enc[e] = 0
+        for rel in Relations:
+            in_direction, out_direction = ('in', 'out') if rel in [Relations.C, Relations.M] else ('out', 'in')
+            for e, targets in G[rel.value].items():
+                if e not in enc:
+                    continue
+                for e_prime in targets:
+                    if e_prime in enc:
+                        enc[e] |= self.get_bit((e_prime, rel.value, in_direction))
+                        enc[e_prime] |= self.get_bit((e, rel.value, out_direction))
         return enc
 
     def get_opposite_rel_dict_str(self, relStr, direction, event, nestingId):
@@ -235,55 +334,73 @@ class Nesting(object):
     def create_encoding(self, dcr_graph):
         self.enc = self.encode(dcr_graph)
 
-    def find_largest_nesting(self, events_source, parent_nesting=None):
-        cands = {}
-        events = deepcopy(events_source)
+    def get_candidates(self, events):
+        """
+        Computes the candidate nestings of a set of events: for each set of relations shared by a pair of events,
+        all the events of the pairs sharing exactly these relations.
+        The events are first grouped on their masks, such that each pair of distinct masks is intersected once,
+        and the candidates are found in the same order as when intersecting every pair of events.
+        """
+        groups = {}
         for e in events:
-            for j in events:
-                arrow_s = frozenset(self.enc[e].intersection(self.enc[j]))
-                if len(arrow_s) > 0:
-                    if not arrow_s in cands:
+            mask = self.enc[e]
+            if mask:
+                groups.setdefault(mask, set()).add(e)
+        masks = list(groups.items())
+        cands = {}
+        for a, (mask_a, events_a) in enumerate(masks):
+            for mask_b, events_b in masks[a:]:
+                arrow_s = mask_a & mask_b
+                if arrow_s:
+                    if arrow_s not in cands:
                         cands[arrow_s] = set([])
-                    cands[arrow_s] = cands[arrow_s].union(set([e, j]))
+                    cands[arrow_s] = cands[arrow_s].union(events_a, events_b)
+        return cands
+
+    def find_largest_nesting(self, events_source, parent_nesting=None):
+        events = deepcopy(events_source)
+        cands = self.get_candidates(events)
 
         best_score = 0
         best = None
         for arrow_s in cands.keys():
-            cand_score = (len(cands[arrow_s]) - 1) * len(arrow_s)
+            cand_score = (len(cands[arrow_s]) - 1) * arrow_s.bit_count()
             if cand_score > best_score:
                 best_score = cand_score
                 best = arrow_s
 
-        if best and len(cands[best]) > 1 and len(best) >= 1:
+        if best and len(cands[best]) > 1:
             if self.debug:
                 print(
                     f'[out]:{self.out_rec_step} [in]:{self.in_rec_step} \n'
                     f'     [events] {events} \n'
                     f'[cands[best]] {cands[best]} \n'  # these are the events inside the nesting
-                    f'       [best] {best} \n'
-                    f'        [enc] {self.enc} \n '
-                    f'      [cands] {cands} \n'
+                    f'       [best] {self.decode(best)} \n'
+                    f'        [enc] { {e: self.decode(v) for e, v in self.enc.items()} } \n '
+                    f'      [cands] { {frozenset(self.decode(k)): v for k, v in cands.items()} } \n'
                 )
             self.nest_id += 1
             nest_event = f'Group{self.nest_id}'
             self.nesting_ids.add(nest_event)
-            self.enc[nest_event] = set(best)
+            self.enc[nest_event] = best
 
             if parent_nesting:
                 parent_nesting['events'] = parent_nesting['events'].difference(cands[best])
                 parent_nesting['events'].add(nest_event)
                 self.nesting_map[nest_event] = parent_nesting['id']
 
+            best_triples = [self.triples[i] for i in iter_indices(best)]
             for e in cands[best]:
                 self.nesting_map[e] = nest_event
-                self.enc[e] = self.enc[e].difference(best)
-                for (e_prime, rel, direction) in best:
+                self.enc[e] &= ~best
+                for (e_prime, rel, direction) in best_triples:
                     op_rel_del, op_rel_add = self.get_opposite_rel_dict_str(rel, direction, e, nest_event)
                     # TODO: find out why sometimes it tries to remove non-existing encodings
-                    self.enc[e_prime].discard(op_rel_del)  # .remove(op_rel_del)
-                    self.enc[e_prime].add(op_rel_add)
+                    if op_rel_del in self.triple_index:
+                        self.enc[e_prime] &= ~self.get_bit(op_rel_del)
+                    self.enc[e_prime] |= self.get_bit(op_rel_add)
 
-            retval = [{'nestingEvents': cands[best], 'sharedRels': best}]
+            retval = [{'nestingEvents': cands[best], 'sharedRels': self.decode(best)}]
             found = True
             while found:
                 temp_retval = self.find_largest_nesting(events_source=cands[best], parent_nesting={'id': f'Group{self.nest_id}', 'events': cands[best]})
@@ -335,15 +452,19 @@ class Nesting(object):
             del self.nesting_map[nest_to_remove]
             self.nesting_ids.remove(nest_to_remove)
 
-            for e, v in deepcopy(list(self.enc.items())):
-                for r in v:  #I get a set changed error here
-                    (e_prime, rel, direction) = r
-                    if e_prime == nest_to_remove:
-                        self.enc[e].remove(r)
-                        self.enc[e].add((parent, rel, direction))
-                if e == nest_to_remove:
-                    self.enc[parent] = self.enc[parent].union(self.enc[e])
-                    del self.enc[e]
+            # the triples pointing to the removed nesting now point to its parent
+            renamed = {}
+            for i in iter_indices(self.targeting.get(nest_to_remove, 0)):
+                (_, rel, direction) = self.triples[i]
+                renamed[1 << i] = self.get_bit((parent, rel, direction))
+            for e, v in list(self.enc.items()):
+                for bit, parent_bit in renamed.items():
+                    if v & bit:
+                        v = (v & ~bit) | parent_bit
+                self.enc[e] = v
+            if nest_to_remove in self.enc:
+                self.enc[parent] = self.enc[parent] | self.enc[nest_to_remove]
+                del self.enc[nest_to_remove]
 
     def should_add(self, rel, direction):
         return direction == 'in' if rel in [Relations.C.value, Relations.M.value] else direction == 'out'
@@ -360,7 +481,7 @@ class Nesting(object):
             res_dcr['nestedgroups'][v].add(k)
 
         for e, v in self.enc.items():
-            for e_prime, rel, direction in v:
+            for e_prime, rel, direction in self.decode(v):
                 if self.should_add(rel, direction):
                     if e not in res_dcr[rel]:
                         res_dcr[rel][e] = set()
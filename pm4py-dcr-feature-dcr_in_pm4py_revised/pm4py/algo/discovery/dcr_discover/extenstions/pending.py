@@ -1,13 +1,12 @@
-from typing import Union
+from typing import Union, Optional, Dict, Any, Iterator, Tuple, Set
 
-import pm4py
 import pandas as pd
 
-from copy import deepcopy
-
+from pm4py.algo.discovery.dcr_discover.variants.dcr_discover import Discover
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
 from pm4py.objects.dcr.obj import DcrGraph
-from pm4py.objects.dcr.semantics import DcrSemantics
 from pm4py.objects.log.obj import EventLog
+from pm4py.util import exec_utils, constants, xes_constants
 
 
 def apply(log: Union[pd.DataFrame,EventLog], graph: DcrGraph, parameters):
@@ -19,41 +18,99 @@ def apply(log: Union[pd.DataFrame,EventLog], graph: DcrGraph, parameters):
         Event log / Pandas dataframe
     graph
         DCR Graph
-    ignore_lifecycle
-        If True it does not take into account the 'lifecycle:transition'  attribute of the log event else False
+    parameters
+        Parameters of the algorithm, including:
+            - ignore_lifecycle: if True it does not take into account the 'lifecycle:transition' attribute of the
+              log events, else only the traces with all their events completed are considered (default True)
+            - activity_key, case_id_key, transition_key: the attributes of the log
 
     Returns
     ----------
     An updated DCR Graph with the Pending Marking updated to contain initially pending events
     """
-    ignore_lifecycle = True
-    if 'ignore_lifecycle' in parameters:
-        ignore_lifecycle = parameters["ignore_lifecycle"]
-
-    if isinstance(log, pd.DataFrame):
-        log = pm4py.convert_to_event_log(log)
-
-    at_least_once_all_traces = set(graph.events)
-    end_excluded_all_traces = set(graph.events)
-
-    for trace in log:
-        executed_events = set()
-        im = deepcopy(graph.marking)
-        temp_graph = deepcopy(graph)
-        complete = True
-        semantics_obj = DcrSemantics()
-        for event in trace:
-            semantics_obj.execute(temp_graph, event['concept:name'])
-            if event['concept:name'] in temp_graph.marking.executed:
-                executed_events.add(event['concept:name'])
+    pending_mine = PendingMining()
+    return pending_mine.mine(log, graph, parameters)
+
+
+class PendingMining:
+    """
+    The PendingMining discovers the events that are initially pending in a DCR Graph: the events executed at least
+    once in every trace, and the events excluded at the end of every trace.
+
+    Each variant of the log is replayed once on the compiled graph, the executions are applied regardless of
+    the enabledness of the events, as in DcrSemantics.execute.
+
+    Methods
+    -------
+    mine(log, graph, parameters) -> DcrGraph
+        returns the graph with the initially pending events added to its marking
+    replay_variants(log, graph, parameters) -> Iterator[Tuple[Tuple[str], Set[str], Set[str]]]
+        replays the variants of the log one at a time, yielding their executed and excluded events
+    """
+
+    def get_variants(self, log: Union[pd.DataFrame, EventLog], parameters: Optional[Dict[str, Any]]):
+        """
+        Computes the variants of the traces to replay, dataframes are handled without conversion to an event log.
+        If the lifecycle is not ignored, the traces containing any event that is not completed are left out.
+        """
+        parameters = {} if parameters is None else parameters
+        ignore_lifecycle = parameters.get("ignore_lifecycle", True)
+        activity_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_ACTIVITY_KEY, parameters,
+                                                  xes_constants.DEFAULT_NAME_KEY)
+        case_id_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_CASEID_KEY, parameters,
+                                                 constants.CASE_CONCEPT_NAME)
+        transition_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_TRANSITION_KEY, parameters,
+                                                    xes_constants.DEFAULT_TRANSITION_KEY)
+        if isinstance(log, pd.DataFrame):
             if not ignore_lifecycle:
-                complete = complete and event['lifecycle:transition'] == 'complete'
-        if complete:
-            fm = temp_graph.marking
-            excluded_events = im.included.difference(fm.included)
-            at_least_once_all_traces = at_least_once_all_traces.intersection(executed_events)
-            end_excluded_all_traces = end_excluded_all_traces.intersection(excluded_events)
-
-    initially_pending = at_least_once_all_traces.union(end_excluded_all_traces)
-    graph.marking.pending = graph.marking.pending.union(initially_pending)
-    return graph
+                incomplete = log.loc[log[transition_key] != 'complete', case_id_key].unique()
+                log = log[~log[case_id_key].isin(incomplete)]
+            _, variants = Discover.getDataframeVariants(log, activity_key, case_id_key)
+            return variants
+
+        variants = {}
+        for trace in log:
+            if not ignore_lifecycle and any(event[transition_key] != 'complete' for event in trace):
+                continue
+            variants.setdefault(tuple(event[activity_key] for event in trace), None)
+        return list(variants)
+
+    def replay_variants(self, log: Union[pd.DataFrame, EventLog], graph: DcrGraph,
+                        parameters: Optional[Dict[str, Any]]) -> Iterator[Tuple[Tuple[str], Set[str], Set[str]]]:
+        """
+        Replays each variant of the log once from the marking of the graph, on its compiled representation
+
+        Parameters
+        ----------
+        log
+            Event log / Pandas dataframe
+        graph
+            DCR Graph
+        parameters
+            Parameters of the algorithm, as in apply
+
+        Returns
+        -------
+        Iterator of the variants with the events executed in the variant and the events excluded at its end
+        """
+        compiled = graph.compile()
+        initial_marking = compiled.initial_marking
+        for variant in self.get_variants(log, parameters):
+            marking = initial_marking
+            for activity in variant:
+                event = compiled.index_of(activity)
+                if event is not None:
+                    marking = CompiledSemantics.execute(compiled, marking, event)
+            excluded_events = compiled.decode(initial_marking[1] & ~marking[1])
+            yield variant, set(variant), excluded_events
+
+    def mine(self, log: Union[pd.DataFrame, EventLog], graph: DcrGraph, parameters: Optional[Dict[str, Any]]):
+        at_least_once_all_traces = set(graph.events)
+        end_excluded_all_traces = set(graph.events)
+        for _, executed_events, excluded_events in self.replay_variants(log, graph, parameters):
+            at_least_once_all_traces.intersection_update(executed_events)
+            end_excluded_all_traces.intersection_update(excluded_events)
+
+        initially_pending = at_least_once_all_traces.union(end_excluded_all_traces)
+        graph.marking.pending = graph.marking.pending.union(initially_pending)
+        return graph
@@ -1,7 +1,8 @@
-from copy import deepcopy
+import concurrent.futures
 
+import numpy as np
 import pandas as pd
-from typing import Optional, Any, Union, Dict
+from typing import Optional, Any, Union, Dict, List, Tuple
 import pm4py
 from pm4py.objects.dcr.obj import DcrGraph
 from pm4py.util import exec_utils, constants, xes_constants
@@ -21,7 +22,8 @@ def apply(log, graph: DcrGraph, parameters) -> TimedDcrGraph:
         Dcr graph to apply additional attributes to
     parameters
         Parameters of the algorithm, including:
-
+            - activity_key, case_id_key, timestamp_key: the attributes of the log
+            - max_workers: number of processes mining the timings of the relations (default 1, in the calling process)
 
     Returns
     -------
@@ -32,6 +34,100 @@ def apply(log, graph: DcrGraph, parameters) -> TimedDcrGraph:
     return time_mine.mine(log, graph, parameters)
 
 
+class TimingIndex:
+    """
+    Integer encoded view of an event log, sorted once by case and timestamp, used to compute the delays between
+    the events of any pair of activities without grouping the log per case.
+
+    Attributes
+    ----------
+    cases: np.ndarray
+        case code of each event
+    codes: np.ndarray
+        activity code of each event
+    timestamps: np.ndarray
+        timestamp of each event, in nanoseconds
+
+    Methods
+    -------
+    get_timing(rule, a, b) -> Optional[int]
+        minimum delay of a condition or maximum deadline of a response, in nanoseconds
+    """
+    def __init__(self, cases: np.ndarray, codes: np.ndarray, timestamps: np.ndarray):
+        order = np.lexsort((timestamps, cases))
+        self.cases = cases[order]
+        self.codes = codes[order]
+        self.timestamps = timestamps[order]
+        # positions of the events of each activity, in the order of the log
+        self.__by_code = np.argsort(self.codes, kind='stable')
+        self.__code_bounds = np.searchsorted(self.codes[self.__by_code], np.arange(int(self.codes.max(initial=-1)) + 2))
+
+    def positions(self, code: int) -> np.ndarray:
+        if code + 1 >= len(self.__code_bounds):
+            return np.zeros(0, dtype=np.int64)
+        return self.__by_code[self.__code_bounds[code]:self.__code_bounds[code + 1]]
+
+    def get_timing(self, rule: str, a: int, b: int) -> Optional[int]:
+        """
+        Computes the timing of a relation from the consecutive events of a and b in each case, considering only the
+        events of a and b, in the cases where some b occurs at or after the first a:
+            - CONDITION (b is a condition for a, given as the pair (b, a)): the minimum delay from a to a following b
+            - RESPONSE (b is a response to a): the maximum delay from a to a following b or a
+
+        Parameters
+        ----------
+        rule
+            'CONDITION' or 'RESPONSE'
+        a
+            code of the first activity of the pair
+        b
+            code of the second activity of the pair
+
+        Returns
+        -------
+        timing
+            the delay in nanoseconds, None if no pair of events was found
+        """
+        pos_a, pos_b = self.positions(a), self.positions(b)
+        if len(pos_a) == 0 or len(pos_b) == 0:
+            return None
+        cases, timestamps = self.cases, self.timestamps
+        case_a = cases[pos_a]
+        # cases where some b occurs at or after the first a
+        first_a = pd.Series(timestamps[pos_a]).groupby(case_a).min()
+        last_b = pd.Series(timestamps[pos_b]).groupby(cases[pos_b]).max()
+        joined = first_a.to_frame('a').join(last_b.to_frame('b'), how='inner')
+        valid_cases = joined.index[joined['a'] <= joined['b']].to_numpy()
+        keep = np.isin(case_a, valid_cases)
+        # next b and next a after each a, in the same case
+        next_b_index = np.searchsorted(pos_b, pos_a, side='right')
+        has_b = next_b_index < len(pos_b)
+        next_b = np.where(has_b, pos_b[np.minimum(next_b_index, len(pos_b) - 1)], -1)
+        has_b &= cases[next_b] == case_a
+        next_a = np.r_[pos_a[1:], -1]
+        has_a = (next_a >= 0) & (cases[next_a] == case_a)
+        to_b = keep & has_b & (~has_a | (next_b < next_a))
+        deltas = timestamps[next_b[to_b]] - timestamps[pos_a[to_b]]
+        if rule == 'RESPONSE':
+            to_a = keep & has_a & (~has_b | (next_a < next_b))
+            deltas = np.r_[deltas, timestamps[next_a[to_a]] - timestamps[pos_a[to_a]]]
+            return int(deltas.max()) if len(deltas) > 0 else None
+        return int(deltas.min()) if len(deltas) > 0 else None
+
+
+# timing index of a worker process, set by the initializer of the pool
+_worker_index = None
+
+
+def _init_worker(cases: np.ndarray, codes: np.ndarray, timestamps: np.ndarray) -> None:
+    global _worker_index
+    _worker_index = TimingIndex(cases, codes, timestamps)
+
+
+def _mine_pairs(pairs: List[Tuple[str, int, int]]) -> List[Optional[int]]:
+    return [_worker_index.get_timing(rule, a, b) for rule, a, b in pairs]
+
+
 class TimeMining:
     """
     The TimeMining provides a simple algorithm to mine timing data of an event log for DCR graphs
@@ -54,68 +150,58 @@ class TimeMining:
         self.timing_dict = {"conditionsForDelays": {}, "responseToDeadlines": {}}
 
 
-    def get_log_with_pair(self, event_log, e1, e2):
-        '''
-        when selecting the case ids (cids) here there is a difference when taking
-        strictly less than < and strictly less than or equal <=
-        Less than or equal <= allows for instant executions (so a time of 0 between events e1 and e2)
-        '''
-        first_e1 = event_log[event_log['concept:name'] == e1].groupby('case:concept:name')[
-            ['case:concept:name', 'time:timestamp']].first().reset_index(drop=True)
-        subset_is_in = first_e1.merge(event_log, on='case:concept:name', how='inner', suffixes=('_e1', ''))
-        cids = subset_is_in[
-            ((subset_is_in['time:timestamp_e1'] <= subset_is_in['time:timestamp']) & (subset_is_in['concept:name'] == e2))][
-            'case:concept:name'].unique()
-        return event_log[event_log['case:concept:name'].isin(cids)].copy(deep=True)
-
-
-    def get_delta_between_events(self, filtered_df, event_pair, rule=None):
-        e1 = event_pair[0]
-        e2 = event_pair[1]
-        filtered_df = filtered_df[['case:concept:name', 'concept:name', 'time:timestamp']]
-        filtered_df = filtered_df[filtered_df['concept:name'].isin(event_pair)]
-        filtered_df['time:timestamp'] = pd.to_datetime(filtered_df['time:timestamp'], utc=True)
-        deltas = []
-        # for idx, g in filtered_df[filtered_df['concept:name'].isin([e1, e2])].groupby('case:concept:name'):
-        for idx, g in filtered_df.groupby('case:concept:name'):
-            g = g.sort_values(by='time:timestamp').reset_index(drop=True)
-            g['time:timestamp:to'] = g['time:timestamp'].shift(-1)
-            g['concept:name:to'] = g['concept:name'].shift(-1)
-            temp_df = deepcopy(g)
-            res = []
-            if rule == 'RESPONSE':
-                g_e1 = deepcopy(g[g['concept:name'] == e1])
-                if len(g_e1) >= 1:
-                    g_e1 = g_e1.reset_index(drop=False)
-                    g_e1['index_below'] = g_e1['index'].shift(-1)
-                    g_e1 = g_e1[((g_e1['index_below'] - g_e1['index']) == 1)]
-                    g_e1['delta'] = g_e1['time:timestamp:to'] - g_e1['time:timestamp']
-                    res.extend(g_e1['delta'])
-                temp_df = temp_df[
-                    (temp_df['concept:name'] == e1) & (temp_df['concept:name:to'] == e2)]
-                temp_df['delta'] = temp_df['time:timestamp:to'] - temp_df['time:timestamp']
-                res.extend(temp_df['delta'])
-            elif rule == 'CONDITION':
-                temp_df = temp_df[
-                    (temp_df['concept:name'] == e1) & (temp_df['concept:name:to'] == e2)]
-                temp_df['delta'] = temp_df['time:timestamp:to'] - temp_df['time:timestamp']
-                res.extend(temp_df['delta'])
-            else:
-                temp_df = temp_df[
-                    (temp_df['concept:name'] == e1) & (temp_df['concept:name:to'] == e2)]
-                temp_df['delta'] = temp_df['time:timestamp:to'] - temp_df['time:timestamp']
-                res.extend(temp_df['delta'])
-            deltas.extend(res)
-        return deltas
-
+    def get_timings(self, log: pd.DataFrame, timing_input_dict: Dict[str, set], activity_key: str, case_id_key: str,
+                    timestamp_key: str, max_workers: int = 1) -> Dict[Tuple[str, str, str], pd.Timedelta]:
+        """
+        Computes the timings of all the pairs of activities at once, on an integer encoded copy of the log.
+        With more than one worker, the pairs are divided among processes that receive the encoded log once.
+
+        Parameters
+        ----------
+        log: pd.DataFrame
+            the event log
+        timing_input_dict: Dict[str, set]
+            the pairs of activities of each rule, 'CONDITION' and 'RESPONSE'
+        activity_key, case_id_key, timestamp_key: str
+            the attributes of the log
+        max_workers: int
+            the number of processes
+
+        Returns
+        -------
+        Dict[Tuple[str, str, str], pd.Timedelta]
+            the timing of each (rule, activity, activity) for which events were found
+        """
+        codes, labels = pd.factorize(log[activity_key])
+        cases, _ = pd.factorize(log[case_id_key])
+        timestamps = pd.to_datetime(log[timestamp_key], utc=True).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        index = {label: i for i, label in enumerate(labels)}
+        pairs = [(rule, index[e1], index[e2], e1, e2) for rule, event_pairs in timing_input_dict.items()
+                 for e1, e2 in sorted(event_pairs) if e1 in index and e2 in index]
+        requests = [(rule, a, b) for rule, a, b, _, _ in pairs]
+        if max_workers > 1 and len(requests) > 1:
+            chunk_size = -(-len(requests) // max_workers)
+            chunks = [requests[i:i + chunk_size] for i in range(0, len(requests), chunk_size)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                        initargs=(cases, codes, timestamps)) as executor:
+                results = [timing for chunk_result in executor.map(_mine_pairs, chunks) for timing in chunk_result]
+        else:
+            timing_index = TimingIndex(cases, codes, timestamps)
+            results = [timing_index.get_timing(rule, a, b) for rule, a, b in requests]
+        return {(rule, e1, e2): pd.Timedelta(timing, unit='ns')
+                for (rule, _, _, e1, e2), timing in zip(pairs, results) if timing is not None}
 
     def mine(self, log: Union[pd.DataFrame, EventLog], graph, parameters: Optional[Dict[str, Any]]):
         activity_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_ACTIVITY_KEY, parameters,
                                                   xes_constants.DEFAULT_NAME_KEY)
+        case_id_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_CASEID_KEY, parameters,
+                                                 constants.CASE_CONCEPT_NAME)
+        timestamp_key = exec_utils.get_param_value(constants.PARAMETER_CONSTANT_TIMESTAMP_KEY, parameters,
+                                                   xes_constants.DEFAULT_TIMESTAMP_KEY)
+        max_workers = parameters.get("max_workers", 1) if parameters else 1
         # perform mining on event logs
         if not isinstance(log, pd.DataFrame):
             log = pm4py.convert_to_dataframe(log)
-        activities = log[activity_key].unique()
 
         timing_input_dict = {'CONDITION': set(), 'RESPONSE': set()}
         for e1 in graph.conditions.keys():
@@ -126,13 +212,7 @@ class TimeMining:
             for e2 in graph.responses[e1]:
                 timing_input_dict['RESPONSE'].add((e1, e2))
 
-        timings = {}
-        for rule, event_pairs in timing_input_dict.items():
-            for event_pair in event_pairs:
-                if event_pair[0] in activities and event_pair[1] in activities:
-                    filtered_df = self.get_log_with_pair(log, event_pair[0], event_pair[1])
-                    data = self.get_delta_between_events(filtered_df, event_pair, rule)
-                    timings[(rule, event_pair[0], event_pair[1])] = data
+        timings = self.get_timings(log, timing_input_dict, activity_key, case_id_key, timestamp_key, max_workers)
 
         # these are a dict with events as keys and tuples as values
         for timing, value in timings.items():
@@ -142,13 +222,13 @@ class TimeMining:
                 if e1 not in self.timing_dict['conditionsForDelays']:
                     self.timing_dict['conditionsForDelays'][e1] = {}
                 # to have perfect fitness we extract the minimum delay for conditions
-                self.timing_dict['conditionsForDelays'][e1][e2] = min(value)
+                self.timing_dict['conditionsForDelays'][e1][e2] = value
             elif timing[0] == 'RESPONSE':
                 e1 = timing[1]
                 e2 = timing[2]
                 if e1 not in self.timing_dict['responseToDeadlines']:
                     self.timing_dict['responseToDeadlines'][e1] = {}
                 # to have perfect fitness we extract the maximum deadline for responses
-                self.timing_dict['responseToDeadlines'][e1][e2] = max(value)
+                self.timing_dict['responseToDeadlines'][e1][e2] = value
 
         return TimedDcrGraph({**graph.obj_to_template(), **self.timing_dict})
@@ -11,6 +11,7 @@ from typing import Tuple, Dict, Set, Any, List, Union
 from pm4py.util import exec_utils, constants, xes_constants
 from pm4py.objects.log.obj import EventLog
 from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.dcr.compiled.obj import iter_indices
 
 
 # these parameters are used in case of attribute has a custom name, in which case it can be specified on call
@@ -25,9 +26,13 @@ class Parameters(Enum):
         The key used to identify the activity attribute in the event log.
     CASE_ID_KEY : str
         The key used to identify the case identifier attribute in the event log.
+    LOG_ABSTRACTION : str
+        The key used to provide the log abstraction of a previous discovery, which is updated with the traces
+        of the event log instead of being created from scratch.
     """
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    LOG_ABSTRACTION = "log_abstraction"
 
 
 def apply(log, findAdditionalConditions=True, parameters = None) -> Tuple[DcrGraph,Dict[str, Any]]:
@@ -44,6 +49,9 @@ def apply(log, findAdditionalConditions=True, parameters = None) -> Tuple[DcrGra
         Possible parameters of the algorithm, including:
         - Parameters.ACTIVITY_KEY
         - Parameters.Case_ID_KEY
+        - Parameters.LOG_ABSTRACTION: the log abstraction returned by a previous discovery, the traces of the log
+          are added to it (in place) and the graph is mined from the updated abstraction, i.e., from all the traces
+          seen so far
     Returns
     -------
     tuple(dict,dict)
@@ -56,10 +64,60 @@ def apply(log, findAdditionalConditions=True, parameters = None) -> Tuple[DcrGra
         International Journal on Software Tools for Technology Transfer, 2022, 24:563–587. 'DOI' <https://doi.org/10.1007/s10009-021-00616-0>_.
 
     """
-    disc = Discover()
+    disc = Discover(exec_utils.get_param_value(Parameters.LOG_ABSTRACTION, parameters, None))
     return disc.mine(log, findAdditionalConditions, parameters = parameters)
 
 
+def export_log_abstraction(log_abstraction: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a log abstraction to a JSON serializable dictionary, in which sets are replaced by sorted lists.
+
+    Parameters
+    ----------
+    log_abstraction
+        log abstraction returned by the discovery
+
+    Returns
+    -------
+    dict
+        the log abstraction with lists in place of sets
+    """
+    res = {}
+    for key, value in log_abstraction.items():
+        if isinstance(value, set):
+            res[key] = sorted(value)
+        elif isinstance(value, dict):
+            res[key] = {event: sorted(targets) for event, targets in value.items()}
+        else:
+            res[key] = [list(trace) for trace in value]
+    return res
+
+
+def import_log_abstraction(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restores a log abstraction from the dictionary produced by export_log_abstraction.
+
+    Parameters
+    ----------
+    data
+        log abstraction with lists in place of sets
+
+    Returns
+    -------
+    dict
+        the log abstraction, which can be given as Parameters.LOG_ABSTRACTION to a new discovery
+    """
+    res = {}
+    for key, value in data.items():
+        if key == 'traces':
+            res[key] = [list(trace) for trace in value]
+        elif isinstance(value, dict):
+            res[key] = {event: set(targets) for event, targets in value.items()}
+        else:
+            res[key] = set(value)
+    return res
+
+
 class Discover:
     """
     The Discover class is responsible for mining DCR graphs from event logs.
@@ -79,18 +137,31 @@ class Discover:
     createLogAbstraction(log: Union[EventLog, pd.DataFrame], activity_key: str, case_key: str) -> int:
         Creates an abstraction of the event log to facilitate the mining process.
 
+    updateLogAbstraction(log: Union[EventLog, pd.DataFrame], activity_key: str, case_key: str) -> int:
+        Adds the traces of an event log to the current abstraction.
+
     parseTrace(trace: List[str]) -> int:
         Parses a single trace to extract relations between events.
 
+    getDataframeVariants(log: pd.DataFrame, activity_key: str, case_key: str) -> Tuple[Set[str], List[Tuple[str]]]:
+        Computes the activities and the variants of a dataframe with integer encoded numpy operations.
+
+    parseTraces(traces: List[Tuple[str]]) -> int:
+        Parses a collection of traces at once, with boolean activity matrices.
+
     optimizeRelation(relation: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
         Optimizes a relation by removing redundant relations based on transitive closure.
 
     mineFromAbstraction(findAdditionalConditions: bool = True) -> int:
         Mines DCR constraints from the log abstraction.
     """
-    def __init__(self):
+    # upper bound on the pairs of activities in the same trace computed at once by parseTraces
+    MAX_PAIRS_PER_CHUNK = 1 << 22
+
+    def __init__(self, logAbstraction: Dict[str, Any] = None):
         self.graph = deepcopy(dcr_template)
-        self.logAbstraction = {
+        self.incremental = logAbstraction is not None
+        self.logAbstraction = logAbstraction if logAbstraction is not None else {
             'events': set(),
             'traces': [[]],
             'atMostOnce': set(),
@@ -125,7 +196,10 @@ class Discover:
         """
         activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
         case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
-        self.createLogAbstraction(log, activity_key, case_id_key)
+        if self.incremental:
+            self.updateLogAbstraction(log, activity_key, case_id_key)
+        else:
+            self.createLogAbstraction(log, activity_key, case_id_key)
         self.mineFromAbstraction(findAdditionalConditions=findAdditionalConditions)
         return DcrGraph(self.graph), self.logAbstraction
 
@@ -142,33 +216,66 @@ class Discover:
         case_key : str
             The attribute key used to identify the cases recorded in the log.
 
+        Returns
+        -------
+        int
+            Returns 0 for success, and any other value for failure.
+        """
+        self.logAbstraction['traces'] = []
+        return self.updateLogAbstraction(log, activity_key, case_key)
+
+    def updateLogAbstraction(self, log: [EventLog, pd.DataFrame], activity_key: str, case_key: str) -> int:
+        """
+        Adds the traces of an event log to the abstraction. All the relations of the abstraction are intersections
+        or unions over the traces, so the result is the abstraction of all the traces added so far, while only the
+        new traces are parsed. The relations of an event seen for the first time start from all the events, as no
+        trace constrained them yet.
+
+        Parameters
+        ----------
+        log : EventLog | pd.DataFrame
+            The event log with the traces to add.
+        activity_key : str
+            The attribute key used to identify the activities recorded in the log.
+        case_key : str
+            The attribute key used to identify the cases recorded in the log.
+
         Returns
         -------
         int
             Returns 0 for success, and any other value for failure.
         """
         # initiate the activities, in DisCoveR, activities and event id is mapped bijectively
-        activities = get_event_attribute_values(log, activity_key)
-        events = set(activities)
+        if isinstance(log, pd.DataFrame):
+            # dataframes are abstracted without materializing the events of each case
+            activities, variants = self.getDataframeVariants(log, activity_key, case_key)
+        else:
+            activities = get_event_attribute_values(log, activity_key)
+            variants = set(tuple(i) for i in pm4py.project_on_event_attribute(log, case_id_key=case_key))
+        new_events = set(activities).difference(self.logAbstraction['events'])
 
         # load events in to log abstraction
-        self.logAbstraction['events'] = events.copy()
-        log = pm4py.project_on_event_attribute(log, case_id_key=case_key)
+        self.logAbstraction['events'].update(new_events)
+        events = self.logAbstraction['events']
 
-        # flatten the event log, all traces are equally significant
-        traces = set(tuple(i) for i in log)
+        # flatten the event log, all traces are equally significant, and traces already parsed do not change the relations
+        known_traces = set(tuple(i) for i in self.logAbstraction['traces'])
+        traces = set(variants).difference(known_traces)
         traces = [list(i) for i in traces]
 
-        self.logAbstraction['traces'] = traces
-        self.logAbstraction['atMostOnce'] = events.copy()
-        for event in events:
+        self.logAbstraction['traces'].extend(traces)
+        self.logAbstraction['atMostOnce'].update(new_events)
+        for event in new_events:
             self.logAbstraction['chainPrecedenceFor'][event] = events.copy() - set([event])
             self.logAbstraction['precedenceFor'][event] = events.copy() - set([event])
             self.logAbstraction['predecessor'][event] = set()
             self.logAbstraction['responseTo'][event] = events.copy() - set([event])
             self.logAbstraction['successor'][event] = set()
-        for trace in self.logAbstraction['traces']:
-            self.parseTrace(trace)
+        if isinstance(log, pd.DataFrame):
+            self.parseTraces(traces)
+        else:
+            for trace in traces:
+                self.parseTrace(trace)
 
         for i in self.logAbstraction['predecessor']:
             for j in self.logAbstraction['predecessor'][i]:
@@ -238,6 +345,150 @@ class Discover:
                 seenOnlyAfter)
         return 0
 
+    @staticmethod
+    def getDataframeVariants(log: pd.DataFrame, activity_key: str, case_key: str) -> Tuple[Set[str], List[Tuple[str]]]:
+        """
+        Computes the activities and the variants of a dataframe. Activities and cases are integer encoded,
+        the events are grouped by case keeping their order in the dataframe, and the cases are deduplicated on the
+        bytes of their activity codes, such that no Python object is created per event.
+
+        Parameters
+        ----------
+        log : pd.DataFrame
+            The event log, with the events of each case in order.
+        activity_key : str
+            The column used to identify the activities recorded in the log.
+        case_key : str
+            The column used to identify the cases recorded in the log.
+
+        Returns
+        -------
+        Tuple[Set[str], List[Tuple[str]]]
+            The activities of the log, and its variants as tuples of activities.
+        """
+        # missing activities are kept as an activity of their own, instead of being mapped to the last label
+        codes, labels = pd.factorize(log[activity_key], use_na_sentinel=False)
+        cases, _ = pd.factorize(log[case_key])
+        order = np.argsort(cases, kind='stable')
+        codes = codes[order].astype(np.int32)
+        cases = cases[order]
+        if len(codes) == 0:
+            return set(), []
+        starts = np.flatnonzero(np.r_[True, cases[1:] != cases[:-1]]) * codes.itemsize
+        ends = np.r_[starts[1:], len(codes) * codes.itemsize]
+        buffer = codes.tobytes()
+        variants = dict.fromkeys(buffer[start:end] for start, end in zip(starts.tolist(), ends.tolist()))
+        labels = np.asarray(labels, dtype=object)
+        variants = [tuple(labels[np.frombuffer(variant, dtype=np.int32)]) for variant in variants]
+        return set(labels), variants
+
+    def parseTraces(self, traces: List[List[str]]) -> int:
+        """
+        Parses a collection of traces at once, with the same result as parseTrace on each trace.
+        The activities are integer encoded and the relations are computed as activity x activity boolean matrices
+        from the first and last position of the activities in each trace:
+            - x is a predecessor of e if x occurs before the last e in some trace
+            - x is in precedenceFor(e) if x occurs before the first e in all the traces with e
+            - x is in responseTo(e) if x occurs after the last e in all the traces with e
+            - x is in chainPrecedenceFor(e) if x occurs immediately before every e
+            - e is at most once if it never occurs twice in a trace
+        The relations of the abstraction are then intersected (or joined, for predecessors) with the computed ones.
+
+        Parameters
+        ----------
+        traces : List[List[str]]
+            The traces to parse, with their events in the abstraction.
+
+        Returns
+        -------
+        int
+            Returns 0 on success, and any other value on failure.
+        """
+        traces = [trace for trace in traces if len(trace) > 0]
+        if not traces:
+            return 0
+        events = sorted(self.logAbstraction['events'])
+        index = {event: i for i, event in enumerate(events)}
+        k = len(events)
+        predecessor = np.zeros(k * k, dtype=bool)
+        precedence = np.zeros(k * k, dtype=np.int64)
+        response = np.zeros(k * k, dtype=np.int64)
+        traces_with = np.zeros(k, dtype=np.int64)
+        repeated = np.zeros(k, dtype=bool)
+        min_previous = np.full(k, k, dtype=np.int64)
+        max_previous = np.full(k, -1, dtype=np.int64)
+
+        # the traces are parsed in chunks, bounding the number of pairs of activities held in memory
+        chunk_start = 0
+        while chunk_start < len(traces):
+            chunk_end, chunk_pairs = chunk_start, 0
+            while chunk_end < len(traces) and (chunk_end == chunk_start or chunk_pairs < self.MAX_PAIRS_PER_CHUNK):
+                chunk_pairs += len(traces[chunk_end]) ** 2
+                chunk_end += 1
+            chunk = traces[chunk_start:chunk_end]
+            chunk_start = chunk_end
+
+            lengths = np.fromiter((len(trace) for trace in chunk), dtype=np.int64, count=len(chunk))
+            codes = np.fromiter((index[event] for trace in chunk for event in trace), dtype=np.int64,
+                                count=int(lengths.sum()))
+            trace_ids = np.repeat(np.arange(len(chunk)), lengths)
+            offsets = np.cumsum(lengths) - lengths
+            positions = np.arange(len(codes)) - np.repeat(offsets, lengths)
+
+            # chain precedence, from the event before each event (-1 at the start of the trace)
+            previous = np.r_[-1, codes[:-1]]
+            previous[positions == 0] = -1
+            np.minimum.at(min_previous, codes, previous)
+            np.maximum.at(max_previous, codes, previous)
+
+            # first and last position, and number of occurrences, of each activity in each trace
+            keys = trace_ids * k + codes
+            unique_keys, first_index, counts = np.unique(keys, return_index=True, return_counts=True)
+            last = np.zeros(len(unique_keys), dtype=np.int64)
+            np.maximum.at(last, np.searchsorted(unique_keys, keys), positions)
+            first = positions[first_index]
+            trace_of = unique_keys // k
+            activity = unique_keys % k
+            traces_with += np.bincount(activity, minlength=k)
+            repeated[activity[counts > 1]] = True
+
+            # pairs (x, e) of activities occurring in the same trace
+            block_starts = np.flatnonzero(np.r_[True, trace_of[1:] != trace_of[:-1]])
+            block_sizes = np.diff(np.r_[block_starts, len(trace_of)])
+            pair_counts = block_sizes ** 2
+            pair_offsets = np.cumsum(pair_counts) - pair_counts
+            local = np.arange(int(pair_counts.sum())) - np.repeat(pair_offsets, pair_counts)
+            sizes = np.repeat(block_sizes, pair_counts)
+            starts = np.repeat(block_starts, pair_counts)
+            x = starts + local // sizes
+            e = starts + local % sizes
+            pair_keys = activity[x] * k + activity[e]
+
+            predecessor[pair_keys[first[x] < last[e]]] = True
+            precedence += np.bincount(pair_keys[first[x] < first[e]], minlength=k * k)
+            response += np.bincount(pair_keys[last[x] > last[e]], minlength=k * k)
+
+        predecessor = predecessor.reshape(k, k)
+        precedence = precedence.reshape(k, k) == traces_with
+        response = response.reshape(k, k) == traces_with
+
+        for j in np.flatnonzero(traces_with).tolist():
+            event = events[j]
+            self.logAbstraction['predecessor'][event] = self.logAbstraction['predecessor'][event].union(
+                events[i] for i in np.flatnonzero(predecessor[:, j]).tolist())
+            self.logAbstraction['precedenceFor'][event] = self.logAbstraction['precedenceFor'][event].intersection(
+                events[i] for i in np.flatnonzero(precedence[:, j]).tolist())
+            self.logAbstraction['responseTo'][event] = self.logAbstraction['responseTo'][event].intersection(
+                events[i] for i in np.flatnonzero(response[:, j]).tolist())
+            chain = set()
+            if min_previous[j] == max_previous[j] and 0 <= min_previous[j] != j:
+                chain.add(events[min_previous[j]])
+            self.logAbstraction['chainPrecedenceFor'][event] = self.logAbstraction['chainPrecedenceFor'][
+                event].intersection(chain)
+        for j in np.flatnonzero(repeated).tolist():
+            self.logAbstraction['atMostOnce'].discard(events[j])
+        return 0
+
     def optimizeRelation(self, relation: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
         """
         Optimizes a given relation by removing redundant connections based on transitive closure.
@@ -254,13 +505,54 @@ class Discover:
         -------
         Dict[str, Set[str]]
             An optimized version of the input relations, with redundant connections removed.
+
+        Notes
+        -----
+        The relation is encoded as a bitmask of endpoints per starting point, the endpoints of A are then reduced
+        by the union of the current endpoints of each of its endpoints B, in the same order as on the sets.
         """
         # Sorted dict to avoid possibly non-deterministic behavior due to unordered nature of dict
         relation = dict(sorted(relation.items(), key=lambda conditions: len(conditions[1]),reverse=True))
+        events, masks = self.encodeRelation(relation)
+        masks = {event: masks[i] for i, event in enumerate(events) if event in relation}
         for eventA in relation:
-            for eventB in relation[eventA]:
-                relation[eventA] = relation[eventA].difference(relation[eventB])
-        return relation
+            redundant = 0
+            for b in iter_indices(masks[eventA]):
+                redundant |= masks.get(events[b], 0)
+            masks[eventA] &= ~redundant
+        return {eventA: {events[b] for b in iter_indices(masks[eventA])} for eventA in relation}
+
+    @staticmethod
+    def encodeRelation(relation: Dict[str, Set[str]], events: List[str] = None) -> Tuple[List[str], List[int]]:
+        """
+        Encodes a relation as bitmasks, the i-th mask holds the endpoints of the i-th event,
+        where event j is the bit 1 << j.
+
+        Parameters
+        ----------
+        relation : Dict[str, Set[str]]
+            A dictionary representing a relation, where keys are starting points and values are sets of endpoints.
+        events : List[str], optional
+            The events indexing the masks, by default the sorted starting points and endpoints of the relation.
+
+        Returns
+        -------
+        Tuple[List[str], List[int]]
+            The events, and the mask of each event.
+        """
+        if events is None:
+            events = set(relation)
+            for targets in relation.values():
+                events.update(targets)
+            events = sorted(events)
+        index = {event: i for i, event in enumerate(events)}
+        masks = [0] * len(events)
+        for event, targets in relation.items():
+            mask = 0
+            for target in targets:
+                mask |= 1 << index[target]
+            masks[index[event]] = mask
+        return events, masks
 
     def mineFromAbstraction(self, findAdditionalConditions: bool = True) -> int:
         """
@@ -350,22 +642,25 @@ class Discover:
             Every event, x, that occurs before some event, y, is a possible candidate for a condition x -->* y
             This is due to the fact, that in the traces where x does not occur before y, x might be excluded
             """
-            possibleConditions = deepcopy(self.logAbstraction['predecessor'])
+            # The sets of events are encoded as bitmasks over the events of the log abstraction
+            events = sorted(self.logAbstraction['events'])
+            index = {event: i for i, event in enumerate(events)}
+            allEvents = (1 << len(events)) - 1
+            _, possible = self.encodeRelation(self.logAbstraction['predecessor'], events)
+            _, excludes = self.encodeRelation(self.graph['excludesTo'], events)
+            _, includes = self.encodeRelation(self.graph['includesTo'], events)
             # Replay entire log, filtering out any invalid conditions
             for trace in self.logAbstraction['traces']:
-                localSeenBefore = set()
-                included = self.logAbstraction['events'].copy()
+                localSeenBefore = 0
+                included = allEvents
                 for event in trace:
-                    # Compute conditions that still allow event to be executed
-                    excluded = self.logAbstraction['events'].difference(included)
-                    validConditions = localSeenBefore.union(excluded)
-                    # Only keep valid conditions
-                    possibleConditions[event] = possibleConditions[event].intersection(validConditions)
-                    # Execute excludes starting from (event)
-                    included = included.difference(self.graph['excludesTo'][event])
-                    # Execute includes starting from (event)
-                    included = included.union(self.graph['includesTo'][event])
-                    localSeenBefore.add(event)
+                    i = index[event]
+                    # Only keep valid conditions, the events seen before (event) or excluded
+                    possible[i] &= localSeenBefore | (allEvents & ~included)
+                    # Execute excludes, then includes, starting from (event)
+                    included = (included & ~excludes[i]) | includes[i]
+                    localSeenBefore |= 1 << i
+            possibleConditions = {event: {events[j] for j in iter_indices(possible[i])} for i, event in enumerate(events)}
 
             # Now the only possible Condtitions that remain are valid for all traces
             # These are therefore added to the graph
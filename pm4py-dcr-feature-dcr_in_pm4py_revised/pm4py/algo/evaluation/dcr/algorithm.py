@@ -1,16 +1,29 @@
+import concurrent.futures
 import os
 import time
 import pandas as pd
 import pm4py
 
+from collections import Counter
+from functools import lru_cache
 from math import sqrt
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pm4py.algo.discovery.dcr_discover.algorithm import Variants
-from pm4py.util.benchmarking import *
-from pm4py.algo.evaluation.simplicity.variants import dcr_relations as dcr_simplicity
-from pm4py.algo.evaluation.confusion_matrix.algorithm import fitness
-from pm4py.objects.dcr import semantics as dcr_semantics
+from pm4py.algo.discovery.dcr_discover import algorithm as dcr_discover_alg
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import constants, xes_constants
+
+SUB_FOLDERS = ['Ground Truth Logs', 'Test Logs', 'Training Logs']
+RESULT_COLUMNS = ['PDC Year', 'Log name', 'Algorithm', 'TP', 'FP', 'TN', 'FN', 'F1-PDC', 'F1',
+                  'BAC', 'MCC', 'Training Fitness', '#Relations', '#Subprocesses', '#InSpActivities',
+                  '#Activities', 'Runtime', 'Replay Runtime']
+IS_POS_KEY = 'pdc:isPos'
+# number of parsed logs kept by each process, a training and a ground truth log per PDC log
+LOG_CACHE_SIZE = 8
 
 
 def pdcFscore(tp, fp, tn, fn):
@@ -54,160 +67,264 @@ def mcc(tp, fp, tn, fn):
         return 0
 
 
+@lru_cache(maxsize=LOG_CACHE_SIZE)
+def read_log(path: str) -> EventLog:
+    """
+    Parses an XES log once per process, the configurations scored on the same log reuse the parsed log
+    """
+    return pm4py.read_xes(path, return_legacy_log_object=True, show_progress_bar=False)
+
+
 def train_dcr_model(train, config):
-    dcr_model, _ = alg.apply(train, **config)
+    # the name of the configuration is only used in the results
+    config = {k: v for k, v in config.items() if k != 'alg_name'}
+    dcr_model, _ = dcr_discover_alg.apply(train, **config)
     return dcr_model
 
 
-def score_one_model(dcr_model, ground_truth_log):
-    gt = ground_truth_log
-    gt_cases = pm4py.convert_to_dataframe(gt).groupby('case:concept:name').first()['case:pdc:isPos']
-    # test_log = pm4py.convert_to_dataframe(test)
+def get_variants(log: Union[EventLog, pd.DataFrame], activity_key: str = xes_constants.DEFAULT_NAME_KEY,
+                 label_key: Optional[str] = None) -> Counter:
+    """
+    Counts the distinct variants of a log, with the label of their cases if a label key is given
+
+    Parameters
+    ----------
+    log
+        event log or dataframe
+    activity_key
+        the attribute used as activity
+    label_key
+        the case attribute holding the ground truth of the case, e.g. pdc:isPos (case:pdc:isPos in a dataframe)
+
+    Returns
+    -------
+    variants
+        counter of the (variant, label) pairs, the label is None if no label key is given
+    """
+    variants = Counter()
+    if isinstance(log, pd.DataFrame):
+        case_id_key = constants.CASE_CONCEPT_NAME
+        for case_id, activities in log.groupby(case_id_key, sort=False)[activity_key]:
+            label = None
+            if label_key is not None:
+                label = log.loc[activities.index[0], constants.CASE_ATTRIBUTE_PREFIX + label_key]
+            variants[(tuple(activities), label)] += 1
+    else:
+        for trace in log:
+            label = trace.attributes[label_key] if label_key is not None else None
+            variants[(tuple(event[activity_key] for event in trace), label)] += 1
+    return variants
+
+
+def replay_variant(compiled: CompiledDcrGraph, variant: Tuple[str, ...]) -> bool:
+    """
+    Replays a variant from the initial marking of the compiled graph, the reset between variants is the assignment
+    of the initial marking
+
+    Parameters
+    ----------
+    compiled
+        the compiled DCR graph
+    variant
+        the activities of the variant
+
+    Returns
+    -------
+    accepted
+        True if every event of the variant is enabled when executed and the final marking is accepting
+    """
+    marking = compiled.initial_marking
+    for activity in variant:
+        event = compiled.index_of_activity(activity)
+        if event is None or not CompiledSemantics.is_enabled(event, compiled, marking):
+            return False
+        marking = CompiledSemantics.execute(compiled, marking, event)
+    return CompiledSemantics.is_accepting(compiled, marking)
+
+
+def fitness(event_log, dcr_model: DcrGraph, cmd_print=False):
+    compiled = dcr_model.compile()
+    no_traces = 0
+    no_accepting = 0
+    for (variant, _), count in get_variants(event_log).items():
+        no_traces += count
+        if replay_variant(compiled, variant):
+            no_accepting += count
+        else:
+            print(f'[x] Failing trace: {list(variant)}') if cmd_print else None
+    return no_accepting, no_traces
+
+
+def score_one_model(dcr_model: DcrGraph, ground_truth_log, cmd_print=False):
+    """
+    Classifies the traces of the ground truth log, a trace is classified positive if the model accepts it.
+    Each distinct variant is replayed once on the compiled model.
+
+    Parameters
+    ----------
+    dcr_model
+        the DCR graph used as classifier
+    ground_truth_log
+        event log or dataframe, with the pdc:isPos attribute on the cases
+    cmd_print
+        print the confusion matrix
+
+    Returns
+    -------
+    tp, fp, tn, fn
+        the confusion matrix of the classification
+    """
+    compiled = dcr_model.compile()
     tp = 0
     fp = 0
     tn = 0
     fn = 0
-    for trace in gt:  # the trace is without subprocesses
-        gt_is_pos = gt_cases[trace.attributes['concept:name']]
-        dcr = deepcopy(dcr_model)
-        semantics = dcr_semantics.DcrSemantics(dcr, cmd_print=False)
-        can_execute = True
-        events_so_far = []
-        for event in trace:
-            # How to project an execution in a subprocess dcr from an event log without them
-            (executed, _) = semantics.execute(event['concept:name'])  # the graph is with subprocesses
-            events_so_far.append(event['concept:name'])
-            if executed is False:
-                # if gt_is_pos:
-                # print(f"[!] Failing at: {event['concept:name']}")
-                # print(f'[Events so far] {events_so_far}')
-                can_execute = False
-                break
-        accepting = semantics.is_accepting()
-        test_is_pos = False
-        if can_execute and accepting:
-            test_is_pos = True
+    accepted = {}
+    for (variant, gt_is_pos), count in get_variants(ground_truth_log, label_key=IS_POS_KEY).items():
+        test_is_pos = accepted.get(variant)
+        if test_is_pos is None:
+            test_is_pos = replay_variant(compiled, variant)
+            accepted[variant] = test_is_pos
         if test_is_pos:
             if gt_is_pos:
-                tp += 1
+                tp += count
             else:
-                fp += 1
+                fp += count
         else:
             if gt_is_pos:
-                fn += 1
+                fn += count
             else:
-                tn += 1
-    print(f'tp: {tp}| fp: {fp} | tn: {tn} | fn: {fn}')
+                tn += count
+    print(f'tp: {tp}| fp: {fp} | tn: {tn} | fn: {fn}') if cmd_print else None
     return tp, fp, tn, fn
 
 
-def compare_two_models(dcr_model_1, dcr_model_2, ground_truth_log):
-    gt = ground_truth_log
-    gt_df = pm4py.convert_to_dataframe(ground_truth_log)
-    for trace in gt:  # the trace is without subprocesses
-        dcr_1 = deepcopy(dcr_model_1)
-        dcr_2 = deepcopy(dcr_model_2)
-        semantics_1 = dcr_semantics.DcrSemantics(dcr_1, cmd_print=False)
-        semantics_2 = dcr_semantics.DcrSemantics(dcr_2, cmd_print=False)
-        events_so_far = []
-        no_of_events_until_fail = 0
-        dif_in_exec = 0
-        count = True
-        for event in trace:
-            # How to project an execution in a subprocess dcr from an event log without them
-            (executed_1, _) = semantics_1.execute(event['concept:name'])  # the graph is with subprocesses
-            (executed_2, _) = semantics_2.execute(event['concept:name'])
-            if count:
-                events_so_far.append(event['concept:name'])
-                no_of_events_until_fail += 1
-            if executed_1 != executed_2:  # execution is different
-                count = False
-                dif_in_exec += 1
-                if executed_1 is False:  # first model failed
-                    print(f'[x] model 1 failed on event: {event["concept:name"]}')
-                elif executed_1 is True:  # second model failed
-                    print(f'[x] model 2 failed on event: {event["concept:name"]}')
-            elif executed_1 is False:
-                pass
-        accepting_1 = semantics_1.is_accepting()
-        accepting_2 = semantics_2.is_accepting()
+def _first_difference(compiled: CompiledDcrGraph, other: CompiledDcrGraph, variant: Tuple[str, ...]):
+    # replays a variant on both models in lockstep, until one of them cannot execute an event
+    markings = [compiled.initial_marking, other.initial_marking]
+    executed = [True, True]
+    for no_events, activity in enumerate(variant):
+        for i, graph in enumerate((compiled, other)):
+            if executed[i]:
+                event = graph.index_of_activity(activity)
+                executed[i] = event is not None and CompiledSemantics.is_enabled(event, graph, markings[i])
+                if executed[i]:
+                    markings[i] = CompiledSemantics.execute(graph, markings[i], event)
+        if executed[0] != executed[1]:
+            return no_events, activity, executed, None
+    accepting = [executed[i] and CompiledSemantics.is_accepting(graph, markings[i])
+                 for i, graph in enumerate((compiled, other))]
+    return len(variant), None, executed, accepting
+
+
+def compare_two_models(dcr_model_1: DcrGraph, dcr_model_2: DcrGraph, ground_truth_log):
+    compiled_1 = dcr_model_1.compile()
+    compiled_2 = dcr_model_2.compile()
+    case_of_variant = {}
+    for trace in ground_truth_log:
+        case_of_variant.setdefault(tuple(event['concept:name'] for event in trace), trace.attributes['concept:name'])
+    for variant, cid in case_of_variant.items():
+        no_of_events_until_fail, activity, executed, accepting = _first_difference(compiled_1, compiled_2, variant)
         failed = False
-        if accepting_1 != accepting_2:  # acceptance state at the end is different
+        if activity is not None:
             failed = True
-            if accepting_1 is False:  # first model failed
+            if executed[0] is False:  # first model failed
+                print(f'[x] model 1 failed on event: {activity}')
+            else:  # second model failed
+                print(f'[x] model 2 failed on event: {activity}')
+            print(f'[x] Failed after {no_of_events_until_fail} event executions!')
+        elif accepting[0] != accepting[1]:  # acceptance state at the end is different
+            failed = True
+            if accepting[0] is False:  # first model failed
                 print(f'[x] Acceptance criteria not met on model 1')
-            elif accepting_1 is True:  # second model failed
+            else:  # second model failed
                 print(f'[x] Acceptance criteria not met on model 2')
             print(f'[x] Failed acceptance criteria!')
-        if dif_in_exec > 0:
-            failed = True
-            print(f'[x] Failed after {no_of_events_until_fail} event executions!')
         if failed:
-            cid = trace.attributes["concept:name"]
             print(f'[x] Failed on trace: {cid}')
-            print(events_so_far)
-            print(gt_df[gt_df['case:concept:name'] == cid]['concept:name'].tolist())
+            print(list(variant[:no_of_events_until_fail + 1]))
+            print(list(variant))
+
+
+def get_tasks(base_dir: str, folders: List[str], special_folders: List[str], configs: List[Dict[str, Any]]):
+    """
+    Lists the (log, configuration) combinations to score, with the paths of the ground truth and training logs.
+    The combinations of the same log are consecutive, such that a worker can reuse the parsed logs.
+    """
+    for i, config in enumerate(configs):
+        if 'alg_name' not in config:
+            config['alg_name'] = f'config {i}'
+    tasks = []
+    for folder in folders:
+        for log_name in sorted(os.listdir(os.path.join(base_dir, folder, SUB_FOLDERS[0]))):
+            gt_path = os.path.join(base_dir, folder, SUB_FOLDERS[0], log_name)
+            if folder in special_folders:
+                train_path = os.path.join(base_dir, folder, SUB_FOLDERS[2], f'{Path(log_name).stem}{0}.xes')
+            else:
+                train_path = os.path.join(base_dir, folder, SUB_FOLDERS[2], log_name)
+            for config in configs:
+                tasks.append((train_path, gt_path, config, folder, log_name))
+    return tasks
+
+
+def _score_task(task):
+    train_path, gt_path, config, folder, log_name = task
+    return score_based_on_config(read_log(train_path), read_log(gt_path), config, folder, log_name,
+                                 alg_name=config['alg_name'])
 
 
 def score_everything(
-        base_dir='/home/vco/Datasets',
+        base_dir,
         folders=None,
         special_folders=None,
-        configs=None):
+        configs=None,
+        output_path=None,
+        max_workers=1):
+    """
+    Scores discovery configurations on the PDC logs: for every log of the folders, a model is discovered from the
+    training log with every configuration, and classifies the traces of the ground truth log.
+
+    Parameters
+    ----------
+    base_dir
+        the directory of the PDC folders, each with a 'Ground Truth Logs' and a 'Training Logs' folder
+    folders
+        the PDC folders to score
+    special_folders
+        the folders in which the training log of log.xes is log0.xes
+    configs
+        the configurations of the discovery, keyword arguments of the discovery algorithm and an 'alg_name'
+    output_path
+        the CSV file the results are written to (default: None, the results are only returned)
+    max_workers
+        number of processes scoring the (log, configuration) combinations (default: 1, in the calling process)
+
+    Returns
+    -------
+    results
+        dataframe with a row per (log, configuration): the confusion matrix, the scores, the discovery and
+        classification runtimes and the size of the model
+    """
     if folders is None:
         folders = ['PDC19', 'PDC20', 'PDC21', 'PDC22']
     if special_folders is None:
         special_folders = ['PDC21', 'PDC22']
     if configs is None:
         configs = [{
-                'timed': False,
-                'pending': False,
-                'variant': Variants.DCR_BASIC,
                 'alg_name': 'DisCoveR'
-            },{
-                'inBetweenRels': True,
-                'timed': False,
-                'pending': False,
-                'variant': Variants.DCR_SUBPROCESS_ME,
-                'alg_name': 'DisCoveR_Tics'
-            },{
-                'inBetweenRels': False,
-                'timed': False,
-                'pending': False,
-                'variant': Variants.DCR_SUBPROCESS_ME,
-                'alg_name': 'DisCoveR_Tics_no_re'
+            }, {
+                'post_process': {'pending'},
+                'alg_name': 'DisCoveR_pending'
             }]
-    sub_folders = ['Ground Truth Logs', 'Test Logs', 'Training Logs']
-    # now just take all .xes files and make sure they match across folders
-    temp_results = []
-    for folder in folders:
-        print(f'[i] Started for {folder}')
-        for log_name in os.listdir(os.path.join(base_dir, folder, sub_folders[0])):
-            print(f'[i] Log {log_name}')
-            gt = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[0], log_name), return_legacy_log_object=True,
-                                show_progress_bar=False)
-            # test = pm4py.read_xes(os.path.join(base_dir,folder,sub_folders[1],log_name),return_legacy_log_object=True)
-
-            if folder in special_folders:
-                specific_log = f'{Path(log_name).stem}{0}.xes'
-                train = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[2], specific_log),
-                                       return_legacy_log_object=True, show_progress_bar=False)
-            else:
-                train = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[2], log_name),
-                                       return_legacy_log_object=True, show_progress_bar=False)
-            i = 0
-            for config in configs:
-                if 'alg_name' not in config:
-                    config['alg_name'] = f'config {i}'
-                    i += 1
-                temp_results.append(score_based_on_config(train,gt,config,folder,log_name,alg_name=config['alg_name']))
-                print(f'[i] Done for {folder}')
-    results = pd.DataFrame(
-        columns=['PDC Year', 'Log name', 'Algorithm', 'TP', 'FP', 'TN', 'FN', 'F1-PDC', 'F1',
-                 'BAC', 'Training Fitness', '#Relations', '#Subprocesses', '#InSpActivities',
-                 '#Activities', 'Runtime'],
-        data=temp_results)
-    results.to_csv(path_or_buf='/models_old/results.csv', index=False)
+    tasks = get_tasks(base_dir, folders, special_folders, configs)
+    if max_workers > 1 and len(tasks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            temp_results = list(executor.map(_score_task, tasks, chunksize=len(configs)))
+    else:
+        temp_results = [_score_task(task) for task in tasks]
+    results = pd.DataFrame(columns=RESULT_COLUMNS, data=temp_results)
+    if output_path is not None:
+        results.to_csv(path_or_buf=output_path, index=False)
     return results
 
 
@@ -216,15 +333,17 @@ def score_based_on_config(train,gt,config,folder,log_name,alg_name='DisCoveR'):
     dcr = train_dcr_model(train, config)
     elapsed = time.time() - start_time
 
-    sim = dcr_simplicity.get_simplicity(dcr)
+    start_time = time.time()
     fit = fitness(train, dcr)
     tp, fp, tn, fn = score_one_model(dcr, gt)
+    replay_elapsed = time.time() - start_time
     pdc_f_score = pdcFscore(tp, fp, tn, fn)
     f_score = fscore(tp, fp, tn, fn)
     b_acc = balancedAccuracy(tp, fp, tn, fn)
     m_c_c = mcc(tp, fp, tn, fn)
+    subprocesses = getattr(dcr, 'subprocesses', {})
     sp_events = 0
-    for k, v in dcr['subprocesses'].items():
+    for k, v in subprocesses.items():
         sp_events += len(v)
     return {
         'PDC Year': folder,
@@ -234,13 +353,14 @@ def score_based_on_config(train,gt,config,folder,log_name,alg_name='DisCoveR'):
         'F1-PDC': pdc_f_score,
         'F1': f_score,
         'BAC': b_acc,
-        # 'MCC': m_c_c,
+        'MCC': m_c_c,
         'Training Fitness': fit[0] / fit[1],  # fitness is on training
-        '#Relations': sim[0],
-        '#Subprocesses': len(dcr['subprocesses']),
+        '#Relations': dcr.get_constraints(),
+        '#Subprocesses': len(subprocesses),
         '#InSpActivities': sp_events,
-        '#Activities': len(dcr['events']),
-        'Runtime': elapsed
+        '#Activities': len(dcr.events),
+        'Runtime': elapsed,
+        'Replay Runtime': replay_elapsed
     }
     # train on the training logs
     # get the isPos for each trace in the Ground Truth log
@@ -249,136 +369,12 @@ def score_based_on_config(train,gt,config,folder,log_name,alg_name='DisCoveR'):
 
 
 def score_everything_old(
-        base_dir='/home/vco/Datasets',
+        base_dir,
         folders=None,
         special_folders=None,
-        configs=None):
-    if folders is None:
-        folders = ['PDC19', 'PDC20', 'PDC21', 'PDC22']
-    if special_folders is None:
-        special_folders = ['PDC21', 'PDC22']
-    sub_folders = ['Ground Truth Logs', 'Test Logs', 'Training Logs']
-    # now just take all .xes files and make sure they match across folders
-    temp_results = []
-    for folder in folders:
-        print(f'[i] Started for {folder}')
-        for log_name in os.listdir(os.path.join(base_dir, folder, sub_folders[0])):
-            print(f'[i] Log {log_name}')
-            gt = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[0], log_name), return_legacy_log_object=True,
-                                show_progress_bar=False)
-            # test = pm4py.read_xes(os.path.join(base_dir,folder,sub_folders[1],log_name),return_legacy_log_object=True)
-
-            if folder in special_folders:
-                specific_log = f'{Path(log_name).stem}{0}.xes'
-                train = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[2], specific_log),
-                                       return_legacy_log_object=True, show_progress_bar=False)
-            else:
-                train = pm4py.read_xes(os.path.join(base_dir, folder, sub_folders[2], log_name),
-                                       return_legacy_log_object=True, show_progress_bar=False)
-            # run the basic DisCoveR, Sp-DisCoveR and Sp-DisCoveR without in between relations
-            # run basic
-            config = {
-                'timed': False,
-                'pending': False,
-                'variant': Variants.DCR_BASIC
-            }
-            start_time = time.time()
-            dcr_basic = train_dcr_model(train, config)
-            elapsed = time.time() - start_time
-            sim = dcr_simplicity.get_simplicity(dcr_basic)
-            fit = fitness(train, dcr_basic)
-            tp, fp, tn, fn = score_one_model(dcr_basic, gt)
-            pdc_f_score = pdcFscore(tp, fp, tn, fn)
-            f_score = fscore(tp, fp, tn, fn)
-            b_acc = balancedAccuracy(tp, fp, tn, fn)
-            m_c_c = mcc(tp, fp, tn, fn)
-            temp_results.append({
-                'PDC Year': folder,
-                'Log name': log_name,
-                'Algorithm': 'DisCoveR',
-                'TP': tp, 'FP': fp, 'TN': tn, 'FN': fn,
-                'Fscore (PDC)': pdc_f_score,
-                'Fscore': f_score,
-                'balancedAccuracy': b_acc,
-                'mcc': m_c_c,
-                'Fitness': fit[0] / fit[1],  # fitness is on training
-                'Simplicity': sim[0],
-                'Subprocesses': 0,
-                'Events': len(dcr_basic['events']),
-                'Runtime': elapsed
-            })
-
-            # run subprocess standard
-            config = {
-                'inBetweenRels': True,
-                'timed': False,
-                'pending': True,
-                'variant': Variants.DCR_SUBPROCESS_ME,
-            }
-            start_time = time.time()
-            dcr_subprocess_standard = train_dcr_model(train, config)
-            elapsed = time.time() - start_time
-
-            sim = dcr_simplicity.get_simplicity(dcr_subprocess_standard)
-            fit = fitness(train, dcr_subprocess_standard)
-            tp, fp, tn, fn = score_one_model(dcr_subprocess_standard, gt)
-            pdc_f_score = pdcFscore(tp, fp, tn, fn)
-            f_score = fscore(tp, fp, tn, fn)
-            b_acc = balancedAccuracy(tp, fp, tn, fn)
-            m_c_c = mcc(tp, fp, tn, fn)
-            temp_results.append({
-                'PDC Year': folder,
-                'Log name': log_name,
-                'Algorithm': 'Sp-DisCoveR',
-                'TP': tp, 'FP': fp, 'TN': tn, 'FN': fn,
-                'Fscore (PDC)': pdc_f_score,
-                'Fscore': f_score,
-                'balancedAccuracy': b_acc,
-                'mcc': m_c_c,
-                'Fitness': fit[0] / fit[1],  # fitness is on training
-                'Simplicity': sim[0],
-                'Subprocesses': len(dcr_subprocess_standard['subprocesses']),
-                'Events': len(dcr_subprocess_standard['events']),
-                'Runtime': elapsed
-            })
-
-            # run subprocess no i2e e2i
-            config = {
-                'inBetweenRels': False,
-                'timed': False,
-                'pending': True,
-                'variant': Variants.DCR_SUBPROCESS_ME,
-            }
-            start_time = time.time()
-            dcr_subprocess_no_in_between = train_dcr_model(train, config)
-            elapsed = time.time() - start_time
-
-            sim = dcr_simplicity.get_simplicity(dcr_subprocess_no_in_between)
-            fit = fitness(train, dcr_subprocess_no_in_between)
-            tp, fp, tn, fn = score_one_model(dcr_subprocess_no_in_between, gt)
-            pdc_f_score = pdcFscore(tp, fp, tn, fn)
-            f_score = fscore(tp, fp, tn, fn)
-            b_acc = balancedAccuracy(tp, fp, tn, fn)
-            m_c_c = mcc(tp, fp, tn, fn)
-            temp_results.append({
-                'PDC Year': folder,
-                'Log name': log_name,
-                'Algorithm': 'Sp-DisCoveR_no_i2e_e2i',
-                'TP': tp, 'FP': fp, 'TN': tn, 'FN': fn,
-                'Fscore (PDC)': pdc_f_score,
-                'Fscore': f_score,
-                'balancedAccuracy': b_acc,
-                'mcc': m_c_c,
-                'Fitness': fit[0] / fit[1],  # fitness is on training
-                'Simplicity': sim[0],
-                'Subprocesses': len(dcr_subprocess_no_in_between['subprocesses']),
-                'Events': len(dcr_subprocess_no_in_between['events']),
-                'Runtime': elapsed
-            })
-        print(f'[i] Done for {folder}')
-    results = pd.DataFrame(
-        columns=['PDC Year', 'Log name', 'Algorithm', 'TP', 'FP', 'TN', 'FN', 'Fscore (PDC)', 'Fscore',
-                 'balancedAccuracy', 'mcc', 'Fitness', 'Simplicity', 'Subprocesses', 'Events', 'Runtime'],
-        data=temp_results)
-    results.to_csv(path_or_buf='/models_old/results.csv', index=False)
-    return results
\ No newline at end of file
+        output_path=None,
+        max_workers=1):
+    # run the basic DisCoveR and DisCoveR with pending mining
+    configs = [{'alg_name': 'DisCoveR'}, {'post_process': {'pending'}, 'alg_name': 'DisCoveR_pending'}]
+    return score_everything(base_dir, folders=folders, special_folders=special_folders, configs=configs,
+                            output_path=output_path, max_workers=max_workers)
@@ -14,7 +14,7 @@
     You should have received a copy of the GNU General Public License
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
-from pm4py.algo.simulation.playout.dcr.variants import classic
+from pm4py.algo.simulation.playout.dcr.variants import classic, fast, timed
 from pm4py.util import exec_utils
 from enum import Enum
 from pm4py.objects.dcr.obj import DcrGraph, Marking
@@ -24,10 +24,12 @@ from pm4py.objects.log.obj import EventLog
 
 class Variants(Enum):
     CLASSIC = classic
+    FAST = fast
+    TIMED = timed
 
 
 DEFAULT_VARIANT = Variants.CLASSIC
-VERSIONS = {Variants.CLASSIC}
+VERSIONS = {Variants.CLASSIC, Variants.FAST, Variants.TIMED}
 
 
 def apply(dcr: DcrGraph, parameters: Optional[Dict[Any, Any]] = None, variant=DEFAULT_VARIANT) -> EventLog:
@@ -42,6 +44,10 @@ def apply(dcr: DcrGraph, parameters: Optional[Dict[Any, Any]] = None, variant=DE
         Parameters of the algorithm
     variant
         Variant of the algorithm to use:
-            - Variants.BASIC_PLAYOUT: generates random traces from the model
+            - Variants.CLASSIC: generates random traces from the model
+            - Variants.FAST: generates random traces on the compiled graph, seeded and on multiple processes,
+              as event log, dataframe or streamed to a file
+            - Variants.TIMED: generates random traces as in Variants.FAST, with timestamps simulating the delays
+              and deadlines of timed DCR graphs
     """
     return exec_utils.get_variant(variant).apply(dcr, parameters=parameters)
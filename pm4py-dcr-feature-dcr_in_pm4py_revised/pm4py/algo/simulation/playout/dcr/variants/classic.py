@@ -26,7 +26,7 @@ from pm4py.objects.log.obj import EventLog
 from pm4py.objects.log.obj import Trace, Event
 from pm4py.util import exec_utils, constants, xes_constants
 
-from pm4py.objects.dcr.semantics import DCRSemantics
+from pm4py.objects.dcr.semantics import DcrSemantics as DCRSemantics
 
 
 class Parameters(Enum):
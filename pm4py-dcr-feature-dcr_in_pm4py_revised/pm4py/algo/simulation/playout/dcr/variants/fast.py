@@ -0,0 +1,352 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import concurrent.futures
+import csv
+import datetime
+import random
+import sys
+import time
+from array import array
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph, iter_indices
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.log.obj import Trace, Event
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    MAX_TRACE_LENGTH = "max_trace_length"
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    MAX_EXECUTION_TIME = "max_execution_time"
+    NO_TRACES = "noTraces"
+    INITIAL_CASE_ID = "initial_case_id"
+    INITIAL_TIMESTAMP = "initial_timestamp"
+    SEED = "seed"
+    MAX_WORKERS = "max_workers"
+    BATCH_SIZE = "batch_size"
+    RETURN_TYPE = "return_type"
+    OUTPUT_PATH = "output_path"
+    # only used by the timed playout
+    MEAN_WAITING_TIME = "mean_waiting_time"
+    MEAN_CASE_ARRIVAL_TIME = "mean_case_arrival_time"
+
+
+class ReturnTypes(Enum):
+    EVENT_LOG = "event_log"
+    DATAFRAME = "dataframe"
+
+
+MAX_CACHED_MARKINGS = 1 << 16
+
+_worker_play = None
+_worker_args = None
+
+
+def _init_worker(play: Callable, args: Tuple) -> None:
+    """
+    Initializer of the worker processes: receives the playout function and the arguments shared by the batches
+    (such as the compiled graph) once for all the batches of the worker.
+    """
+    global _worker_play, _worker_args
+    _worker_play = play
+    _worker_args = args
+
+
+def _play_batch(batch: Tuple) -> List:
+    """
+    Plays out a batch of traces in a worker process, with the function and arguments received by the initializer.
+    """
+    return _worker_play(*_worker_args, *batch)
+
+
+def play_batch(compiled: CompiledDcrGraph, seed: int, first_trace: int, no_traces: int, max_trace_length: int,
+               deadline: float) -> List[array]:
+    """
+    Plays out a batch of traces on the compiled graph, as in the classic playout: each trace is extended with a
+    random enabled event until it is accepting and at least as long as a random minimum length, it reaches the
+    maximum length, no event is enabled or the deadline is passed.
+    The random generator of each trace is seeded from the seed and the index of the trace, such that the traces
+    do not depend on the size of the batches nor on the number of processes.
+
+    Parameters
+    ----------------
+    compiled
+        Compiled DCR graph
+    seed
+        Seed of the playout
+    first_trace
+        Index of the first trace of the batch
+    no_traces
+        Number of traces in the batch
+    max_trace_length
+        Maximum trace length
+    deadline
+        Time (as of time.time()) after which the traces are not extended anymore
+
+    Returns
+    ----------------
+    traces
+        The traces, as arrays of event indices
+    """
+    initial_marking = compiled.initial_marking
+    # the enabled events of the markings met in the batch
+    enabled_of = {}
+    traces = []
+    for index in range(first_trace, first_trace + no_traces):
+        rng = random.Random(f"{seed}-{index}")
+        min_trace_length = rng.randrange(max_trace_length)
+        trace = array('l')
+        if time.time() <= deadline:
+            marking = initial_marking
+            while True:
+                if not (marking[1] & marking[2]) and len(trace) >= min_trace_length:
+                    break
+                if len(trace) >= max_trace_length:
+                    break
+                enabled = enabled_of.get(marking)
+                if enabled is None:
+                    if len(enabled_of) >= MAX_CACHED_MARKINGS:
+                        enabled_of.clear()
+                    enabled = tuple(iter_indices(CompiledSemantics.enabled(compiled, marking)))
+                    enabled_of[marking] = enabled
+                if not enabled:
+                    break
+                event = enabled[int(rng.random() * len(enabled))]
+                marking = CompiledSemantics.execute(compiled, marking, event)
+                trace.append(event)
+        traces.append(trace)
+    return traces
+
+
+def generate_batches(play: Callable, args: Tuple, batches: List[Tuple], max_workers: int):
+    """
+    Generates the batches of traces, in order, calling play(*args, *batch) for each batch, on a pool of processes
+    if more than one worker is requested. The playout function has to be defined at module level, such that it
+    can be sent to the workers.
+    """
+    if max_workers > 1 and len(batches) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                    initargs=(play, args)) as executor:
+            for traces in executor.map(_play_batch, batches):
+                yield traces
+    else:
+        for batch in batches:
+            yield play(*args, *batch)
+
+
+def with_sequential_times(traces_batches):
+    """
+    Assigns to the events of the traces their time, in seconds from the initial timestamp, as consecutive
+    seconds across the whole log
+    """
+    curr_timestamp = 0
+    for traces in traces_batches:
+        batch = []
+        for trace in traces:
+            batch.append((trace, np.arange(curr_timestamp, curr_timestamp + len(trace), dtype='d')))
+            curr_timestamp += len(trace)
+        yield batch
+
+
+def write_xes(path: str, traces_batches, labels: List[str], case_id_key: str, activity_key: str,
+              timestamp_key: str, initial_case_id: int, initial_timestamp: datetime.datetime) -> None:
+    """
+    Writes the traces, given with the times of their events in seconds from the initial timestamp, to a XES file,
+    one batch at a time
+    """
+    labels = [quoteattr(str(label)) for label in labels]
+    case_id = initial_case_id
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8" ?>\n<log xes.version="1849-2016" xes.features="nested-attributes" '
+                'openxes.version="1.0RC7">\n')
+        for traces in traces_batches:
+            chunk = []
+            for trace, times in traces:
+                chunk.append('\t<trace>\n\t\t<string key=%s value="%d" />\n' % (quoteattr(case_id_key), case_id))
+                for event, offset in zip(trace, times.tolist()):
+                    timestamp = (initial_timestamp + datetime.timedelta(seconds=offset)).isoformat()
+                    chunk.append('\t\t<event>\n\t\t\t<string key=%s value=%s />\n\t\t\t<date key=%s value="%s" />'
+                                 '\n\t\t</event>\n' % (quoteattr(activity_key), labels[event],
+                                                       quoteattr(timestamp_key), timestamp))
+                chunk.append('\t</trace>\n')
+                case_id += 1
+            f.write("".join(chunk))
+        f.write('</log>\n')
+
+
+def write_csv(path: str, traces_batches, labels: List[str], case_id_key: str, activity_key: str,
+              timestamp_key: str, initial_case_id: int, initial_timestamp: datetime.datetime) -> None:
+    """
+    Writes the traces, given with the times of their events in seconds from the initial timestamp, to a CSV file,
+    one batch at a time
+    """
+    case_id = initial_case_id
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([case_id_key, activity_key, timestamp_key])
+        for traces in traces_batches:
+            rows = []
+            for trace, times in traces:
+                for event, offset in zip(trace, times.tolist()):
+                    rows.append((case_id, labels[event],
+                                 (initial_timestamp + datetime.timedelta(seconds=offset)).isoformat()))
+                case_id += 1
+            writer.writerows(rows)
+
+
+def to_dataframe(traces_batches, labels: List[str], case_id_key: str, activity_key: str, timestamp_key: str,
+                 initial_case_id: int, initial_timestamp: datetime.datetime) -> pd.DataFrame:
+    """
+    Builds a dataframe from the traces, given with the times of their events in seconds from the initial
+    timestamp, with the activities as a categorical column, without creating an object per event
+    """
+    events = []
+    offsets = []
+    lengths = []
+    for traces in traces_batches:
+        for trace, times in traces:
+            events.append(np.frombuffer(trace, dtype='l'))
+            offsets.append(times)
+            lengths.append(len(trace))
+    events = np.concatenate(events) if events else np.zeros(0, dtype='l')
+    offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype='d')
+    # events sharing a label share a category
+    label_codes, categories = pd.factorize(pd.Index(labels))
+    cases = np.repeat(np.arange(initial_case_id, initial_case_id + len(lengths)), lengths)
+    timestamps = pd.Timestamp(initial_timestamp) + pd.to_timedelta(np.round(offsets * 1e6).astype(np.int64), unit="us")
+    return pd.DataFrame({case_id_key: cases.astype(str),
+                         activity_key: pd.Categorical.from_codes(label_codes[events], categories=categories),
+                         timestamp_key: timestamps})
+
+
+def to_event_log(traces_batches, labels: List[str], activity_key: str, timestamp_key: str, initial_case_id: int,
+                 initial_timestamp: datetime.datetime) -> EventLog:
+    """
+    Builds an event log from the traces, given with the times of their events in seconds from the initial timestamp
+    """
+    event_log = EventLog()
+    case_id = initial_case_id
+    for traces in traces_batches:
+        for trace, times in traces:
+            log_trace = Trace(attributes={xes_constants.DEFAULT_TRACEID_KEY: str(case_id)})
+            for event, offset in zip(trace, times.tolist()):
+                log_trace.append(
+                    Event({activity_key: labels[event],
+                           timestamp_key: initial_timestamp + datetime.timedelta(seconds=offset)})
+                )
+            event_log.append(log_trace)
+            case_id += 1
+    return event_log
+
+
+def export(traces_batches, labels: List[str], parameters: Dict[Union[str, Parameters], Any]) -> Union[EventLog, pd.DataFrame, str]:
+    """
+    Exports the traces, given with the times of their events in seconds from the initial timestamp, as requested
+    by the parameters: streamed to the output path, or returned as a dataframe or an event log.
+    """
+    initial_case_id = exec_utils.get_param_value(Parameters.INITIAL_CASE_ID, parameters, 1)
+    initial_timestamp = exec_utils.get_param_value(Parameters.INITIAL_TIMESTAMP, parameters, 10000000)
+    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
+                                               xes_constants.DEFAULT_TIMESTAMP_KEY)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    return_type = exec_utils.get_param_value(Parameters.RETURN_TYPE, parameters, ReturnTypes.EVENT_LOG)
+    output_path = exec_utils.get_param_value(Parameters.OUTPUT_PATH, parameters, None)
+    start = datetime.datetime.fromtimestamp(initial_timestamp)
+
+    if output_path is not None:
+        case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters,
+                                                 xes_constants.DEFAULT_TRACEID_KEY)
+        if str(output_path).lower().endswith(".csv"):
+            case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+            write_csv(output_path, traces_batches, labels, case_id_key, activity_key, timestamp_key,
+                      initial_case_id, start)
+        else:
+            write_xes(output_path, traces_batches, labels, case_id_key, activity_key, timestamp_key,
+                      initial_case_id, start)
+        return output_path
+
+    if return_type == ReturnTypes.DATAFRAME or return_type == ReturnTypes.DATAFRAME.value:
+        case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+        return to_dataframe(traces_batches, labels, case_id_key, activity_key, timestamp_key, initial_case_id, start)
+
+    return to_event_log(traces_batches, labels, activity_key, timestamp_key, initial_case_id, start)
+
+
+def apply(dcr: DcrGraph, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Union[EventLog, pd.DataFrame, str]:
+    """
+    Applies a fast playout on a DCR graph, on its compiled representation.
+
+    The traces are generated as in the classic playout, each with its own random generator seeded from the seed
+    and the index of the trace, such that the generated log is reproducible for a given seed regardless of the
+    number of processes and the size of the batches. The events are labelled with the activities of the graph.
+
+    Parameters
+    ---------------
+    dcr
+        DCR graph
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity key of the simulated log
+        - Parameters.TIMESTAMP_KEY => the timestamp key of the simulated log
+        - Parameters.CASE_ID_KEY => the case identifier key of the simulated log
+        - Parameters.NO_TRACES => number of traces to generate (default: 1000)
+        - Parameters.MAX_TRACE_LENGTH => maximum trace length (default: 1000)
+        - Parameters.MAX_EXECUTION_TIME => time in seconds after which the traces are left empty (default: no limit)
+        - Parameters.INITIAL_CASE_ID => Numeric case id for the first trace (default: 1)
+        - Parameters.INITIAL_TIMESTAMP => The first event is set with INITIAL_TIMESTAMP increased from 1970
+        - Parameters.SEED => seed of the playout (default: None, random)
+        - Parameters.MAX_WORKERS => number of processes generating the batches (default: 1, in the calling process)
+        - Parameters.BATCH_SIZE => number of traces per batch (default: 1000)
+        - Parameters.RETURN_TYPE => ReturnTypes.EVENT_LOG (default) or ReturnTypes.DATAFRAME
+        - Parameters.OUTPUT_PATH => if provided, the traces are streamed to this .xes or .csv file, and the path
+          is returned
+
+    Returns
+    ---------------
+    simulated_log
+        Simulated log, as event log or dataframe, or the path of the file it is written to
+    """
+    if parameters is None:
+        parameters = {}
+
+    max_trace_length = exec_utils.get_param_value(Parameters.MAX_TRACE_LENGTH, parameters, 1000)
+    max_execution_time = exec_utils.get_param_value(Parameters.MAX_EXECUTION_TIME, parameters, sys.maxsize)
+    no_traces = exec_utils.get_param_value(Parameters.NO_TRACES, parameters, 1000)
+    seed = exec_utils.get_param_value(Parameters.SEED, parameters, None)
+    max_workers = exec_utils.get_param_value(Parameters.MAX_WORKERS, parameters, 1)
+    batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, 1000)
+
+    if seed is None:
+        seed = random.randrange(sys.maxsize)
+    deadline = time.time() + min(max_execution_time, 10 ** 10)
+    compiled = dcr.compile()
+    labels = [dcr.label_map.get(event, event) for event in compiled.events]
+    batches = [(seed, start, min(batch_size, no_traces - start), max_trace_length, deadline)
+               for start in range(0, no_traces, batch_size)]
+    # assigns to each event an increased timestamp from 1970, by 1 second
+    traces_batches = with_sequential_times(generate_batches(play_batch, (compiled,), batches, max_workers))
+    return export(traces_batches, labels, parameters)
@@ -0,0 +1,276 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import heapq
+import random
+import sys
+import time
+from array import array
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.simulation.playout.dcr.variants.fast import Parameters, MAX_CACHED_MARKINGS, generate_batches, export
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph, iter_indices
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import exec_utils
+
+
+# (delays, deadlines, last executions, deadlines of the initial marking), see compile_timings
+Timings = Tuple[List[List[Tuple[int, float]]], List[List[Tuple[int, float]]], Dict[int, float], Dict[int, float]]
+
+
+def to_seconds(value: Any) -> float:
+    return pd.Timedelta(value).total_seconds()
+
+
+def compile_timings(graph: DcrGraph, compiled: CompiledDcrGraph) -> Timings:
+    """
+    Encodes the time constraints of a timed DCR graph on the indices of its compiled graph, in seconds.
+    Graphs without time constraints are accepted, their events are then only delayed by the waiting times.
+
+    Parameters
+    ----------------
+    graph
+        DCR graph, timed or not
+    compiled
+        The compiled graph
+
+    Returns
+    ----------------
+    timings
+        - for each event, the (condition, delay) pairs of its timed conditions
+        - for each event, the (response, deadline) pairs of its timed responses
+        - the time of the last execution of the events executed in the marking of the graph, relative to the start
+        - the deadlines of the pending events in the marking of the graph, relative to the start
+    """
+    index = compiled.index
+    delays = [[] for _ in range(len(compiled))]
+    deadlines = [[] for _ in range(len(compiled))]
+    for event, conditions in getattr(graph, 'timedconditions', {}).items():
+        for condition, delay in conditions.items():
+            delays[index[event]].append((index[condition], to_seconds(delay)))
+    for event, responses in getattr(graph, 'timedresponses', {}).items():
+        for response, deadline in responses.items():
+            deadlines[index[event]].append((index[response], to_seconds(deadline)))
+    last_executed = {index[event]: -to_seconds(elapsed)
+                     for event, elapsed in getattr(graph.marking, 'executed_time', {}).items() if event in index}
+    deadline_of = {index[event]: to_seconds(deadline)
+                   for event, deadline in getattr(graph.marking, 'pending_deadline', {}).items() if event in index}
+    return delays, deadlines, last_executed, deadline_of
+
+
+def play_batch(compiled: CompiledDcrGraph, timings: Timings, seed: int, first_trace: int, no_traces: int,
+               max_trace_length: int, mean_waiting_time: float, deadline: float) -> List[Tuple[array, array]]:
+    """
+    Plays out a batch of traces as a discrete-event simulation of the timed semantics.
+
+    At each step, the deadlines of the included pending events are kept in a priority queue, the earliest one
+    bounding how far the time can advance. An enabled event can be executed once the delays of its included and
+    executed timed conditions have elapsed, and only if that happens before the earliest deadline. One of these
+    events is chosen at random and executed after a waiting time drawn from an exponential distribution, the
+    time jumping directly to its execution; if the waiting time would pass the deadline, the execution time is
+    drawn uniformly up to the deadline instead.
+    A trace ends, as in the fast playout, when it is accepting and at least as long as a random minimum length,
+    when it reaches the maximum length, or when no event can be executed before the earliest deadline.
+
+    Parameters
+    ----------------
+    compiled
+        Compiled DCR graph
+    timings
+        Time constraints of the graph, see compile_timings
+    seed
+        Seed of the playout
+    first_trace
+        Index of the first trace of the batch
+    no_traces
+        Number of traces in the batch
+    max_trace_length
+        Maximum trace length
+    mean_waiting_time
+        Mean waiting time before the execution of an event, in seconds
+    deadline
+        Time (as of time.time()) after which the traces are not extended anymore
+
+    Returns
+    ----------------
+    traces
+        The traces, as pairs of arrays of event indices and of execution times in seconds from the start of the case
+    """
+    delays, deadlines, initial_last_executed, initial_deadline_of = timings
+    initial_marking = compiled.initial_marking
+    rate = 1.0 / mean_waiting_time if mean_waiting_time > 0 else None
+    # the enabled events of the markings met in the batch
+    enabled_of = {}
+    traces = []
+    for index in range(first_trace, first_trace + no_traces):
+        rng = random.Random(f"{seed}-{index}")
+        min_trace_length = rng.randrange(max_trace_length)
+        trace = array('l')
+        times = array('d')
+        if time.time() <= deadline:
+            marking = initial_marking
+            now = 0.0
+            last_executed = dict(initial_last_executed)
+            deadline_of = dict(initial_deadline_of)
+            queue = [(event_deadline, event) for event, event_deadline in deadline_of.items()]
+            heapq.heapify(queue)
+            while True:
+                executed, included, pending = marking
+                if not (included & pending) and len(trace) >= min_trace_length:
+                    break
+                if len(trace) >= max_trace_length:
+                    break
+                enabled = enabled_of.get(marking)
+                if enabled is None:
+                    if len(enabled_of) >= MAX_CACHED_MARKINGS:
+                        enabled_of.clear()
+                    enabled = tuple(iter_indices(CompiledSemantics.enabled(compiled, marking)))
+                    enabled_of[marking] = enabled
+                if not enabled:
+                    break
+
+                # earliest deadline of an included pending event: the entries of the events executed or given a
+                # new deadline since are dropped, those of the excluded events are kept for their re-inclusion
+                next_deadline = None
+                excluded_entries = []
+                while queue:
+                    event_deadline, event = queue[0]
+                    if deadline_of.get(event) != event_deadline or not (pending >> event) & 1:
+                        heapq.heappop(queue)
+                    elif not (included >> event) & 1:
+                        excluded_entries.append(heapq.heappop(queue))
+                    else:
+                        # a deadline passed while the event was excluded has to be met right away
+                        next_deadline = max(event_deadline, now)
+                        break
+                for entry in excluded_entries:
+                    heapq.heappush(queue, entry)
+
+                candidates = []
+                executed_included = executed & included
+                for event in enabled:
+                    ready = now
+                    for condition, delay in delays[event]:
+                        if (executed_included >> condition) & 1 and condition in last_executed:
+                            ready = max(ready, last_executed[condition] + delay)
+                    if next_deadline is None or ready <= next_deadline:
+                        candidates.append((event, ready))
+                if not candidates:
+                    # time-locked, no event can be executed before the deadline
+                    break
+
+                event, ready = candidates[int(rng.random() * len(candidates))]
+                now = ready + (rng.expovariate(rate) if rate is not None else 0.0)
+                if next_deadline is not None and now > next_deadline:
+                    now = rng.uniform(ready, next_deadline)
+                marking = CompiledSemantics.execute(compiled, marking, event)
+                last_executed[event] = now
+                deadline_of.pop(event, None)
+                for response, response_deadline in deadlines[event]:
+                    deadline_of[response] = now + response_deadline
+                    heapq.heappush(queue, (now + response_deadline, response))
+                trace.append(event)
+                times.append(now)
+        traces.append((trace, times))
+    return traces
+
+
+def with_case_starts(traces_batches, seed: int, mean_case_arrival_time: float):
+    """
+    Assigns to the events of the traces their time, in seconds from the initial timestamp, by shifting them by the
+    start of their case, the cases arriving with exponentially distributed inter-arrival times drawn from a
+    generator of their own.
+    """
+    rng = random.Random(f"{seed}-arrivals")
+    rate = 1.0 / mean_case_arrival_time if mean_case_arrival_time > 0 else None
+    case_start = 0.0
+    for traces in traces_batches:
+        batch = []
+        for trace, times in traces:
+            batch.append((trace, np.frombuffer(times, dtype='d') + case_start))
+            if rate is not None:
+                case_start += rng.expovariate(rate)
+        yield batch
+
+
+def apply(dcr: DcrGraph, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Union[EventLog, pd.DataFrame, str]:
+    """
+    Applies a timed playout on a DCR graph, simulating the delays of its timed conditions and the deadlines of
+    its timed responses.
+
+    The traces are generated on the compiled graph as a discrete-event simulation (see play_batch), the time
+    advancing by jumps from one execution to the next, never past the deadline of an included pending event.
+    The cases start with exponentially distributed inter-arrival times. As in the fast playout, each trace has
+    its own random generator seeded from the seed and the index of the trace, such that the generated log is
+    reproducible for a given seed regardless of the number of processes and the size of the batches.
+
+    Parameters
+    ---------------
+    dcr
+        DCR graph, the time constraints are taken into account for timed DCR graphs
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity key of the simulated log
+        - Parameters.TIMESTAMP_KEY => the timestamp key of the simulated log
+        - Parameters.CASE_ID_KEY => the case identifier key of the simulated log
+        - Parameters.NO_TRACES => number of traces to generate (default: 1000)
+        - Parameters.MAX_TRACE_LENGTH => maximum trace length (default: 1000)
+        - Parameters.MAX_EXECUTION_TIME => time in seconds after which the traces are left empty (default: no limit)
+        - Parameters.INITIAL_CASE_ID => Numeric case id for the first trace (default: 1)
+        - Parameters.INITIAL_TIMESTAMP => The first case starts INITIAL_TIMESTAMP seconds after 1970
+        - Parameters.MEAN_WAITING_TIME => mean waiting time before the execution of an event, in seconds
+          (default: 3600)
+        - Parameters.MEAN_CASE_ARRIVAL_TIME => mean time between the start of two cases, in seconds (default: 3600)
+        - Parameters.SEED => seed of the playout (default: None, random)
+        - Parameters.MAX_WORKERS => number of processes generating the batches (default: 1, in the calling process)
+        - Parameters.BATCH_SIZE => number of traces per batch (default: 1000)
+        - Parameters.RETURN_TYPE => ReturnTypes.EVENT_LOG (default) or ReturnTypes.DATAFRAME
+        - Parameters.OUTPUT_PATH => if provided, the traces are streamed to this .xes or .csv file, and the path
+          is returned
+
+    Returns
+    ---------------
+    simulated_log
+        Simulated log, as event log or dataframe, or the path of the file it is written to
+    """
+    if parameters is None:
+        parameters = {}
+
+    max_trace_length = exec_utils.get_param_value(Parameters.MAX_TRACE_LENGTH, parameters, 1000)
+    max_execution_time = exec_utils.get_param_value(Parameters.MAX_EXECUTION_TIME, parameters, sys.maxsize)
+    no_traces = exec_utils.get_param_value(Parameters.NO_TRACES, parameters, 1000)
+    mean_waiting_time = exec_utils.get_param_value(Parameters.MEAN_WAITING_TIME, parameters, 3600)
+    mean_case_arrival_time = exec_utils.get_param_value(Parameters.MEAN_CASE_ARRIVAL_TIME, parameters, 3600)
+    seed = exec_utils.get_param_value(Parameters.SEED, parameters, None)
+    max_workers = exec_utils.get_param_value(Parameters.MAX_WORKERS, parameters, 1)
+    batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, 1000)
+
+    if seed is None:
+        seed = random.randrange(sys.maxsize)
+    deadline = time.time() + min(max_execution_time, 10 ** 10)
+    compiled = dcr.compile()
+    timings = compile_timings(dcr, compiled)
+    labels = [dcr.label_map.get(event, event) for event in compiled.events]
+    batches = [(seed, start, min(batch_size, no_traces - start), max_trace_length, mean_waiting_time, deadline)
+               for start in range(0, no_traces, batch_size)]
+    traces_batches = with_case_starts(generate_batches(play_batch, (compiled, timings), batches, max_workers),
+                                      seed, mean_case_arrival_time)
+    return export(traces_batches, labels, parameters)
@@ -833,7 +833,8 @@ def conformance_log_skeleton(log: Union[EventLog, pd.DataFrame], log_skeleton: D
 def conformance_dcr(log: Union[EventLog, pd.DataFrame], dcr_graph: DcrGraph, activity_key: str = "concept:name",
                     timestamp_key: str = "time:timestamp", case_id_key: str = "case:concept:name",
                     group_key: str = "org:group", resource_key: str = "org:resource",
-                    return_diagnostics_dataframe: bool = constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME) -> pd.DataFrame | \
+                    return_diagnostics_dataframe: bool = constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME,
+                    variant_cache: Optional[Any] = None) -> pd.DataFrame | \
                                                                                                             List[Tuple[
                                                                                                                 str,
                                                                                                                 Dict[
@@ -851,6 +852,7 @@ def conformance_dcr(log: Union[EventLog, pd.DataFrame], dcr_graph: DcrGraph, act
     :param group_key: attribute to be used as role identifier
     :param resource_key: attribute to be used as resource identifier
     :param return_diagnostics_dataframe: if possible, returns a dataframe with the diagnostics (instead of the usual output)
+    :param variant_cache: optional :class:`pm4py.objects.dcr.utils.cache.VariantCache`, to reuse the results of the variants across calls on the same graph
     :rtype: `DataFrame | List[Tuple[str,Dict[str, Any]]]`
     .. code-block:: python3
         import pm4py
@@ -874,6 +876,8 @@ def conformance_dcr(log: Union[EventLog, pd.DataFrame], dcr_graph: DcrGraph, act
                                 group_key=group_key, resource_key=resource_key)
 
     from pm4py.algo.conformance.dcr import algorithm as dcr_conformance
+    from pm4py.algo.conformance.dcr.variants.classic import Parameters as DcrConformanceParameters
+    properties[DcrConformanceParameters.VARIANT_CACHE.value] = variant_cache
     result = dcr_conformance.apply(log, dcr_graph, parameters=properties)
 
     if return_diagnostics_dataframe:
@@ -888,7 +892,8 @@ def optimal_alignment_dcr(
         activity_key: str = "concept:name",
         timestamp_key: str = "time:timestamp",
         case_id_key: str = "case:concept:name",
-        return_diagnostics_dataframe: bool = constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME
+        return_diagnostics_dataframe: bool = constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME,
+        variant_cache: Optional[Any] = None
 ) -> pd.DataFrame | Any:
     """
     Applies optimal alignment against a DCR model.
@@ -908,6 +913,8 @@ def optimal_alignment_dcr(
         The key to identify case identifiers in the log.
     return_diagnostics_dataframe : bool, default False
         If True, returns a diagnostics dataframe instead of the usual list output.
+    variant_cache : VariantCache, optional
+        Cache of the alignments of the variants, to reuse them across calls on the same graph.
     Returns
     -------
     Union[pd.DataFrame, List[Tuple[str, Dict[str, Any]]]]
@@ -937,6 +944,8 @@ def optimal_alignment_dcr(
         case_id_key = None
 
     properties = get_properties(log, activity_key=activity_key, timestamp_key=timestamp_key, case_id_key=case_id_key)
+    from pm4py.algo.conformance.alignments.dcr.variants.optimal import Parameters as DcrAlignmentParameters
+    properties[DcrAlignmentParameters.VARIANT_CACHE.value] = variant_cache
 
     result = dcr_alignment.apply(log, dcr_graph, parameters=properties)
     if return_diagnostics_dataframe:
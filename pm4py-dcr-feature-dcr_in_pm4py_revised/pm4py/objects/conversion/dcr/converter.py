@@ -19,6 +19,10 @@ class Variants(Enum):
 
 DEFAULT_VARIANT = Variants.TO_INHIBITOR_NET
 
+CONVERSION_CACHE = "conversion_cache"
+# options of the conversion producing files or output, for which the conversion is always performed
+SIDE_EFFECT_OPTIONS = ("tapn_path", "pn_path", "debug")
+
 
 def apply(obj: Union[DcrGraph,ExtendedDcrGraph,HierarchicalDcrGraph,TimedDcrGraph],
           variant=DEFAULT_VARIANT, parameters=None) -> Tuple[PetriNet, Marking, Marking|None]:
@@ -40,6 +44,8 @@ def apply(obj: Union[DcrGraph,ExtendedDcrGraph,HierarchicalDcrGraph,TimedDcrGrap
             -map_unexecutable_events: True if events not executable in the DCR Graph should be mapped, else False
             -tapn_path: Path to export the net to. Can end in .pnml or .tapn for timed arc petri nets[1]
             -debug: True if debug information should be displayed and a Petri Net for each step in the conversion should be generated else False
+            -conversion_cache: a :class:`pm4py.objects.dcr.utils.cache.ConversionCache`, to reuse the conversions of graphs with the same content and options.
+             The cache is bypassed when the net is exported or debugged, as these are side effects of the conversion.
     Returns
     --------
     A Petri Net, an initial marking and None representing that there is no final marking
@@ -52,8 +58,21 @@ def apply(obj: Union[DcrGraph,ExtendedDcrGraph,HierarchicalDcrGraph,TimedDcrGrap
     """
     if parameters is None:
         parameters = {}
+    parameters = dict(parameters)
+    cache = parameters.pop(CONVERSION_CACHE, None)
+    if cache is not None and any(parameters.get(option) for option in SIDE_EFFECT_OPTIONS):
+        cache = None
+    key = None
+    if cache is not None:
+        key = cache.key(obj, exec_utils.get_variant(variant).__name__, parameters)
+        cached = cache.get(key)
+        if cached is not None:
+            net, im = cached
+            return net, im, None
     if isinstance(obj, HierarchicalDcrGraph):
         obj = nested_groups_and_sps_to_flat_dcr(obj)
     obj = deepcopy(obj).obj_to_template()
     net, im = exec_utils.get_variant(variant).apply(obj, parameters=parameters)
+    if cache is not None:
+        cache.put(key, (net, im))
     return net, im, None
@@ -0,0 +1,203 @@
+"""
+This module defines a compiled, integer-encoded representation of Dynamic Condition
+Response (DCR) Graphs, intended for replay-heavy algorithms such as conformance
+checking, alignments and simulation.
+
+Events are interned to integer indices and every relation is precomputed as a per-event
+bitmask, so that a marking can be represented as three integers
+(executed, included, pending). Markings in this representation are plain tuples, hence
+immutable and hashable, and can be used directly as keys in visited/closed sets.
+
+Classes:
+    CompiledDcrGraph: Interns the events of a DCR Graph and stores its relations as bitmasks.
+
+The compiled graph is a snapshot of the structure of the graph at compilation time;
+changes to the relations of the original graph afterwards are not reflected.
+"""
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+from pm4py.objects.dcr.obj import DcrGraph, Marking
+
+BitsetMarking = Tuple[int, int, int]
+
+
+class CompiledDcrGraph(object):
+    """
+    Integer-encoded snapshot of a DCR Graph.
+
+    The events of the graph are sorted and interned, such that event ``self.events[i]``
+    corresponds to bit ``1 << i``. For each relation a list of masks is kept, indexed by
+    the event index, containing the targets of the relation for that event.
+    Milestones and no-responses are compiled when present, such that the semantics of
+    :class:`pm4py.objects.dcr.extended.semantics.ExtendedSemantics` is covered as well.
+
+    Attributes
+    ----------
+    self.events: Tuple[str]
+        The interned events, ordered by their index
+    self.index: Dict[str, int]
+        Mapping from event to its index
+    self.activity_index: Dict[str, int]
+        Mapping from activity (label) to the index of its event
+    self.conditions: List[int]
+        For each event, the mask of events that are conditions for it
+    self.milestones: List[int]
+        For each event, the mask of events that are milestones for it
+    self.includes: List[int]
+        For each event, the mask of events it includes
+    self.excludes: List[int]
+        For each event, the mask of events it excludes
+    self.responses: List[int]
+        For each event, the mask of events it makes pending
+    self.noresponses: List[int]
+        For each event, the mask of events it makes not pending
+    self.initial_marking: Tuple[int, int, int]
+        The marking of the graph at compilation time, as (executed, included, pending)
+
+    Methods
+    -------
+    encode(events) -> int:
+        returns the mask of a collection of events
+    decode(mask) -> Set[str]:
+        returns the set of events of a mask
+    encode_marking(marking) -> Tuple[int, int, int]:
+        returns the bitset marking of a :class:`Marking`
+    decode_marking(marking) -> Marking:
+        returns a :class:`Marking` of sets from a bitset marking
+
+    Parameters
+    ----------
+    graph: DcrGraph
+        the DCR Graph (or any of its subclasses) to compile
+
+    Examples
+    --------
+    compiled = graph.compile()\n
+    marking = compiled.initial_marking\n
+    enabled = CompiledSemantics.enabled(compiled, marking)\n
+    """
+
+    def __init__(self, graph: DcrGraph):
+        relations = {
+            'conditions': graph.conditions,
+            'milestones': getattr(graph, 'milestones', {}),
+            'includes': graph.includes,
+            'excludes': graph.excludes,
+            'responses': graph.responses,
+            'noresponses': getattr(graph, 'noresponses', {}),
+        }
+        universe = set(graph.events)
+        for rel in relations.values():
+            for e, targets in rel.items():
+                universe.add(e)
+                universe.update(targets)
+        universe.update(graph.marking.executed, graph.marking.included, graph.marking.pending)
+
+        self.events = tuple(sorted(universe))
+        self.index = {e: i for i, e in enumerate(self.events)}
+        self.activity_index = {}
+        for event, activity in graph.label_map.items():
+            if event in self.index:
+                self.activity_index.setdefault(activity, self.index[event])
+
+        for name, rel in relations.items():
+            masks = [0] * len(self.events)
+            for e, targets in rel.items():
+                masks[self.index[e]] = self.encode(targets)
+            setattr(self, name, masks)
+
+        self.initial_marking = self.encode_marking(graph.marking)
+
+    @property
+    def all_events(self) -> int:
+        return (1 << len(self.events)) - 1
+
+    def __len__(self):
+        return len(self.events)
+
+    def encode(self, events: Iterable[str]) -> int:
+        """
+        Encodes a collection of events as a mask, unknown events are ignored
+
+        Parameters
+        ----------
+        events
+            the events to encode
+
+        Returns
+        -------
+        mask
+            the mask with a bit set for each event
+        """
+        mask = 0
+        index = self.index
+        for e in events:
+            i = index.get(e)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def decode(self, mask: int) -> Set[str]:
+        """
+        Decodes a mask to the set of events it contains
+
+        Parameters
+        ----------
+        mask
+            the mask to decode
+
+        Returns
+        -------
+        events
+            the set of events with a bit set in the mask
+        """
+        return {self.events[i] for i in iter_indices(mask)}
+
+    def encode_marking(self, marking: Marking) -> BitsetMarking:
+        return self.encode(marking.executed), self.encode(marking.included), self.encode(marking.pending)
+
+    def decode_marking(self, marking: BitsetMarking) -> Marking:
+        return Marking(self.decode(marking[0]), self.decode(marking[1]), self.decode(marking[2]))
+
+    def index_of(self, event: str) -> Optional[int]:
+        return self.index.get(event)
+
+    def index_of_activity(self, activity: str) -> Optional[int]:
+        """
+        Get the index of the event of an activity, following :meth:`DcrGraph.get_event`:
+        if no event is labelled with the activity, the activity is taken as an event ID.
+
+        Parameters
+        ----------
+        activity
+            the activity of an event
+
+        Returns
+        -------
+        index
+            the index of the event, or None if the activity is not in the graph
+        """
+        i = self.activity_index.get(activity)
+        if i is None:
+            i = self.index.get(activity)
+        return i
+
+
+def iter_indices(mask: int) -> Iterator[int]:
+    """
+    Iterates over the indices of the bits set in a mask, from the lowest bit
+
+    Parameters
+    ----------
+    mask
+        the mask to iterate
+
+    Returns
+    -------
+    indices
+        iterator of the indices of the set bits
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,101 @@
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph, BitsetMarking, iter_indices
+
+"""
+Semantics of DCR Graphs on the compiled representation, where a marking is a tuple of
+three masks (executed, included, pending) and events are referred to by their index.
+Execution never modifies a marking in place, it returns the successor marking.
+
+The rules are the same as in DcrSemantics and ExtendedSemantics:
+    - an event is enabled if it is included, all its included conditions are executed and
+      none of its included milestones is pending
+    - executing an event marks it executed and not pending, then applies excludes,
+      includes, no-responses and responses, in this order
+    - a marking is accepting if no included event is pending
+"""
+
+
+class CompiledSemantics(object):
+
+    @classmethod
+    def enabled(cls, graph: CompiledDcrGraph, marking: BitsetMarking) -> int:
+        """
+        Computes the mask of enabled events
+
+        Parameters
+        ----------
+        :param graph: compiled DCR graph
+        :param marking: the current marking
+
+        Returns
+        -------
+        :return: mask of the enabled events
+        """
+        executed, included, pending = marking
+        blocking_conditions = included & ~executed
+        blocking_milestones = included & pending
+        res = included
+        conditions = graph.conditions
+        milestones = graph.milestones
+        for i in iter_indices(included):
+            if conditions[i] & blocking_conditions or milestones[i] & blocking_milestones:
+                res &= ~(1 << i)
+        return res
+
+    @classmethod
+    def is_enabled(cls, event: int, graph: CompiledDcrGraph, marking: BitsetMarking) -> bool:
+        """
+        Verify that the event with the given index is enabled, without computing the whole enabled set
+
+        Parameters
+        ----------
+        :param event: index of the event
+        :param graph: compiled DCR graph
+        :param marking: the current marking
+
+        Returns
+        -------
+        :return: true if enabled, false otherwise
+        """
+        executed, included, pending = marking
+        if not (included >> event) & 1:
+            return False
+        return not (graph.conditions[event] & included & ~executed or graph.milestones[event] & included & pending)
+
+    @classmethod
+    def execute(cls, graph: CompiledDcrGraph, marking: BitsetMarking, event: int) -> BitsetMarking:
+        """
+        Executes the event with the given index and returns the new marking
+
+        Parameters
+        ----------
+        :param graph: compiled DCR graph
+        :param marking: the current marking
+        :param event: index of the event being executed
+
+        Returns
+        ---------
+        :return: the marking after execution
+        """
+        executed, included, pending = marking
+        bit = 1 << event
+        executed |= bit
+        pending &= ~bit
+        included = (included & ~graph.excludes[event]) | graph.includes[event]
+        pending = (pending & ~graph.noresponses[event]) | graph.responses[event]
+        return executed, included, pending
+
+    @classmethod
+    def is_accepting(cls, graph: CompiledDcrGraph, marking: BitsetMarking) -> bool:
+        """
+        Checks if the marking is accepting, no included events are pending
+
+        Parameters
+        ----------
+        :param graph: compiled DCR graph
+        :param marking: the current marking
+
+        Returns
+        ---------
+        :return: True if the marking is accepting, false otherwise
+        """
+        return not (marking[1] & marking[2])
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Set, Dict
 from pm4py.objects.dcr.obj import DcrGraph
 
 
@@ -36,11 +36,17 @@ class DistributedDcrGraph(DcrGraph):
         A dictionary where keys are activity identifiers and values are sets of distributed assigned to those activities.
     self.__principalsAssignment : Dict[str, Set[str]]
         A dictionary where keys are activity identifiers and values are sets of principals assigned to those activities.
+    self.__eventRoles : Dict[str, Set[str]]
+        Index from each event to the roles allowed to execute it, derived from the role assignments.
+    self.__eventPrincipals : Dict[str, Set[str]]
+        Index from each event to the principals holding one of its roles.
 
     Methods
     -------
     getConstraints() -> int:
         Computes the total number of constraints in the DCR graph, including those derived from role assignments.
+    index_roles() -> None:
+        Rebuilds the event to roles and event to principals indexes from the assignments.
 
     Examples
     --------
@@ -68,6 +74,8 @@ class DistributedDcrGraph(DcrGraph):
         self.__roles = set() if template is None else template.pop("roles", set())
         self.__roleAssignments = {} if template is None else template.pop("roleAssignments", set())
         self.__principalsAssignments = {} if template is None else template.pop("principalsAssignments", set())
+        self.__eventRoles = None
+        self.__eventPrincipals = None
 
     def obj_to_template(self):
         res = super().obj_to_template()
@@ -93,6 +101,37 @@ class DistributedDcrGraph(DcrGraph):
     def principals_assignments(self):
         return self.__principalsAssignments
 
+    @property
+    def event_roles(self) -> Dict[str, Set[str]]:
+        if self.__eventRoles is None:
+            self.index_roles()
+        return self.__eventRoles
+
+    @property
+    def event_principals(self) -> Dict[str, Set[str]]:
+        if self.__eventPrincipals is None:
+            self.index_roles()
+        return self.__eventPrincipals
+
+    def index_roles(self) -> None:
+        """
+        Builds the index from each event to the roles allowed to execute it, and from each event to the principals
+        of these roles, such that the roles of an event are found without scanning all the role assignments.
+        The index is built on first access, it has to be rebuilt when the assignments are modified in place.
+        """
+        event_roles = {}
+        for role, events in self.__roleAssignments.items():
+            for event in events:
+                event_roles.setdefault(event, set()).add(role)
+        event_principals = {}
+        for event, roles in event_roles.items():
+            principals = set()
+            for role in roles:
+                principals.update(self.__principalsAssignments.get(role, set()))
+            event_principals[event] = principals
+        self.__eventRoles = event_roles
+        self.__eventPrincipals = event_principals
+
     def get_constraints(self):
         """
         compute role assignments as constraints in DCR Graph
@@ -111,7 +150,7 @@ class DistributedDcrGraph(DcrGraph):
     def __repr__(self):
         string = str(super())
         for key, value in vars(self).items():
-            if value is super():
+            if value is super() or key.split("_")[-1] in ("eventRoles", "eventPrincipals"):
                 continue
             string += str(key.split("_")[-1])+": "+str(value)+"\n"
         return string
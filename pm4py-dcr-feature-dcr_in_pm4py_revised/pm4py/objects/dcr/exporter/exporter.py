@@ -1,18 +1,20 @@
 from enum import Enum
-from pm4py.objects.dcr.exporter.variants import xml_dcr_portal, dcr_js_portal, xml_simple
+from pm4py.objects.dcr.exporter.variants import xml_dcr_portal, dcr_js_portal, xml_simple, json_lines
 
 
 class Variants(Enum):
     XML_SIMPLE = xml_simple
     XML_DCR_PORTAL = xml_dcr_portal
     DCR_JS_PORTAL = dcr_js_portal
+    JSON_LINES = json_lines
 
 
 XML_SIMPLE = Variants.XML_SIMPLE
 XML_DCR_PORTAL = Variants.XML_DCR_PORTAL
 DCR_JS_PORTAL = Variants.DCR_JS_PORTAL
+JSON_LINES = Variants.JSON_LINES
 
-VERSIONS = {XML_SIMPLE, XML_DCR_PORTAL, DCR_JS_PORTAL}
+VERSIONS = {XML_SIMPLE, XML_DCR_PORTAL, DCR_JS_PORTAL, JSON_LINES}
 
 
 def apply(dcr_graph, path, variant=XML_SIMPLE, **parameters):
@@ -30,9 +32,12 @@ def apply(dcr_graph, path, variant=XML_SIMPLE, **parameters):
             - XML_SIMPLE
             - XML_DCR_PORTAL
             - DCR_JS_PORTAL
+            - JSON_LINES
     parameters
         Algorithm related params
         white_space_replacement: a character
+        markings: for JSON_LINES, a dictionary from case identifiers to markings written with the graph
+        compress: for JSON_LINES, whether to compress the file with gzip
     """
     if variant is Variants.XML_DCR_PORTAL:
         xml_dcr_portal.export_dcr_xml(dcr_graph, output_file_name=path, **parameters)
@@ -40,3 +45,5 @@ def apply(dcr_graph, path, variant=XML_SIMPLE, **parameters):
         xml_simple.export_dcr_xml(dcr_graph, output_file_name=path, **parameters)
     elif variant is Variants.DCR_JS_PORTAL:
         dcr_js_portal.export_dcr_xml(dcr_graph, output_file_name=path, **parameters)
+    elif variant is Variants.JSON_LINES:
+        json_lines.export_dcr_jsonl(dcr_graph, output_file_name=path, **parameters)
@@ -1 +1 @@
-from pm4py.objects.dcr.exporter.variants import xml_simple, xml_dcr_portal, dcr_js_portal
\ No newline at end of file
+from pm4py.objects.dcr.exporter.variants import xml_simple, xml_dcr_portal, dcr_js_portal, json_lines
\ No newline at end of file
@@ -0,0 +1,63 @@
+import gzip
+from typing import Any, Dict, Optional
+
+from pm4py.objects.dcr.obj import DcrGraph, Marking
+from pm4py.objects.dcr.utils.serialization import FORMAT, VERSION, graph_to_dict, marking_to_dict, dumps_canonical, \
+    content_hash
+
+
+def export_to_string(graph: DcrGraph, markings: Optional[Dict[Any, Marking]] = None) -> str:
+    '''
+    Serializes a DCR graph, and optionally the markings of some cases, in the JSON lines format:
+        - a header line, with the format, its version, the type of the graph, its content hash and the number of markings
+        - a line with the canonical encoding of the graph
+        - a line for each marking, with the case it belongs to
+
+    Parameters
+    -----------
+    graph
+        the DCR graph (or any of its subclasses)
+    markings
+        optional dictionary from case identifiers to their markings, the markings of the compiled graph can be
+        decoded with decode_marking() of the compiled graph
+
+    Returns
+    -----------
+    string
+        the JSON lines
+    '''
+    body = graph_to_dict(graph)
+    header = {"format": FORMAT, "version": VERSION, "type": body["type"], "hash": content_hash(body),
+              "markings": 0 if markings is None else len(markings)}
+    lines = [dumps_canonical(header), dumps_canonical(body)]
+    if markings is not None:
+        for case, marking in markings.items():
+            lines.append(dumps_canonical({"case": case, "marking": marking_to_dict(marking)}))
+    return "\n".join(lines) + "\n"
+
+
+def export_dcr_jsonl(graph: DcrGraph, output_file_name, markings: Optional[Dict[Any, Marking]] = None,
+                     compress: Optional[bool] = None, **parameters):
+    '''
+    Writes a DCR graph object, and optionally the markings of some cases, to disk in the JSON lines format.
+    The file is compressed with gzip when compress is True, or when it is not given and the file name ends with .gz
+
+    Parameters
+    -----------
+    graph
+        the DCR graph
+    output_file_name
+        file name
+    markings
+        optional dictionary from case identifiers to their markings
+    compress
+        whether to compress the file with gzip
+    '''
+    data = export_to_string(graph, markings=markings).encode("utf-8")
+    if compress is None:
+        compress = str(output_file_name).endswith(".gz")
+    if compress:
+        # fixed modification time, such that the same graph always gives the same bytes
+        data = gzip.compress(data, mtime=0)
+    with open(output_file_name, "wb") as f:
+        f.write(data)
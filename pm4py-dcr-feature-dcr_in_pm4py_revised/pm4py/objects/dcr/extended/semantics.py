@@ -6,8 +6,11 @@ from pm4py.objects.dcr.semantics import DcrSemantics
 class ExtendedSemantics(DcrSemantics):
 
     @classmethod
-    def enabled(cls, graph) -> Set[str]:
-        res = super().enabled(graph)
+    def enabled(cls, graph, compiled=None) -> Set[str]:
+        res = super().enabled(graph, compiled=compiled)
+        if compiled is not None:
+            # the compiled semantics already checks the milestones
+            return res
         for e in set(graph.milestones.keys()).intersection(res):
             if len(graph.milestones[e].intersection(
                     graph.marking.included.intersection(graph.marking.pending))) > 0:
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pm4py.objects.dcr.importer.variants import xml_dcr_portal, xml_simple
+from pm4py.objects.dcr.importer.variants import xml_dcr_portal, xml_simple, json_lines
 from pm4py.util import exec_utils
 
 
@@ -8,11 +8,13 @@ class Variants(Enum):
     XML_DCR_PORTAL = xml_dcr_portal
     XML_SIMPLE = xml_simple
     DCR_JS_PORTAL = xml_dcr_portal
+    JSON_LINES = json_lines
 
 
 XML_SIMPLE = Variants.XML_SIMPLE
 XML_DCR_PORTAL = Variants.XML_DCR_PORTAL
 DCR_JS_PORTAL = Variants.DCR_JS_PORTAL
+JSON_LINES = Variants.JSON_LINES
 
 
 def apply(path, variant=XML_DCR_PORTAL, parameters=None):
@@ -27,6 +29,7 @@ def apply(path, variant=XML_DCR_PORTAL, parameters=None):
         Variants of the importer to use:
             - Variants.XML_DCR_PORTAL
             - Variants.XML_SIMPLE
+            - Variants.JSON_LINES
     parameters
         Parameters of the importer
     '''
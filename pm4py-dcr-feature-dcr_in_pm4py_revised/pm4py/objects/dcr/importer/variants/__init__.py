@@ -1 +1 @@
-from pm4py.objects.dcr.importer.variants import xml_dcr_portal, xml_simple
+from pm4py.objects.dcr.importer.variants import xml_dcr_portal, xml_simple, json_lines
\ No newline at end of file
@@ -0,0 +1,111 @@
+import gzip
+import json
+from enum import Enum
+from typing import Any, Dict, Tuple, Union
+
+from pm4py.objects.dcr.obj import DcrGraph, Marking
+from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+from pm4py.objects.dcr.utils.serialization import FORMAT, VERSION, dict_to_graph, dict_to_marking, content_hash
+from pm4py.util import exec_utils, constants
+
+
+class Parameters(Enum):
+    VERIFY_HASH = "verify_hash"
+
+
+def apply(path, parameters=None) -> DcrGraph:
+    '''
+    Reads a DCR Graph from a file in the JSON lines format, compressed with gzip or not
+
+    Parameters
+    ----------
+    path
+        Path to the file
+    parameters
+        Parameters of the importer:
+            - Parameters.VERIFY_HASH => checks that the content of the graph matches the hash of the header
+              (default True)
+
+    Returns
+    ----------
+    graph
+        the DCR Graph, as an instance of the class it was written from
+    '''
+    return import_with_markings(path, parameters=parameters)[0]
+
+
+def import_with_markings(path, parameters=None) -> Tuple[DcrGraph, Dict[Any, Marking]]:
+    '''
+    Reads a DCR Graph and the markings written with it from a file in the JSON lines format
+
+    Parameters
+    ----------
+    path
+        Path to the file
+    parameters
+        Parameters of the importer, see apply()
+
+    Returns
+    ----------
+    graph
+        the DCR Graph
+    markings
+        dictionary from case identifiers to their markings
+    '''
+    with open(path, "rb") as f:
+        data = f.read()
+    return import_from_string_with_markings(data, parameters=parameters)
+
+
+def import_from_string(dcr_string: Union[str, bytes], parameters=None) -> DcrGraph:
+    return import_from_string_with_markings(dcr_string, parameters=parameters)[0]
+
+
+def import_from_string_with_markings(dcr_string: Union[str, bytes], parameters=None) \
+        -> Tuple[DcrGraph, Dict[Any, Marking]]:
+    '''
+    Reads a DCR Graph and the markings written with it from JSON lines, compressed with gzip or not
+
+    Parameters
+    ----------
+    dcr_string
+        the JSON lines, as string or bytes
+    parameters
+        Parameters of the importer, see apply()
+
+    Returns
+    ----------
+    graph
+        the DCR Graph
+    markings
+        dictionary from case identifiers to their markings
+    '''
+    if parameters is None:
+        parameters = {}
+    verify_hash = exec_utils.get_param_value(Parameters.VERIFY_HASH, parameters, True)
+
+    if type(dcr_string) is bytes:
+        if dcr_string[:2] == b"\x1f\x8b":
+            dcr_string = gzip.decompress(dcr_string)
+        dcr_string = dcr_string.decode(constants.DEFAULT_ENCODING)
+
+    lines = dcr_string.splitlines()
+    if len(lines) < 2:
+        raise ValueError("the DCR JSON lines must contain a header and a graph")
+    header = json.loads(lines[0])
+    if header.get("format") != FORMAT:
+        raise ValueError("not a DCR JSON lines file")
+    if header.get("version", VERSION) > VERSION:
+        raise ValueError("unsupported version of the DCR JSON lines format: " + str(header.get("version")))
+    body = json.loads(lines[1])
+    if verify_hash and content_hash(body) != header.get("hash"):
+        raise ValueError("the content of the DCR graph does not match its hash")
+
+    graph = dict_to_graph(body)
+    timed = isinstance(graph, TimedDcrGraph)
+    markings = {}
+    for line in lines[2:]:
+        if line:
+            entry = json.loads(line)
+            markings[entry["case"]] = dict_to_marking(entry["marking"], timed=timed)
+    return graph, markings
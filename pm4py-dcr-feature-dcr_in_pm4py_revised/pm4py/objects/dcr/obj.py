@@ -15,7 +15,7 @@ The `dcr_template` dictionary provides a blueprint for initializing new DCR Grap
 """
 from copy import deepcopy
 from enum import Enum
-from typing import Set, Dict
+from typing import Set, Dict, Tuple
 
 
 class Relations(Enum):
@@ -69,6 +69,11 @@ class Marking:
     This class contains the set of all markings M(G), in which it contains three sets:
     M(G) = executed x included x pending
 
+    The marking can also be kept as the masks of a compiled graph (see :meth:`DcrGraph.compile`), such that the
+    semantics delegating to the compiled graph encode it once per run rather than once per call: the masks are
+    kept until one of the sets is assigned, and the sets of a marking given as masks are only decoded when
+    accessed. A set changed in place has to be assigned back (or the marking reset) for the masks to be dropped.
+
     Attributes
     ----------
     self.__executed: Set[str]
@@ -77,11 +82,19 @@ class Marking:
         The set of included events
     self.__pending: Set[str]
         the set of pending events
+    self.__compiled: CompiledDcrGraph
+        The compiled graph the masks are encoded on, None if the marking is not kept as masks
+    self.__masks: Tuple[int, int, int]
+        The (executed, included, pending) masks of the marking on the compiled graph
 
     Methods
     --------
     reset(self, initial_marking) -> None:
         Given the initial marking of the DCR Graph, reset the marking, to restart execution of traces
+    bitset(self, compiled) -> Tuple[int, int, int]:
+        Returns the marking as masks of the compiled graph, encoding it only if needed
+    set_bitset(self, compiled, masks) -> None:
+        Sets the marking from masks of the compiled graph, the sets being decoded when accessed
 
 
     """
@@ -89,32 +102,88 @@ class Marking:
         self.__executed = executed
         self.__included = included
         self.__pending = pending
+        self.__compiled = None
+        self.__masks = None
+
+    def __decode(self) -> None:
+        if self.__executed is None:
+            compiled, masks = self.__compiled, self.__masks
+            self.__executed = compiled.decode(masks[0])
+            self.__included = compiled.decode(masks[1])
+            self.__pending = compiled.decode(masks[2])
+
+    def __drop_masks(self) -> None:
+        self.__decode()
+        self.__compiled = None
+        self.__masks = None
 
     # getters and setters for datamanipulation, mainly used for DCR semantics
     @property
     def executed(self):
+        self.__decode()
         return self.__executed
 
     @executed.setter
     def executed(self, value):
+        self.__drop_masks()
         self.__executed = value
 
     @property
     def included(self):
+        self.__decode()
         return self.__included
 
     @included.setter
     def included(self, value):
+        self.__drop_masks()
         self.__included = value
 
     @property
     def pending(self):
+        self.__decode()
         return self.__pending
 
     @pending.setter
     def pending(self, value):
+        self.__drop_masks()
         self.__pending = value
 
+    def bitset(self, compiled) -> Tuple[int, int, int]:
+        """
+        Returns the marking as masks of a compiled graph, encoding it only if it is not already kept as masks
+        of this compiled graph
+
+        Parameters
+        ----------
+        compiled
+            the compiled graph (CompiledDcrGraph) of the DCR Graph
+
+        Returns
+        -------
+        masks
+            the (executed, included, pending) masks
+        """
+        if self.__masks is None or self.__compiled is not compiled:
+            masks = compiled.encode_marking(self)
+            self.__compiled = compiled
+            self.__masks = masks
+        return self.__masks
+
+    def set_bitset(self, compiled, masks: Tuple[int, int, int]) -> None:
+        """
+        Sets the marking from masks of a compiled graph, the sets being decoded when first accessed
+
+        Parameters
+        ----------
+        compiled
+            the compiled graph (CompiledDcrGraph) of the DCR Graph
+        masks
+            the (executed, included, pending) masks
+        """
+        self.__compiled = compiled
+        self.__masks = masks
+        self.__executed = self.__included = self.__pending = None
+
     def reset(self, initial_marking) -> None:
         """
         Resets the marking of a DCR graph, uses the graphs event to reset included marking
@@ -125,23 +194,35 @@ class Marking:
             the events in the DCR Graphs
 
         """
+        self.__compiled = None
+        self.__masks = None
         self.__executed = set(initial_marking['executed'])
         self.__included = set(initial_marking['included'])
         self.__pending = set(initial_marking['pending'])
 
+    # the masks are a cache of the sets, they are neither copied nor pickled
+    def __getstate__(self):
+        self.__decode()
+        state = dict(vars(self))
+        state['_Marking__compiled'] = None
+        state['_Marking__masks'] = None
+        return state
+
     # built-in functions for printing a visual string representation
     def __str__(self) -> str:
         return self.__repr__()
 
     def __repr__(self):
-        return f'{{executed: {self.__executed}, included: {self.__included}, pending: {self.__pending}}}'
+        return f'{{executed: {self.executed}, included: {self.included}, pending: {self.pending}}}'
 
     def __getitem__(self, item):
+        self.__decode()
         for key, value in vars(self).items():
             if item == key.split("_")[-1]:
                 return value
 
     def __setitem__(self, item, value):
+        self.__drop_masks()
         for key, _ in vars(self).items():
             if item == key.split("_")[-1]:
                 setattr(self, key, value)
@@ -190,6 +271,8 @@ class DcrGraph(object):
         returns the activity of the given event
     getConstraints() -> int:
         returns the size of the model based on number of constraints
+    compile() -> CompiledDcrGraph:
+        returns the integer-encoded representation of the graph used for fast replay
 
     Parameters
     ----------
@@ -357,6 +440,21 @@ class DcrGraph(object):
             no += len(i)
         return no
 
+    def compile(self):
+        """
+        Compile the graph to its integer-encoded representation, in which events are indices,
+        relations are bitmasks and markings are tuples of three integers.
+
+        The compiled graph is a snapshot, it has to be compiled again after the relations are changed.
+
+        Returns
+        -------
+        compiled
+            the :class:`pm4py.objects.dcr.compiled.obj.CompiledDcrGraph` of the graph
+        """
+        from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph
+        return CompiledDcrGraph(self)
+
     def __repr__(self):
         string = ""
         for key, value in vars(self).items():
@@ -1,6 +1,8 @@
-from typing import Set
+from typing import Set, Optional
 
 from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
 
 """
 We will implement the semantics according to the papers given in:
@@ -17,9 +19,15 @@ class DcrSemantics(object):
         Author: Thomas T. Hildebrandt and Raghava Rao Mukkamala,
         Title: Declarative Event-BasedWorkflow as Distributed Dynamic Condition Response Graphs
         publisher: Electronic Proceedings in Theoretical Computer Science. EPTCS, Open Publishing Association, 2010, pp. 59–73. doi: 10.4204/EPTCS.69.5.
+
+        Each function takes an optional compiled graph, the result of graph.compile() kept by the caller across calls.
+        When given, the function delegates to :class:`pm4py.objects.dcr.compiled.semantics.CompiledSemantics`, on the
+        marking of the graph kept as masks (see :meth:`pm4py.objects.dcr.obj.Marking.bitset`): the marking is encoded
+        on the first call, execute() only updates the masks, and the sets are decoded when accessed. The compiled
+        graph is a snapshot of the relations, it has to be compiled again when they are changed.
         """
     @classmethod
-    def is_enabled(cls, event, graph: DcrGraph) -> bool:
+    def is_enabled(cls, event, graph: DcrGraph, compiled: Optional[CompiledDcrGraph] = None) -> bool:
         """
         Verify that the given event is enabled for execution in the DCR graph
 
@@ -27,37 +35,41 @@ class DcrSemantics(object):
         ----------
         :param event: the instance of event being check for if enabled
         :param graph: DCR graph that it check for being enabled
+        :param compiled: optional compiled graph of the DCR graph to delegate to
 
         Returns
         -------
         :return: true if enabled, false otherwise
         """
         # check if event is enabled, calls function that returns a graph, of enabled events
-        return event in cls.enabled(graph)
+        return event in cls.enabled(graph, compiled=compiled)
 
     @classmethod
-    def enabled(cls, graph: DcrGraph) -> Set[str]:
+    def enabled(cls, graph: DcrGraph, compiled: Optional[CompiledDcrGraph] = None) -> Set[str]:
         """
         Creates a list of enabled events, based on included events and conditions constraints met
 
         Parameters
         ----------
         :param graph: takes the current state of the DCR
+        :param compiled: optional compiled graph of the DCR graph to delegate to
 
         Returns
         -------
         :param res: set of enabled activities
         """
+        if compiled is not None:
+            return compiled.decode(CompiledSemantics.enabled(compiled, graph.marking.bitset(compiled)))
         # can be extended to check for milestones
         res = set(graph.marking.included)
+        blocking = graph.marking.included.difference(graph.marking.executed)
         for e in set(graph.conditions.keys()).intersection(res):
-            if len(graph.conditions[e].intersection(graph.marking.included.difference(
-                    graph.marking.executed))) > 0:
+            if not graph.conditions[e].isdisjoint(blocking):
                 res.discard(e)
         return res
 
     @classmethod
-    def execute(cls, graph: DcrGraph, event):
+    def execute(cls, graph: DcrGraph, event, compiled: Optional[CompiledDcrGraph] = None):
         """
         Function based on semantics of execution a DCR graph
         will update the graph according to relations of the executed activity
@@ -68,11 +80,21 @@ class DcrSemantics(object):
         ----------
         :param graph: DCR graph
         :param event: the event being executed
+        :param compiled: optional compiled graph of the DCR graph to delegate to, the no-responses of an
+            extended graph are then applied as well
 
         Returns
         ---------
         :return: DCR graph with updated marking
         """
+        idx = compiled.index_of(event) if compiled is not None else None
+        if idx is not None:
+            marking = graph.marking
+            marking.set_bitset(compiled, CompiledSemantics.execute(compiled, marking.bitset(compiled), idx))
+            return graph
+
+        # the sets are changed in place, the masks of the marking are dropped by assigning them back
+        graph.marking.executed = graph.marking.executed
         # each event is called for execution is called
         if event in graph.marking.pending:
             graph.marking.pending.discard(event)
@@ -95,18 +117,21 @@ class DcrSemantics(object):
         return graph
 
     @classmethod
-    def is_accepting(cls, graph: DcrGraph) -> bool:
+    def is_accepting(cls, graph: DcrGraph, compiled: Optional[CompiledDcrGraph] = None) -> bool:
         """
         Checks if the graph is accepting, no included events are pending
 
         Parameters
         ----------
         :param graph: DCR Graph
+        :param compiled: optional compiled graph of the DCR graph to delegate to
 
         Returns
         ---------
         :return: True if graph is accepting, false otherwise
         """
+        if compiled is not None:
+            return CompiledSemantics.is_accepting(compiled, graph.marking.bitset(compiled))
         res = graph.marking.pending.intersection(graph.marking.included)
         if len(res) > 0:
             return False
@@ -19,12 +19,14 @@ References
 ----------
 .. [1] Hildebrandt, T., Mukkamala, R.R., Slaats, T., Zanitti, F. (2013). Contracts for cross-organizational workflows as timed Dynamic Condition Response Graphs. The Journal of Logic and Algebraic Programming, 82(5-7), 164-185. `DOI <https://doi.org/10.1016/j.jlap.2013.05.005>`_.
 """
+import heapq
 from datetime import timedelta
+from types import MappingProxyType
 
 from pm4py.objects.dcr.obj import Marking
 from pm4py.objects.dcr.hierarchical.obj import HierarchicalDcrGraph
 
-from typing import Dict
+from typing import Dict, List, Mapping, Optional, Tuple
 
 
 class TimedMarking(Marking):
@@ -32,29 +34,103 @@ class TimedMarking(Marking):
     This class extends the basic Marking class to include timing information
     for executed events and pending deadlines.
 
+    The times are kept against a clock, the time elapsed since the start of the execution, such that letting
+    time pass only advances the clock: the execution time of the events and the deadlines of the pending events
+    are stored as absolute times on this clock, and the time since an execution or until a deadline is derived
+    from them. The deadlines and the delays still to elapse are also kept in priority queues, maintained by
+    :class:`pm4py.objects.dcr.timed.semantics.TimedSemantics`.
+
+    As they are derived from the clock, executed_time and pending_deadline are read-only mappings computed on
+    access: changing them in place raises a TypeError. The times are set by the constructor or by reset(), from
+    the 'executedTime' and 'pendingDeadline' of the initial marking, and updated by the semantics.
+
     Attributes
     ----------
-    self.__executed_time: Dict[str, datetime]
-        A dictionary mapping events to their execution times.
-    self.__pending_deadline: Dict[str, datetime]
-        A dictionary mapping events to their pending deadlines.
+    self.__clock: timedelta
+        The time elapsed since the start of the execution.
+    self.__executed_at: Dict[str, timedelta]
+        A dictionary mapping events to the clock time of their last execution.
+    self.__deadline_at: Dict[str, timedelta]
+        A dictionary mapping pending events to the clock time of their deadline.
+    self.__deadline_queue: List[Tuple[timedelta, str]]
+        A heap of the (deadline, event) entries of the pending events, entries no longer matching a deadline
+        being discarded when met.
+    self.__delay_queue: List[Tuple[timedelta, str, timedelta]]
+        A heap of the (end of the delay, event, execution time) entries of the delays started by the executions
+        of the events, entries of an older execution being discarded when met.
+    self.__delays_by_condition: Dict[str, List[timedelta]]
+        The distinct delays of the timed conditions of the graph, by condition, built when first needed.
 
     Methods
     -------
-    No additional methods are explicitly defined in this class.
+    advance(self, tics) -> None:
+        Lets the given time pass.
+    reset(self, initial_marking) -> None:
+        Resets the marking and the clock, to restart execution of traces.
     """
     def __init__(self, executed, included, pending, executed_time=None, pending_deadline=None) -> None:
         super().__init__(executed, included, pending)
-        self.__executed_time = {} if executed_time is None else executed_time
-        self.__pending_deadline = {} if pending_deadline is None else pending_deadline
+        self.__init_times(executed_time, pending_deadline)
+
+    def __init_times(self, executed_time, pending_deadline) -> None:
+        self.__clock = timedelta(0)
+        self.__executed_at = {} if executed_time is None else {e: -t for e, t in executed_time.items()}
+        self.__deadline_at = {} if pending_deadline is None else dict(pending_deadline)
+        self.__deadline_queue = [(t, e) for e, t in self.__deadline_at.items()]
+        heapq.heapify(self.__deadline_queue)
+        self.__delay_queue = []
+        # index of the delays of the graph by condition, built by the semantics on the first execution
+        self.__delays_by_condition = None
 
     @property
-    def executed_time(self):
-        return self.__executed_time
+    def clock(self) -> timedelta:
+        return self.__clock
 
     @property
-    def pending_deadline(self):
-        return self.__pending_deadline
+    def executed_at(self) -> Dict[str, timedelta]:
+        return self.__executed_at
+
+    @property
+    def deadline_at(self) -> Dict[str, timedelta]:
+        return self.__deadline_at
+
+    @property
+    def deadline_queue(self) -> List[Tuple[timedelta, str]]:
+        return self.__deadline_queue
+
+    @property
+    def delay_queue(self) -> List[Tuple[timedelta, str, timedelta]]:
+        return self.__delay_queue
+
+    @property
+    def delays_by_condition(self) -> Optional[Dict[str, List[timedelta]]]:
+        return self.__delays_by_condition
+
+    @delays_by_condition.setter
+    def delays_by_condition(self, value: Optional[Dict[str, List[timedelta]]]):
+        self.__delays_by_condition = value
+
+    @property
+    def executed_time(self) -> Mapping[str, timedelta]:
+        """
+        The time since the last execution of the executed events, computed from the clock, as a read-only mapping
+        """
+        return MappingProxyType({e: self.__clock - t for e, t in self.__executed_at.items()})
+
+    @property
+    def pending_deadline(self) -> Mapping[str, timedelta]:
+        """
+        The time left until the deadline of the pending events, computed from the clock, as a read-only mapping,
+        a deadline passed while the event was excluded being 0
+        """
+        return MappingProxyType({e: max(t - self.__clock, timedelta(0)) for e, t in self.__deadline_at.items()})
+
+    def advance(self, tics: timedelta) -> None:
+        self.__clock += tics
+
+    def reset(self, initial_marking) -> None:
+        super().reset(initial_marking)
+        self.__init_times(initial_marking.get('executedTime'), initial_marking.get('pendingDeadline'))
 
 
 class TimedDcrGraph(HierarchicalDcrGraph):
@@ -80,9 +156,9 @@ class TimedDcrGraph(HierarchicalDcrGraph):
     """
     def __init__(self, template=None, timing_dict=None):
         super().__init__(template)
-        self.__marking = TimedMarking(set(), set(), set()) if template is None else (
+        self.marking = TimedMarking(set(), set(), set()) if template is None else (
             TimedMarking(template['marking']['executed'], template['marking']['included'], template['marking']['pending'],
-                         template['marking']['executedTime'], template['marking']['pendingDeadline']))
+                         template['marking'].get('executedTime'), template['marking'].get('pendingDeadline')))
         self.__timedconditions = {} if template is None else template['conditionsForDelays']
         self.__timedresponses = {} if template is None else template['responseToDeadlines']
         if timing_dict is not None:
@@ -1,82 +1,182 @@
+import heapq
 from datetime import timedelta
-from typing import Set
+from typing import Set, Dict, List, Optional
 
 from pm4py.objects.dcr.extended.semantics import ExtendedSemantics
 
 
 class TimedSemantics(ExtendedSemantics):
+    """
+    Semantics of timed DCR Graphs, on a :class:`pm4py.objects.dcr.timed.obj.TimedMarking`.
 
-    def __init__(self, graph):
-        self.__can_execute_time = self.create_can_execute_time_dict(graph)
+    Time is kept as a clock in the marking: letting time pass advances the clock, and the execution times and
+    deadlines are absolute times on it, such that a time step does not update every event. The deadlines of the
+    pending events and the ends of the delays started by the executions are kept in priority queues, pushed on
+    execution and discarded lazily when they no longer hold (the event was executed again, is not pending anymore
+    or the delay has elapsed); the entries of excluded events are kept for their re-inclusion. Finding the next
+    deadline or delay then takes a logarithmic time per entry pushed, instead of a scan of all the events.
+
+    The time constraints of the graph are indexed on the first execution after the marking is reset, changing
+    them during an execution is not supported.
+
+    As in :class:`pm4py.objects.dcr.semantics.DcrSemantics`, enabled() and execute() take an optional compiled
+    graph, to which the untimed rules are delegated, the delays of the timed conditions are then checked on the
+    enabled events.
+    """
 
     @classmethod
-    def execute(cls, graph, event_or_tics):
+    def execute(cls, graph, event_or_tics, compiled=None):
         if isinstance(event_or_tics, timedelta):
             return cls.time_step(graph, event_or_tics)
         elif isinstance(event_or_tics, int):
             return cls.time_step(graph, timedelta(event_or_tics))
         elif event_or_tics in graph.events:
-            return super().execute(graph, event_or_tics)
+            # the times are kept on the marking, the untimed part of the execution can be delegated
+            cls.weak_execute(event_or_tics, graph)
+            return super().execute(graph, event_or_tics, compiled=compiled)
         else:
             raise ValueError('event_or_tics must be either timedelta, int or event')
 
     @classmethod
-    def enabled(cls, graph) -> Set[str]:
-        res = super().enabled(graph)
-        for e in res:
-            if e in graph.timedconditions:
-                for (e_prime, k) in graph.timedconditions[e].items():
-                    if (e_prime in graph.marking.included.intersection(graph.marking.executed) and
-                            graph.marking.executed_time[e_prime] < k):
-                        res.discard(e)
+    def enabled(cls, graph, compiled=None) -> Set[str]:
+        res = super().enabled(graph, compiled=compiled)
+        marking = graph.marking
+        if compiled is not None:
+            # checked on the masks, such that the sets of the marking are not decoded
+            executed, included, _ = marking.bitset(compiled)
+            blocking_mask = executed & included
+            index = compiled.index
+
+            def is_blocking(e_prime):
+                return e_prime in index and (blocking_mask >> index[e_prime]) & 1
+        else:
+            blocking = marking.included.intersection(marking.executed)
+            is_blocking = blocking.__contains__
+        for e in set(graph.timedconditions.keys()).intersection(res):
+            for (e_prime, k) in graph.timedconditions[e].items():
+                executed_at = marking.executed_at.get(e_prime)
+                # an event executed in the initial marking without execution time is taken as executed long ago
+                if is_blocking(e_prime) and executed_at is not None and marking.clock - executed_at < k:
+                    res.discard(e)
+                    break
         return res
 
     @classmethod
     def weak_execute(cls, event, graph):
-        graph.marking.executed_time[event] = 0
+        """
+        Records the execution of an event at the current time: starts the delays of the timed conditions it is
+        a condition of, and sets the deadlines of its timed responses
+        """
+        marking = graph.marking
+        delays = cls.delays_by_condition(graph)
+        now = marking.clock
+        marking.deadline_at.pop(event, None)
+        # the entries already pushed at the current time still hold
+        if marking.executed_at.get(event) != now:
+            marking.executed_at[event] = now
+            for k in delays.get(event, []):
+                heapq.heappush(marking.delay_queue, (now + k, event, now))
 
         if event in graph.timedresponses:
             for (e_prime, k) in graph.timedresponses[event].items():
-                graph.marking.pending_deadline[e_prime] = k
+                if marking.deadline_at.get(e_prime) != now + k:
+                    marking.deadline_at[e_prime] = now + k
+                    heapq.heappush(marking.deadline_queue, (now + k, e_prime))
 
-        return super().weak_execute(event, graph)
+        # the discarded entries are only popped when they reach the top of the queues, which are rebuilt once
+        # they hold more than twice the entries that can still hold
+        bound = 2 * len(graph.events) + 64
+        if len(marking.deadline_queue) > bound:
+            cls.compact(marking.deadline_queue, lambda entry: marking.deadline_at.get(entry[1]) == entry[0])
+        if len(marking.delay_queue) > bound + 2 * sum(len(ks) for ks in delays.values()):
+            cls.compact(marking.delay_queue, lambda entry: entry[0] > marking.clock and
+                        marking.executed_at.get(entry[1]) == entry[2])
+        return graph
 
     @classmethod
     def time_step(cls, graph, tics):
         deadline = cls.next_deadline(graph)
         # we can only time step if no included pending event deadline is exceeded
-        if tics <= deadline:
-            for e in graph.marking.pending_deadline:
-                # for each existing deadline we update the deadline time until the event must be made not pending by removing tics
-                # Note the events here do not need to be included
-                # For an excluded pending event the deadline becomes 0 if the deadline is passed while its excluded. So it must be executed immediately after it has been included.
-                graph.marking.pending_deadline[e] = max(graph.marking.pending_deadline[e] - tics, timedelta(0))
-            for e in graph.marking.executed:
-                # for each executed event we care about adding tics until we reach the
-                # maximum of all its delays so that it can fire (we stop counting the executed time afterwards)
-                graph.marking.executed_time[e] = min(graph.marking.executed_time[e] + tics, cls.__can_execute_time[e])
+        if deadline is None or tics <= deadline:
+            graph.marking.advance(tics)
         return graph
 
     @staticmethod
-    def next_deadline(graph):
+    def next_deadline(graph) -> Optional[timedelta]:
+        """
+        Returns the time left until the earliest deadline of an included pending event, None if there is none.
+        For an excluded pending event the deadline becomes 0 if the deadline is passed while its excluded,
+        so it must be executed immediately after it has been included.
+        """
+        marking = graph.marking
+        queue = marking.deadline_queue
+        excluded = []
         next_deadline = None
-        for e in graph.marking.pending_deadline:
-            if e in graph.marking.included:
-                if (next_deadline is None) or (graph.marking.pending_deadline[e] < next_deadline):
-                    next_deadline = graph.marking.pending_deadline[e]
+        while queue:
+            (t, e) = queue[0]
+            if marking.deadline_at.get(e) != t:
+                heapq.heappop(queue)
+            elif e not in marking.pending:
+                # the event is not pending anymore, its deadline no longer holds
+                heapq.heappop(queue)
+                del marking.deadline_at[e]
+            elif e not in marking.included:
+                excluded.append(heapq.heappop(queue))
+            else:
+                next_deadline = max(t - marking.clock, timedelta(0))
+                break
+        for entry in excluded:
+            heapq.heappush(queue, entry)
         return next_deadline
 
-    @staticmethod
-    def next_delay(graph):
+    @classmethod
+    def next_delay(cls, graph) -> Optional[timedelta]:
+        """
+        Returns the time left until the earliest end of a delay of a timed condition on an included and executed
+        event, None if there is none
+        """
+        marking = graph.marking
+        cls.delays_by_condition(graph)
+        queue = marking.delay_queue
+        excluded = []
         next_delay = None
-        for e in graph.timedconditions:
-            for (e_prime, k) in graph.timedconditions[e].items():
-                if e_prime in graph.marking.included and e_prime in graph.marking.executed:
-                    delay = k - graph.marking.executed_time[e_prime]
-                    if delay > timedelta(0) and (next_delay is None or delay < next_delay):
-                        next_delay = delay
+        while queue:
+            (t, e, executed_at) = queue[0]
+            if t <= marking.clock or marking.executed_at.get(e) != executed_at:
+                # the delay has elapsed, or the event was executed again since
+                heapq.heappop(queue)
+            elif e not in marking.included or e not in marking.executed:
+                excluded.append(heapq.heappop(queue))
+            else:
+                next_delay = t - marking.clock
+                break
+        for entry in excluded:
+            heapq.heappush(queue, entry)
         return next_delay
 
+    @staticmethod
+    def delays_by_condition(graph) -> Dict[str, List[timedelta]]:
+        """
+        Returns the distinct delays of the timed conditions of the graph, by condition, indexing them in the marking
+        on the first call, together with the delays started by the executions of the initial marking
+        """
+        marking = graph.marking
+        if marking.delays_by_condition is None:
+            delays = {}
+            for e in graph.timedconditions:
+                for (e_prime, k) in graph.timedconditions[e].items():
+                    delays.setdefault(e_prime, set()).add(k)
+            marking.delays_by_condition = {e: sorted(ks) for e, ks in delays.items()}
+            for e, executed_at in marking.executed_at.items():
+                for k in marking.delays_by_condition.get(e, []):
+                    heapq.heappush(marking.delay_queue, (executed_at + k, e, executed_at))
+        return marking.delays_by_condition
+
+    @staticmethod
+    def compact(queue: list, is_live) -> None:
+        queue[:] = {entry for entry in queue if is_live(entry)}
+        heapq.heapify(queue)
+
     @staticmethod
     def create_can_execute_time_dict(graph):
         d = {}
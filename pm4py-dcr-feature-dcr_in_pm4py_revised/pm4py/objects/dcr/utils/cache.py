@@ -0,0 +1,234 @@
+"""
+This module provides the utilities to reuse results computed on DCR Graphs, such as the per-variant results
+of the DCR conformance algorithms or the conversions to Petri nets, across calls on the same graph.
+
+Functions:
+    graph_fingerprint: Computes a content hash of a DCR Graph.
+
+Classes:
+    VariantCache: A bounded least recently used cache of per-variant results.
+    ConversionCache: A bounded least recently used cache of conversions, in memory and optionally on disk.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from pm4py.objects.dcr.obj import DcrGraph
+from pm4py.objects.dcr.utils import serialization
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Converts a value of a DCR template to a representation that does not depend on the iteration order
+    of its sets and dictionaries
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(k), _canonical(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_canonical(v)) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    return repr(value)
+
+
+def graph_fingerprint(graph: DcrGraph) -> str:
+    """
+    Computes a content hash of a DCR Graph, covering its events, labels, relations, marking and, for the
+    subclasses, their additional attributes (roles, milestones, time constraints...).
+    The fingerprint is the content hash of the canonical JSON lines encoding of the graph (see
+    serialization.content_hash), such that it does not depend on the order in which the relations were added
+    nor on the type of the durations, and it is preserved when the graph is written and read back. The subclasses
+    that cannot be written as JSON lines are fingerprinted as well.
+
+    Parameters
+    ----------
+    graph
+        the DCR Graph (or any of its subclasses)
+
+    Returns
+    -------
+    fingerprint
+        hexadecimal digest of the content of the graph
+    """
+    return serialization.content_hash(graph)
+
+
+class VariantCache(object):
+    """
+    Bounded least recently used cache of the results computed for a variant against a graph.
+
+    The keys are built from the fingerprint of the graph and the variant, such that a cache can be shared
+    across calls and across graphs: a result is only reused when the same variant is checked against a graph
+    with the same content. Once the cache is full, the least recently used result is evicted.
+
+    Attributes
+    ----------
+    self.maxsize: int
+        The maximum number of results kept, None for an unbounded cache
+    self.hits: int
+        The number of lookups that found a result
+    self.misses: int
+        The number of lookups that did not find a result
+
+    Methods
+    -------
+    get(fingerprint, variant) -> Any:
+        returns the cached result of a variant, None if not cached
+    put(fingerprint, variant, result) -> None:
+        stores the result of a variant
+    clear() -> None:
+        removes all the results
+
+    Examples
+    --------
+    cache = VariantCache(maxsize=1000)\n
+    res = pm4py.conformance_dcr(log, graph, variant_cache=cache)\n
+    res = pm4py.conformance_dcr(other_log, graph, variant_cache=cache)\n
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__results = OrderedDict()
+
+    def __len__(self):
+        return len(self.__results)
+
+    def get(self, fingerprint: str, variant: Hashable) -> Any:
+        key = (fingerprint, variant)
+        if key not in self.__results:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__results.move_to_end(key)
+        return self.__results[key]
+
+    def put(self, fingerprint: str, variant: Hashable, result: Any) -> None:
+        key = (fingerprint, variant)
+        self.__results[key] = result
+        self.__results.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self.__results) > self.maxsize:
+                self.__results.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class ConversionCache(object):
+    """
+    Bounded least recently used cache of the conversions of DCR Graphs, such as their Petri nets.
+
+    A conversion is stored under a key built from the fingerprint of the graph, the conversion variant and its
+    options, such that it is only reused for a graph with the same content converted in the same way. The results
+    are stored pickled, and a fresh copy is returned by each lookup, such that modifying a returned net does not
+    alter the cache. When a directory is given, the results are also written to it, one file per key, such that
+    they are shared across processes and sessions; the files are only read, never evicted.
+
+    Attributes
+    ----------
+    self.maxsize: int
+        The maximum number of results kept in memory, None for an unbounded cache
+    self.path: str
+        The directory the results are written to, None to keep them in memory only
+    self.hits: int
+        The number of lookups that found a result
+    self.misses: int
+        The number of lookups that did not find a result
+
+    Methods
+    -------
+    key(graph, variant, options) -> str:
+        returns the key of the conversion of a graph with a variant and options
+    get(key) -> Any:
+        returns a copy of the cached result of a key, None if not cached
+    put(key, result) -> None:
+        stores the result of a key
+    clear() -> None:
+        removes all the results kept in memory
+
+    Examples
+    --------
+    cache = ConversionCache(path="/tmp/dcr_nets")\n
+    net, im, fm = pm4py.convert_to_petri_net(graph, conversion_cache=cache)\n
+    net, im, fm = pm4py.convert_to_petri_net(graph, conversion_cache=cache)\n
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.__results = OrderedDict()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self):
+        return len(self.__results)
+
+    @staticmethod
+    def key(graph: DcrGraph, variant: str, options: Optional[Dict[Any, Any]] = None) -> str:
+        """
+        Computes the key of a conversion, from the fingerprint of the graph, the name of the variant and its options
+
+        Parameters
+        ----------
+        graph
+            the DCR Graph to convert
+        variant
+            the name of the conversion variant
+        options
+            the options of the conversion
+
+        Returns
+        -------
+        key
+            hexadecimal digest identifying the conversion
+        """
+        content = (graph_fingerprint(graph), variant, _canonical({} if options is None else options))
+        return hashlib.sha256(repr(content).encode("utf-8")).hexdigest()
+
+    def __file(self, key: str) -> str:
+        return os.path.join(self.path, key + ".pkl")
+
+    def get(self, key: str) -> Any:
+        data = self.__results.get(key)
+        if data is not None:
+            self.__results.move_to_end(key)
+        elif self.path is not None and os.path.exists(self.__file(key)):
+            with open(self.__file(key), "rb") as f:
+                data = f.read()
+            self.__store(key, data)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: str, result: Any) -> None:
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__store(key, data)
+        if self.path is not None:
+            # written to a temporary file first, such that concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.__file(key))
+
+    def __store(self, key: str, data: bytes) -> None:
+        self.__results[key] = data
+        self.__results.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self.__results) > self.maxsize:
+                self.__results.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__results.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,253 @@
+"""
+This module explores the reachable state space of DCR Graphs directly on their compiled representation,
+without converting them to Petri nets.
+
+Each reachable marking is hash-consed to an integer state, the markings being the (executed, included, pending)
+masks of the compiled graph, and the transitions are kept in flat integer arrays, such that graphs with millions
+of reachable markings can be explored.
+
+Functions:
+    explore: Explores the reachable markings of a DCR Graph, within a bound on the number of states and time.
+    construct_reachability_graph: Creates the reachability graph of a DCR Graph as a transition system.
+
+Classes:
+    DcrStateSpace: The explored markings and transitions, with the analyses of deadlocks, livelocks and dead events.
+"""
+import time
+from array import array
+from collections import deque
+from enum import Enum
+from typing import Optional, Dict, Any, List, Set
+
+from pm4py.objects.dcr.compiled.obj import CompiledDcrGraph, BitsetMarking, iter_indices
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.obj import DcrGraph, Marking
+from pm4py.objects.transition_system import obj as ts
+from pm4py.objects.transition_system import utils
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    MAX_ELAB_TIME = "max_elab_time"
+    MAX_STATES = "max_states"
+    SEARCH = "search"
+
+
+class Search(Enum):
+    BFS = "bfs"
+    DFS = "dfs"
+
+
+class DcrStateSpace(object):
+    """
+    Reachable markings of a DCR Graph and the transitions between them.
+
+    The states are numbered in order of discovery, state 0 being the initial marking. A state is expanded when
+    its successors have been computed; if the exploration is interrupted by the bounds, the states discovered but
+    not expanded have no outgoing transitions recorded and the exploration is not complete.
+
+    Attributes
+    ----------
+    self.compiled: CompiledDcrGraph
+        The compiled graph the markings refer to
+    self.markings: List[Tuple[int, int, int]]
+        The bitset marking of each state
+    self.complete: bool
+        True if every reachable marking was expanded within the bounds
+
+    Methods
+    -------
+    successors(state) -> List[Tuple[int, int]]:
+        returns the (event index, target state) pairs of the outgoing transitions of a state
+    marking(state) -> Marking:
+        returns the marking of a state, as sets of events
+    accepting_states() -> Set[int]:
+        returns the states with no included pending event
+    deadlocks() -> Set[int]:
+        returns the expanded non accepting states without enabled events
+    livelocks() -> Set[int]:
+        returns the expanded states, not deadlocked, from which no accepting state is reachable
+    dead_events() -> Set[str]:
+        returns the events that are never enabled in a reachable marking
+    """
+
+    def __init__(self, compiled: CompiledDcrGraph):
+        self.compiled = compiled
+        self.markings = []
+        self.state_of = {}
+        self.complete = False
+        # transitions of the expanded states, those of a state being contiguous from its first edge
+        self.first_edge = array('q')
+        self.no_edges = array('l')
+        self.edge_events = array('l')
+        self.edge_targets = array('q')
+
+    def __len__(self):
+        return len(self.markings)
+
+    def add_state(self, marking: BitsetMarking) -> int:
+        state = self.state_of.get(marking)
+        if state is None:
+            state = len(self.markings)
+            self.state_of[marking] = state
+            self.markings.append(marking)
+            self.first_edge.append(-1)
+            self.no_edges.append(0)
+        return state
+
+    def is_expanded(self, state: int) -> bool:
+        return self.first_edge[state] >= 0
+
+    def successors(self, state: int) -> List[tuple]:
+        start = self.first_edge[state]
+        if start < 0:
+            return []
+        end = start + self.no_edges[state]
+        return list(zip(self.edge_events[start:end], self.edge_targets[start:end]))
+
+    def marking(self, state: int) -> Marking:
+        return self.compiled.decode_marking(self.markings[state])
+
+    def accepting_states(self) -> Set[int]:
+        return {state for state, marking in enumerate(self.markings)
+                if CompiledSemantics.is_accepting(self.compiled, marking)}
+
+    def deadlocks(self) -> Set[int]:
+        return {state for state, marking in enumerate(self.markings)
+                if self.is_expanded(state) and self.no_edges[state] == 0
+                and not CompiledSemantics.is_accepting(self.compiled, marking)}
+
+    def livelocks(self) -> Set[int]:
+        """
+        Computes the states from which the runs can continue but can never reach an accepting marking,
+        by a backward search from the accepting states. Only exact when the exploration is complete.
+        """
+        predecessors = [[] for _ in range(len(self.markings))]
+        for state in range(len(self.markings)):
+            for _, target in self.successors(state):
+                predecessors[target].append(state)
+        coreachable = self.accepting_states()
+        stack = list(coreachable)
+        while stack:
+            state = stack.pop()
+            for source in predecessors[state]:
+                if source not in coreachable:
+                    coreachable.add(source)
+                    stack.append(source)
+        return {state for state in range(len(self.markings))
+                if state not in coreachable and self.is_expanded(state) and self.no_edges[state] > 0}
+
+    def dead_events(self) -> Set[str]:
+        """
+        Computes the events that are not enabled in any explored marking. Only exact when the exploration is complete.
+        """
+        fired = 0
+        for event in set(self.edge_events):
+            fired |= 1 << event
+        return self.compiled.decode(self.compiled.all_events & ~fired)
+
+
+def explore(graph: DcrGraph, parameters: Optional[Dict[Any, Any]] = None) -> DcrStateSpace:
+    """
+    Explores the markings reachable from the marking of a DCR Graph, by executing its enabled events.
+    Milestones and no-responses are taken into account, the time constraints of timed graphs are not.
+
+    Parameters
+    ----------
+    graph
+        DCR Graph
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.MAX_STATES => maximum number of states discovered (default None, no bound)
+            - Parameters.MAX_ELAB_TIME => maximum time of the exploration, in seconds (default 86400)
+            - Parameters.SEARCH => Search.BFS or Search.DFS, order in which the states are expanded (default BFS)
+
+    Returns
+    -------
+    state_space
+        The explored state space, complete if no bound was reached
+    """
+    if parameters is None:
+        parameters = {}
+
+    max_states = exec_utils.get_param_value(Parameters.MAX_STATES, parameters, None)
+    max_exec_time = exec_utils.get_param_value(Parameters.MAX_ELAB_TIME, parameters, 86400)
+    search = exec_utils.get_param_value(Parameters.SEARCH, parameters, Search.BFS)
+    depth_first = search == Search.DFS or search == Search.DFS.value
+
+    compiled = graph.compile()
+    state_space = DcrStateSpace(compiled)
+    state_space.add_state(compiled.initial_marking)
+
+    start_time = time.time()
+    active = deque([0])
+    expanded = 0
+    while active:
+        expanded += 1
+        if expanded % 1024 == 0 and (time.time() - start_time) >= max_exec_time:
+            # interrupt the execution
+            return state_space
+        state = active.pop() if depth_first else active.popleft()
+        marking = state_space.markings[state]
+        enabled = CompiledSemantics.enabled(compiled, marking)
+        successors = []
+        for event in iter_indices(enabled):
+            new_marking = CompiledSemantics.execute(compiled, marking, event)
+            target = state_space.state_of.get(new_marking)
+            if target is None:
+                if max_states is not None and len(state_space) >= max_states:
+                    # interrupt the execution, the state is left unexpanded
+                    return state_space
+                target = state_space.add_state(new_marking)
+                active.append(target)
+            successors.append((event, target))
+        state_space.first_edge[state] = len(state_space.edge_events)
+        state_space.no_edges[state] = len(successors)
+        for event, target in successors:
+            state_space.edge_events.append(event)
+            state_space.edge_targets.append(target)
+
+    state_space.complete = True
+    return state_space
+
+
+def construct_reachability_graph(graph: DcrGraph, use_event_id: bool = False,
+                                 parameters: Optional[Dict[Any, Any]] = None) -> ts.TransitionSystem:
+    """
+    Creates the reachability graph of a DCR Graph, as a transition system.
+    The states are named after their number in the exploration, and their marking is stored in their data.
+
+    Parameters
+    ----------
+    graph
+        DCR Graph
+    use_event_id
+        Name the transitions after the event IDs instead of the activities
+    parameters
+        Parameters of the exploration, see explore
+
+    Returns
+    -------
+    re_gr
+        Transition system that represents the reachability graph of the DCR Graph
+    """
+    state_space = explore(graph, parameters=parameters)
+    compiled = state_space.compiled
+
+    names = list(compiled.events)
+    if not use_event_id:
+        names = [graph.label_map.get(event, event) for event in names]
+
+    re_gr = ts.TransitionSystem()
+    map_states = []
+    for state in range(len(state_space)):
+        s = ts.TransitionSystem.State('s' + str(state))
+        s.data['marking'] = state_space.marking(state)
+        re_gr.states.add(s)
+        map_states.append(s)
+
+    for state in range(len(state_space)):
+        for event, target in state_space.successors(state):
+            utils.add_arc_from_to(names[event], map_states[state], map_states[target], re_gr)
+
+    return re_gr
@@ -0,0 +1,208 @@
+"""
+This module provides the JSON lines encoding of DCR Graphs (and their subclasses) and of their markings, used by the
+JSON lines importer and exporter, such that models and per-case markings can be checkpointed and loaded quickly.
+
+The encoding of a graph is canonical: sets are written as sorted lists, dictionaries with sorted keys and durations
+as integer nanoseconds, such that the same content always gives the same bytes, and therefore the same content hash,
+regardless of the order in which the relations were added and across Python processes.
+
+Functions:
+    graph_to_dict: Encodes a DCR Graph as a JSON serializable dictionary.
+    dict_to_graph: Decodes a DCR Graph from its encoding.
+    marking_to_dict: Encodes a marking as a JSON serializable dictionary.
+    dict_to_marking: Decodes a marking from its encoding.
+    dumps_canonical: Writes an encoding as canonical JSON.
+    content_hash: Computes the content hash of a DCR Graph, or of its encoding.
+"""
+import hashlib
+import json
+from copy import deepcopy
+from datetime import timedelta
+from typing import Any, Dict, Union
+
+import pandas as pd
+
+from pm4py.objects.dcr.distributed.obj import DistributedDcrGraph
+from pm4py.objects.dcr.extended.obj import ExtendedDcrGraph
+from pm4py.objects.dcr.hierarchical.obj import HierarchicalDcrGraph
+from pm4py.objects.dcr.obj import DcrGraph, Marking, dcr_template
+from pm4py.objects.dcr.timed.obj import TimedDcrGraph, TimedMarking
+
+FORMAT = "pm4py-dcr"
+VERSION = 1
+DURATION_KEY = "$ns"
+
+GRAPH_TYPES = {cls.__name__: cls for cls in
+               (DcrGraph, DistributedDcrGraph, ExtendedDcrGraph, HierarchicalDcrGraph, TimedDcrGraph)}
+
+
+def _encode(value: Any) -> Any:
+    """
+    Encodes a value of a DCR template: sets become sorted lists, durations integer nanoseconds
+    """
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_encode(v) for v in value), key=str)
+    if isinstance(value, pd.Timedelta):
+        return {DURATION_KEY: int(value.value)}
+    if isinstance(value, timedelta):
+        return {DURATION_KEY: ((value.days * 86400 + value.seconds) * 1000000 + value.microseconds) * 1000}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """
+    Decodes a value encoded by _encode: lists become sets, durations pandas Timedelta
+    """
+    if isinstance(value, dict):
+        if len(value) == 1 and DURATION_KEY in value:
+            return pd.Timedelta(value[DURATION_KEY], unit="ns")
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return set(_decode(v) for v in value)
+    return value
+
+
+def marking_to_dict(marking: Marking) -> Dict[str, Any]:
+    """
+    Encodes a marking. For a timed marking, the time since the execution of the executed events and the time left
+    until the deadline of the pending events are stored, relative to its clock.
+
+    Parameters
+    ----------
+    marking
+        the marking (or timed marking)
+
+    Returns
+    -------
+    encoding
+        JSON serializable dictionary
+    """
+    res = {"executed": _encode(marking.executed), "included": _encode(marking.included),
+           "pending": _encode(marking.pending)}
+    if isinstance(marking, TimedMarking):
+        if marking.executed_time:
+            res["executedTime"] = _encode(dict(marking.executed_time))
+        if marking.pending_deadline:
+            res["pendingDeadline"] = _encode(dict(marking.pending_deadline))
+    return res
+
+
+def dict_to_marking(encoding: Dict[str, Any], timed: bool = False) -> Marking:
+    """
+    Decodes a marking encoded by marking_to_dict
+
+    Parameters
+    ----------
+    encoding
+        the encoding of the marking
+    timed
+        if True, a timed marking is returned, with its clock at 0
+
+    Returns
+    -------
+    marking
+        the marking
+    """
+    executed = _decode(encoding.get("executed", []))
+    included = _decode(encoding.get("included", []))
+    pending = _decode(encoding.get("pending", []))
+    if timed:
+        return TimedMarking(executed, included, pending, _decode(encoding.get("executedTime", {})),
+                            _decode(encoding.get("pendingDeadline", {})))
+    return Marking(executed, included, pending)
+
+
+def _graph_content(graph: DcrGraph) -> Dict[str, Any]:
+    """
+    Encodes the content of any DCR Graph, including the subclasses that cannot be decoded, keeping the attributes
+    of its class that are not empty
+    """
+    template = graph.obj_to_template()
+    # the distributed graph exports its principals assignments under a different key than the one it reads
+    if "principalsAssignment" in template:
+        template["principalsAssignments"] = template.pop("principalsAssignment")
+    res = {"type": type(graph).__name__}
+    for key, value in template.items():
+        if key == "marking":
+            res[key] = marking_to_dict(graph.marking)
+        elif value:
+            res[key] = _encode(value)
+    return res
+
+
+def graph_to_dict(graph: DcrGraph) -> Dict[str, Any]:
+    """
+    Encodes a DCR Graph, keeping the attributes of its class that are not empty.
+    Only the classes that can be decoded by dict_to_graph are accepted.
+
+    Parameters
+    ----------
+    graph
+        the DCR Graph (DcrGraph, DistributedDcrGraph, ExtendedDcrGraph, HierarchicalDcrGraph or TimedDcrGraph)
+
+    Returns
+    -------
+    encoding
+        JSON serializable dictionary
+    """
+    if type(graph).__name__ not in GRAPH_TYPES:
+        raise TypeError("unsupported DCR graph type: " + type(graph).__name__)
+    return _graph_content(graph)
+
+
+def dict_to_graph(encoding: Dict[str, Any]) -> DcrGraph:
+    """
+    Decodes a DCR Graph encoded by graph_to_dict, as an instance of the same class
+
+    Parameters
+    ----------
+    encoding
+        the encoding of the graph
+
+    Returns
+    -------
+    graph
+        the DCR Graph
+    """
+    if encoding.get("type") not in GRAPH_TYPES:
+        raise ValueError("unsupported DCR graph type: " + str(encoding.get("type")))
+    cls = GRAPH_TYPES[encoding["type"]]
+    template = deepcopy(dcr_template)
+    for key, value in encoding.items():
+        if key in ("type", "marking"):
+            continue
+        template[key] = _decode(value)
+    marking = encoding.get("marking", {})
+    for key in ("executed", "included", "pending", "executedTime", "pendingDeadline"):
+        if key in marking:
+            template["marking"][key] = _decode(marking[key])
+    return cls(template)
+
+
+def dumps_canonical(encoding: Dict[str, Any]) -> str:
+    """
+    Writes an encoding as JSON on a single line, with sorted keys and no whitespace
+    """
+    return json.dumps(encoding, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_hash(graph: Union[DcrGraph, Dict[str, Any]]) -> str:
+    """
+    Computes the content hash of a DCR Graph, as the SHA-256 digest of its canonical encoding.
+    The hash is preserved when the graph is written and read back, and is also the fingerprint used by the caches.
+    Any subclass of DcrGraph is accepted, even those that cannot be written as JSON lines.
+
+    Parameters
+    ----------
+    graph
+        the DCR Graph (or any of its subclasses), or its encoding
+
+    Returns
+    -------
+    hash
+        hexadecimal digest of the content of the graph
+    """
+    encoding = graph if isinstance(graph, dict) else _graph_content(graph)
+    return hashlib.sha256(dumps_canonical(encoding).encode("utf-8")).hexdigest()
@@ -0,0 +1,374 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import logging
+import time
+from collections import OrderedDict, Counter
+from enum import Enum
+from typing import Optional, Dict, Any, Union, Tuple
+
+from pm4py.algo.conformance.dcr.variants.classic import HandleChecker, Outputs
+from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+from pm4py.objects.dcr.distributed.obj import DistributedDcrGraph
+from pm4py.objects.dcr.obj import DcrGraph, Marking
+from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    GROUP_KEY = constants.PARAMETER_CONSTANT_GROUP_KEY
+    CASE_TTL = "case_ttl"
+    MAX_EVICTED_CASES = "max_evicted_cases"
+
+
+class CaseState(object):
+    """
+    State of an open case: its marking as (executed, included, pending) masks of the compiled graph, the events
+    that include or exclude other events (the only ones the exclude checker needs from the history), the responses
+    not yet executed with the executions of the events requiring them, the deviations found so far (also as a set,
+    such that each is reported once) and the time of its last event.
+    """
+    __slots__ = ("marking", "history", "response_origin", "deviations", "recorded", "last_seen")
+
+    def __init__(self, marking: Tuple[int, int, int], last_seen: float):
+        self.marking = marking
+        self.history = []
+        self.response_origin = {}
+        self.deviations = []
+        self.recorded = set()
+        self.last_seen = last_seen
+
+
+class DcrStreamingConformance(StreamingAlgorithm):
+    def __init__(self, graph: Union[DcrGraph, DistributedDcrGraph], parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Initialize the streaming rule based conformance checking of a DCR graph.
+
+        Each open case keeps its marking on the compiled graph, every incoming event is checked with the same
+        checkers as the rule based conformance (condition, include, exclude and, for graphs with roles, role),
+        and the deviations are signalled as soon as they are found. The response deviations are checked when
+        the case is terminated. The results of the cases terminated because they were idle are passed to
+        message_case_evicted, and the most recent ones are kept in evicted_cases, reported by get().
+
+        Parameters
+        ---------------
+        graph
+            DCR graph
+        parameters
+            Parameters of the algorithm, including:
+             - Parameters.ACTIVITY_KEY => the attribute to use as activity
+             - Parameters.CASE_ID_KEY => the attribute to use as case identifier
+             - Parameters.GROUP_KEY => the attribute to use as role, for graphs with roles
+             - Parameters.CASE_TTL => seconds after which a case without new events is terminated (default None,
+               the cases are kept until terminated)
+             - Parameters.MAX_EVICTED_CASES => number of results of terminated idle cases kept (default 10000,
+               None to keep all of them)
+        """
+        if parameters is None:
+            parameters = {}
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+        self.activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters,
+                                                       xes_constants.DEFAULT_NAME_KEY)
+        self.case_ttl = exec_utils.get_param_value(Parameters.CASE_TTL, parameters, None)
+        self.max_evicted_cases = exec_utils.get_param_value(Parameters.MAX_EVICTED_CASES, parameters, 10000)
+        self.parameters = parameters
+        # the parameters of the checkers, built once, the keys of the case being checked are set before each check
+        self.checker_parameters = dict(parameters)
+        self.graph = graph
+        self.compiled = graph.compile()
+        self.checker = HandleChecker(graph)
+        if isinstance(graph, DistributedDcrGraph):
+            graph.index_roles()
+        self.total_num_constraints = graph.get_constraints()
+        self.event_of_activity = {}
+        self.initial_marking = (graph.marking.executed, graph.marking.included, graph.marking.pending)
+        # the cases ordered by their last event, such that the idle ones are at the front
+        self.case_dict = OrderedDict()
+        # the results of the most recently evicted cases
+        self.evicted_cases = OrderedDict()
+        StreamingAlgorithm.__init__(self)
+
+    def _process(self, event: Dict[str, Any]):
+        """
+        Checks the event against the marking of its case
+
+        Parameters
+        ---------------
+        event
+            Event (dictionary)
+        """
+        now = time.monotonic()
+        case = event[self.case_id_key] if self.case_id_key in event else None
+        activity = event[self.activity_key] if self.activity_key in event else None
+        if case is not None and activity is not None:
+            self.check_event(str(case), activity, event, now)
+        else:
+            self.message_case_or_activity_not_in_event(event)
+        self.evict_idle_cases(now)
+
+    def check_event(self, case: str, activity: str, event: Dict[str, Any], now: float):
+        """
+        Executes an activity in a case, after checking for the deviations it causes
+
+        Parameters
+        --------------
+        case
+            Case
+        activity
+            Activity
+        event
+            Event with all its attributes, used by the role checker
+        now
+            Time at which the event is received
+        """
+        state = self.case_dict.get(case)
+        if state is None:
+            state = CaseState(self.compiled.initial_marking, now)
+            self.case_dict[case] = state
+        else:
+            state.last_seen = now
+            self.case_dict.move_to_end(case)
+
+        if activity not in self.event_of_activity:
+            self.event_of_activity[activity] = self.graph.get_event(activity)
+        e = self.event_of_activity[activity]
+        idx = self.compiled.index_of(e)
+        if idx is not None and (self.compiled.includes[idx] or self.compiled.excludes[idx]):
+            state.history.append(idx)
+
+        if e in self.graph.responses:
+            for response in self.graph.responses[e]:
+                if response not in state.response_origin:
+                    state.response_origin[response] = Counter()
+                state.response_origin[response][e] += 1
+
+        no_deviations = len(state.deviations)
+        self.checker_parameters['recordedDeviations'] = state.recorded
+        self.checker.all_checker(e, event, self.graph, state.deviations, parameters=self.checker_parameters)
+        if idx is None or not CompiledSemantics.is_enabled(idx, self.compiled, state.marking):
+            self.set_graph_marking(state)
+            self.checker.enabled_checker(e, self.graph, state.deviations,
+                                         parameters=self.get_checker_parameters(state))
+            self.reset_graph_marking()
+        for deviation in state.deviations[no_deviations:]:
+            self.message_deviation(case, activity, deviation)
+
+        if idx is not None:
+            state.marking = CompiledSemantics.execute(self.compiled, state.marking, idx)
+
+        state.response_origin.pop(e, None)
+
+    def set_graph_marking(self, state: CaseState):
+        """
+        Writes the marking of a case to the graph, such that the checkers can inspect it
+        """
+        self.graph.marking.executed = self.compiled.decode(state.marking[0])
+        self.graph.marking.included = self.compiled.decode(state.marking[1])
+        self.graph.marking.pending = self.compiled.decode(state.marking[2])
+
+    def reset_graph_marking(self):
+        """
+        Restores the marking of the graph
+        """
+        self.graph.marking.executed, self.graph.marking.included, self.graph.marking.pending = self.initial_marking
+
+    def get_checker_parameters(self, state: CaseState) -> Dict[Any, Any]:
+        parameters = self.checker_parameters
+        parameters['executionHistory'] = [self.compiled.events[idx] for idx in state.history]
+        parameters['recordedDeviations'] = state.recorded
+        return parameters
+
+    def evict_idle_cases(self, now: float):
+        """
+        Terminates the cases that did not receive any event for longer than the TTL, keeping their results
+
+        Parameters
+        --------------
+        now
+            Current time
+        """
+        if self.case_ttl is None:
+            return
+        while self.case_dict:
+            case, state = next(iter(self.case_dict.items()))
+            if now - state.last_seen <= self.case_ttl:
+                break
+            result = self.terminate(case)
+            self.evicted_cases[case] = result
+            self.evicted_cases.move_to_end(case)
+            if self.max_evicted_cases is not None:
+                while len(self.evicted_cases) > self.max_evicted_cases:
+                    self.evicted_cases.popitem(last=False)
+            self.message_case_evicted(case, result)
+
+    def get_status(self, case: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets the status of an open case
+
+        Parameters
+        ----------------
+        case
+            Case
+
+        Returns
+        ---------------
+        dictio
+            Dictionary containing: the marking, the deviations found so far and whether the marking is accepting
+        """
+        case = str(case)
+        if case in self.case_dict:
+            state = self.case_dict[case]
+            return {"marking": self.decode_marking(state), "deviations": list(state.deviations),
+                    "no_dev_total": len(state.deviations),
+                    "is_accepting": CompiledSemantics.is_accepting(self.compiled, state.marking)}
+        else:
+            self.message_case_not_in_dictionary(case)
+
+    def decode_marking(self, state: CaseState) -> Marking:
+        return self.compiled.decode_marking(state.marking)
+
+    def terminate(self, case: str) -> Optional[Dict[str, Any]]:
+        """
+        Terminate a case, checking if the marking is accepting
+
+        Parameters
+        ----------------
+        case
+            Case ID
+
+        Returns
+        ---------------
+        dictio
+            Dictionary containing the same keys as the rule based conformance: no_constr_total, deviations,
+            no_dev_total, dev_fitness and is_fit
+        """
+        case = str(case)
+        if case in self.case_dict:
+            state = self.case_dict.pop(case)
+            if not CompiledSemantics.is_accepting(self.compiled, state.marking):
+                no_deviations = len(state.deviations)
+                self.set_graph_marking(state)
+                self.checker.accepting_checker(self.graph, state.response_origin, state.deviations,
+                                               parameters=self.parameters)
+                self.reset_graph_marking()
+                for deviation in state.deviations[no_deviations:]:
+                    self.message_deviation(case, None, deviation)
+            ret = {Outputs.NO_CONSTR_TOTAL.value: self.total_num_constraints,
+                   Outputs.DEVIATIONS.value: state.deviations,
+                   Outputs.NO_DEV_TOTAL.value: len(state.deviations)}
+            ret[Outputs.FITNESS.value] = 1 - ret[Outputs.NO_DEV_TOTAL.value] / ret[Outputs.NO_CONSTR_TOTAL.value]
+            ret[Outputs.IS_FIT.value] = ret[Outputs.NO_DEV_TOTAL.value] == 0
+            return ret
+        else:
+            self.message_case_not_in_dictionary(case)
+
+    def terminate_all(self):
+        """
+        Terminate all open cases
+        """
+        cases = list(self.case_dict.keys())
+        for case in cases:
+            self.terminate(case)
+
+    def message_case_or_activity_not_in_event(self, event: Dict[str, Any]):
+        """
+        Sends a message if the case or the activity are not
+        there in the event
+        """
+        logging.error("case or activities are none! " + str(event))
+
+    def message_deviation(self, case: str, activity: Optional[str], deviation: Tuple[str, Any]):
+        """
+        Sends a message when a deviation is found
+
+        Parameters
+        ---------------
+        case
+            Case
+        activity
+            Activity that caused the deviation, None for the deviations found when the case is terminated
+        deviation
+            Deviation
+        """
+        logging.error("deviation " + str(deviation) + " for the activity " + str(activity) + "! case: " + str(case))
+
+    def message_case_not_in_dictionary(self, case: str):
+        """
+        Sends a message if the provided case is not in the dictionary
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        logging.error("the case " + str(case) + " is not in the dictionary! case: " + str(case))
+
+    def message_case_evicted(self, case: str, result: Dict[str, Any]):
+        """
+        Sends a message if a case is terminated because it was idle for longer than the TTL
+
+        Parameters
+        ---------------
+        case
+            Case
+        result
+            Result of the case, as returned by terminate
+        """
+        logging.error("the case " + str(case) + " was idle for longer than the TTL and is terminated! case: " + str(case))
+
+    def _current_result(self):
+        """
+        Gets a diagnostics dataframe with the status of the open cases, and the results of the evicted cases
+        (with the response deviations found when they were terminated)
+
+        Returns
+        -------
+        diagn_df
+            Diagnostics dataframe
+        """
+        diagn_stream = []
+        for case, result in self.evicted_cases.items():
+            if case not in self.case_dict:
+                diagn_stream.append({"case": case, "is_fit": result[Outputs.IS_FIT.value],
+                                     "no_dev_total": result[Outputs.NO_DEV_TOTAL.value],
+                                     "dev_fitness": result[Outputs.FITNESS.value], "evicted": True})
+        for case, state in self.case_dict.items():
+            no_dev_total = len(state.deviations)
+            diagn_stream.append({"case": case, "is_fit": no_dev_total == 0, "no_dev_total": no_dev_total,
+                                 "dev_fitness": 1 - no_dev_total / self.total_num_constraints, "evicted": False})
+
+        return pandas_utils.instantiate_dataframe(diagn_stream)
+
+
+def apply(graph: Union[DcrGraph, DistributedDcrGraph], parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Method that creates the DcrStreamingConformance object
+
+    Parameters
+    ----------------
+    graph
+        DCR graph
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    ----------------
+    conf_stream_obj
+        Conformance streaming object
+    """
+    return DcrStreamingConformance(graph, parameters=parameters)
@@ -0,0 +1,85 @@
+import random
+import time
+from copy import deepcopy
+
+import pandas as pd
+
+from pm4py.algo.discovery.dcr_discover.variants.dcr_discover import Discover
+
+
+def generate_log(no_activities, no_cases, trace_length, seed=0):
+    # synthetic log, each case draws its activities from a few overlapping blocks of the alphabet
+    random.seed(seed)
+    activities = ["activity_" + str(i) for i in range(no_activities)]
+    block = max(2, no_activities // 10)
+    rows = []
+    for case in range(no_cases):
+        start = random.randrange(no_activities)
+        alphabet = [activities[(start + j) % no_activities] for j in range(block)]
+        for position in range(random.randint(1, trace_length)):
+            rows.append({"case:concept:name": str(case), "concept:name": random.choice(alphabet),
+                         "time:timestamp": pd.Timestamp("2024-01-01") + pd.Timedelta(minutes=position)})
+    return pd.DataFrame(rows)
+
+
+def set_based_optimize_relation(relation):
+    # previous implementation of Discover.optimizeRelation, on dicts of sets
+    relation = dict(sorted(relation.items(), key=lambda conditions: len(conditions[1]), reverse=True))
+    for eventA in relation:
+        for eventB in relation[eventA]:
+            relation[eventA] = relation[eventA].difference(relation[eventB])
+    return relation
+
+
+def set_based_additional_conditions(log_abstraction, graph):
+    # previous implementation of the replay mining the additional conditions, on sets
+    possibleConditions = deepcopy(log_abstraction['predecessor'])
+    for trace in log_abstraction['traces']:
+        localSeenBefore = set()
+        included = log_abstraction['events'].copy()
+        for event in trace:
+            excluded = log_abstraction['events'].difference(included)
+            validConditions = localSeenBefore.union(excluded)
+            possibleConditions[event] = possibleConditions[event].intersection(validConditions)
+            included = included.difference(graph['excludesTo'][event])
+            included = included.union(graph['includesTo'][event])
+            localSeenBefore.add(event)
+    conditions = deepcopy(graph['conditionsFor'])
+    for key in conditions:
+        conditions[key] = conditions[key].union(possibleConditions[key])
+    return set_based_optimize_relation(conditions)
+
+
+def benchmark_additional_conditions(configurations, repeat=3):
+    print("activities;cases;events;set based (ms);bitset based (ms);speedup")
+    for no_activities, no_cases, trace_length in configurations:
+        log = generate_log(no_activities, no_cases, trace_length)
+        disc = Discover()
+        disc.createLogAbstraction(log, "concept:name", "case:concept:name")
+        disc.mineFromAbstraction(findAdditionalConditions=False)
+        # the graph before the additional conditions, with the relations of all events
+        graph = deepcopy(disc.graph)
+        for relation in ['conditionsFor', 'excludesTo', 'includesTo']:
+            for event in disc.logAbstraction['events']:
+                graph[relation].setdefault(event, set())
+
+        set_times, bitset_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            expected = set_based_additional_conditions(disc.logAbstraction, graph)
+            set_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            new_disc = Discover()
+            new_disc.logAbstraction = disc.logAbstraction
+            new_disc.mineFromAbstraction(findAdditionalConditions=True)
+            bitset_times.append((time.perf_counter() - start) * 1000)
+            assert {k: v for k, v in expected.items() if v} == new_disc.graph['conditionsFor']
+
+        set_time, bitset_time = min(set_times), min(bitset_times)
+        print(f"{no_activities};{no_cases};{len(log)};{set_time:.1f};{bitset_time:.1f};{set_time / bitset_time:.1f}")
+
+
+if __name__ == "__main__":
+    # the bitset timings include the whole mining from the abstraction, the set based only the additional conditions
+    benchmark_additional_conditions([(50, 2000, 30), (200, 5000, 40), (400, 5000, 60)])
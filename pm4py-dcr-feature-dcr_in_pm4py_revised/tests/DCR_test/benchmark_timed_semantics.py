@@ -0,0 +1,168 @@
+import random
+import time
+from copy import deepcopy
+from datetime import timedelta
+
+from pm4py.objects.dcr.obj import dcr_template
+from pm4py.objects.dcr.semantics import DcrSemantics
+from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+from pm4py.objects.dcr.timed.semantics import TimedSemantics
+
+
+def generate_timed_graph(no_events, no_relations, seed=0):
+    # synthetic timed graph, the conditions going from lower to higher events such that the graph never deadlocks
+    random.seed(seed)
+    events = ["event_" + str(i) for i in range(no_events)]
+    template = deepcopy(dcr_template)
+    template['events'] = set(events)
+    template['labels'] = set(events)
+    template['labelMapping'] = {e: e for e in events}
+    template['marking']['included'] = set(events)
+    timing_dict = {}
+    for _ in range(no_relations):
+        i, j = sorted(random.sample(range(no_events), 2))
+        template['conditionsFor'].setdefault(events[j], set()).add(events[i])
+        timing_dict[('CONDITION', events[i], events[j])] = timedelta(minutes=random.randint(1, 120))
+        a, b = random.sample(events, 2)
+        template['responseTo'].setdefault(a, set()).add(b)
+        timing_dict[('RESPONSE', a, b)] = timedelta(hours=random.randint(1, 48))
+        a, b = random.sample(events, 2)
+        template['excludesTo' if random.random() < 0.5 else 'includesTo'].setdefault(a, set()).add(b)
+    return TimedDcrGraph(template, timing_dict=timing_dict)
+
+
+class ScanningTimedReplay(object):
+    # previous implementation of the timed semantics, on the time since the executions and until the deadlines,
+    # updated for every event on each time step and scanned to find the next deadline and delay
+    def __init__(self, graph):
+        self.graph = graph
+        self.executed_time = {}
+        self.pending_deadline = {}
+        self.can_execute_time = TimedSemantics.create_can_execute_time_dict(graph)
+
+    def enabled(self):
+        graph = self.graph
+        res = DcrSemantics.enabled(graph)
+        for e in set(res):
+            if e in graph.timedconditions:
+                for (e_prime, k) in graph.timedconditions[e].items():
+                    if (e_prime in graph.marking.included.intersection(graph.marking.executed) and
+                            self.executed_time[e_prime] < k):
+                        res.discard(e)
+        return res
+
+    def execute(self, event):
+        graph = self.graph
+        self.executed_time[event] = timedelta(0)
+        self.pending_deadline.pop(event, None)
+        for (e_prime, k) in graph.timedresponses.get(event, {}).items():
+            self.pending_deadline[e_prime] = k
+        DcrSemantics.execute(graph, event)
+
+    def time_step(self, tics):
+        deadline = self.next_deadline()
+        if deadline is None or tics <= deadline:
+            for e in self.pending_deadline:
+                self.pending_deadline[e] = max(self.pending_deadline[e] - tics, timedelta(0))
+            for e in self.graph.marking.executed:
+                self.executed_time[e] = min(self.executed_time[e] + tics, self.can_execute_time[e])
+
+    def next_deadline(self):
+        marking = self.graph.marking
+        next_deadline = None
+        for e in self.pending_deadline:
+            if e in marking.included and e in marking.pending:
+                if (next_deadline is None) or (self.pending_deadline[e] < next_deadline):
+                    next_deadline = self.pending_deadline[e]
+        return next_deadline
+
+    def next_delay(self):
+        graph = self.graph
+        next_delay = None
+        for e in graph.timedconditions:
+            for (e_prime, k) in graph.timedconditions[e].items():
+                if e_prime in graph.marking.included and e_prime in graph.marking.executed:
+                    delay = k - self.executed_time[e_prime]
+                    if delay > timedelta(0) and (next_delay is None or delay < next_delay):
+                        next_delay = delay
+        return next_delay
+
+
+class HeapTimedReplay(object):
+    def __init__(self, graph):
+        self.graph = graph
+
+    def enabled(self):
+        return TimedSemantics.enabled(self.graph)
+
+    def execute(self, event):
+        TimedSemantics.execute(self.graph, event)
+
+    def time_step(self, tics):
+        TimedSemantics.time_step(self.graph, tics)
+
+    def next_deadline(self):
+        return TimedSemantics.next_deadline(self.graph)
+
+    def next_delay(self):
+        return TimedSemantics.next_delay(self.graph)
+
+
+def random_run(graph, no_steps, seed=0):
+    # a long timed trace: waits for a random time within the next deadline, then executes a random enabled event,
+    # or waits for the next delay if no event is enabled
+    random.seed(seed)
+    replay = HeapTimedReplay(deepcopy(graph))
+    run = []
+    while len(run) < no_steps:
+        deadline = replay.next_deadline()
+        enabled = sorted(replay.enabled())
+        if enabled:
+            tics = timedelta(minutes=random.randint(0, 30))
+            if deadline is None or tics <= deadline:
+                run.append(tics)
+                replay.time_step(tics)
+            event = random.choice(sorted(replay.enabled()))
+            run.append(event)
+            replay.execute(event)
+        else:
+            tics = replay.next_delay()
+            assert tics is not None and (deadline is None or tics <= deadline)
+            run.append(tics)
+            replay.time_step(tics)
+    return run
+
+
+def replay_run(replay, run):
+    observed = []
+    for step in run:
+        if isinstance(step, timedelta):
+            replay.time_step(step)
+        else:
+            replay.execute(step)
+        observed.append((replay.next_deadline(), replay.next_delay(), len(replay.enabled())))
+    return observed
+
+
+def benchmark_timed_replay(configurations):
+    print("events;relations;steps;scanning (ms);heap based (ms);speedup")
+    for no_events, no_relations, no_steps in configurations:
+        graph = generate_timed_graph(no_events, no_relations)
+        run = random_run(graph, no_steps)
+
+        start = time.perf_counter()
+        expected = replay_run(ScanningTimedReplay(deepcopy(graph)), run)
+        scanning_time = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        observed = replay_run(HeapTimedReplay(deepcopy(graph)), run)
+        heap_time = (time.perf_counter() - start) * 1000
+        assert expected == observed
+
+        print(f"{no_events};{no_relations};{len(run)};{scanning_time:.1f};{heap_time:.1f};"
+              f"{scanning_time / heap_time:.1f}")
+
+
+if __name__ == "__main__":
+    # both timings include the untimed semantics of the enabled events, computed after each step
+    benchmark_timed_replay([(50, 100, 5000), (200, 400, 10000), (500, 1000, 10000)])
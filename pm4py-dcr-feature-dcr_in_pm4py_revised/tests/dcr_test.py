@@ -4,8 +4,9 @@ import pm4py
 import pandas as pd
 from pm4py.objects.dcr.obj import DcrGraph, dcr_template
 from pm4py.algo.discovery.dcr_discover.algorithm import apply
-from pm4py.algo.conformance.alignments.dcr.variants.optimal import Alignment
+from pm4py.algo.conformance.alignments.dcr.variants.optimal import Alignment, Parameters, Heuristics
 from pm4py.objects.conversion.log import converter as log_converter
+from pm4py.objects.log.obj import EventLog, Trace
 from pm4py.objects.dcr.importer import importer as dcr_importer
 from pm4py.objects.dcr.exporter import exporter as dcr_exporter
 
@@ -95,6 +96,65 @@ class TestDiscoveryDCR(unittest.TestCase):
         del log2
         del dcr2
 
+    def test_incremental_disCover(self):
+        import json
+        from pm4py.algo.discovery.dcr_discover.variants import dcr_discover
+        # given an event log split in two parts
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        cases = sorted(log['case:concept:name'].unique())
+        first = log[log['case:concept:name'].isin(cases[:3])]
+        second = log[log['case:concept:name'].isin(cases[3:])]
+        # when the abstraction of the first part is serialized, restored and updated with the second part
+        _, la = apply(first, dcr_discover)
+        la = dcr_discover.import_log_abstraction(json.loads(json.dumps(dcr_discover.export_log_abstraction(la))))
+        dcr1, _ = apply(second, dcr_discover, parameters={'log_abstraction': la})
+        # then the graph is the one discovered from the whole log
+        dcr2, _ = apply(log, dcr_discover)
+        self.assertEqual(dcr1.obj_to_template(), dcr2.obj_to_template())
+
+        del log
+        del first
+        del second
+        del la
+        del dcr1
+        del dcr2
+
+    def test_dataframe_abstraction_equals_event_log_abstraction(self):
+        from pm4py.algo.discovery.dcr_discover.variants import dcr_discover
+        # given an event log as dataframe and as event log
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        event_log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG)
+        # when the abstractions are created
+        _, la1 = apply(log, dcr_discover)
+        _, la2 = apply(event_log, dcr_discover)
+        # then the vectorized abstraction of the dataframe is the same
+        for key in la1:
+            if key == 'traces':
+                self.assertEqual(sorted(tuple(t) for t in la1[key]), sorted(tuple(t) for t in la2[key]))
+            else:
+                self.assertEqual(la1[key], la2[key])
+
+        del log
+        del event_log
+        del la1
+        del la2
+
+    def test_dataframe_variants_with_missing_activity(self):
+        from pm4py.algo.discovery.dcr_discover.variants.dcr_discover import Discover
+        # given a dataframe where a case has a missing activity
+        df = pd.DataFrame({"case:concept:name": ["1", "1", "2", "2"], "concept:name": ["A", None, "A", "B"]})
+        # when its variants are computed
+        activities, variants = Discover.getDataframeVariants(df, "concept:name", "case:concept:name")
+        # then the missing activity is not mapped to another activity
+        self.assertEqual(len(variants), 2)
+        self.assertIn(("A", "B"), variants)
+        self.assertNotIn(("A", "A"), variants)
+        self.assertEqual(len(activities), 3)
+
+        del df
+        del activities
+        del variants
+
     def test_role_mining(self):
         # given a DCR graph
         log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
@@ -123,6 +183,31 @@ class TestDiscoveryDCR(unittest.TestCase):
         del log
         del dcr
 
+    def test_pending_mining_dataframe(self):
+        from copy import deepcopy
+        from pm4py.algo.discovery.dcr_discover.extenstions.pending import PendingMining
+        # given a DCR graph and a log, both as event log and as dataframe
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        df = pm4py.convert_to_dataframe(log)
+        dcr, _ = apply(log)
+        # when mined for pending events from both inputs
+        from_log = PendingMining().mine(log, deepcopy(dcr), {})
+        from_df = PendingMining().mine(df, deepcopy(dcr), {})
+        replayed = list(PendingMining().replay_variants(df, dcr, {}))
+        # then the pending events are the same, and each variant is replayed once
+        self.assertEqual(from_log.marking.pending, from_df.marking.pending)
+        self.assertEqual(len(replayed), len(pm4py.get_variants(log)))
+        for variant, executed, excluded in replayed:
+            self.assertEqual(executed, set(variant))
+            self.assertTrue(excluded.issubset(dcr.marking.included))
+
+        del log
+        del df
+        del dcr
+        del from_log
+        del from_df
+        del replayed
+
     def test_nesting_mining(self):
         # given a DCR graph
         log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
@@ -135,6 +220,49 @@ class TestDiscoveryDCR(unittest.TestCase):
         del log
         del dcr
 
+    def test_choice_groups_are_disjoint_maximum_cliques(self):
+        from pm4py.algo.discovery.dcr_discover.extenstions.nesting import Choice
+        # given a graph where a, b, c and d exclude each other and themselves, and d, e as well
+        graph = DcrGraph()
+        graph.events = {'a', 'b', 'c', 'd', 'e'}
+        graph.excludes = {e: {'a', 'b', 'c', 'd'} for e in ['a', 'b', 'c', 'd']}
+        graph.excludes['d'].add('e')
+        graph.excludes['e'] = {'d', 'e'}
+        # when the choice groups are mined, with and without a time budget
+        choice = Choice()
+        choice.get_mutual_exclusions(graph)
+        budgeted = Choice(time_budget=0)
+        budgeted.get_mutual_exclusions(graph)
+        # then the largest clique is taken, and e is left alone as d is already in a group
+        self.assertEqual(choice.nesting_template['nestedgroups'], {'Choice1': {'a', 'b', 'c', 'd'}})
+        self.assertEqual(budgeted.nesting_template['nestedgroups'], {'Choice1': {'a', 'b', 'c', 'd'}})
+
+        del graph
+        del choice
+        del budgeted
+
+    def test_nesting_groups_events_with_shared_relations(self):
+        from pm4py.algo.discovery.dcr_discover.extenstions.nesting import Nesting
+        # given a graph where a and b both have a response to c
+        graph = DcrGraph()
+        graph.events = {'a', 'b', 'c'}
+        graph.responses = {'a': {'c'}, 'b': {'c'}}
+        # when nested
+        nesting = Nesting()
+        nesting.create_encoding(graph.obj_to_template())
+        nesting.nest(graph.events)
+        nesting.remove_redundant_nestings()
+        nested = nesting.get_nested_dcr_graph(graph)
+        # then a and b are grouped, and the group has the response to c
+        self.assertEqual(nesting.nesting_map, {'a': 'Group1', 'b': 'Group1'})
+        self.assertEqual(nesting.decode(nesting.enc['c']), {('Group1', 'responseTo', 'in')})
+        self.assertEqual(nested.nestedgroups, {'Group1': {'a', 'b'}})
+        self.assertEqual(nested.responses['Group1'], {'c'})
+
+        del graph
+        del nesting
+        del nested
+
     def test_time_mining(self):
         # given a DCR graph
         log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
@@ -148,6 +276,23 @@ class TestDiscoveryDCR(unittest.TestCase):
         del log
         del dcr
 
+    def test_time_mining_with_workers(self):
+        # given a DCR graph
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        # when the timings are mined in the calling process and by two worker processes
+        parameters = get_properties(log)
+        dcr1, _ = apply(log, post_process={'timed'}, parameters=parameters)
+        dcr2, _ = apply(log, post_process={'timed'}, parameters={**parameters, 'max_workers': 2})
+        # then the timings are the same
+        self.assertEqual(dcr1.timedconditions, dcr2.timedconditions)
+        self.assertEqual(dcr1.timedresponses, dcr2.timedresponses)
+        # and the minimum delay of a condition is found between consecutive events
+        self.assertEqual(dcr1.timedconditions['decide']['examine casually'], pd.Timedelta(days=1, minutes=46))
+
+        del log
+        del dcr1
+        del dcr2
+
     def test_all_post_process_mining(self):
         # given a DCR graph
         log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
@@ -329,6 +474,277 @@ class TestObjSematics(unittest.TestCase):
         del dcr
         del sem
 
+    def test_reachability_graph(self):
+        from pm4py.objects.dcr.utils import reachability_graph
+        # given a graph where a and b are conditions for each other, a is pending and c can always be executed
+        dcr = DcrGraph()
+        dcr.events = {'a', 'b', 'c'}
+        dcr.label_map = {'a': 'A', 'b': 'B', 'c': 'C'}
+        dcr.conditions = {'a': {'b'}, 'b': {'a'}}
+        dcr.marking.included = {'a', 'b', 'c'}
+        dcr.marking.pending = {'a'}
+        # when the state space is explored
+        state_space = reachability_graph.explore(dcr)
+        ts = reachability_graph.construct_reachability_graph(dcr)
+        bounded = reachability_graph.explore(dcr, parameters={'max_states': 1})
+        # then c can be executed forever without reaching an accepting marking, and a and b are never enabled
+        self.assertTrue(state_space.complete)
+        self.assertEqual(len(state_space), 2)
+        self.assertEqual(state_space.deadlocks(), set())
+        self.assertEqual(state_space.livelocks(), {0, 1})
+        self.assertEqual(state_space.dead_events(), {'a', 'b'})
+        self.assertEqual(len(ts.states), 2)
+        self.assertEqual({t.name for t in ts.transitions}, {'C'})
+        self.assertFalse(bounded.complete)
+        # and without c the initial marking is a deadlock
+        dcr.events.remove('c')
+        dcr.marking.included.remove('c')
+        self.assertEqual(reachability_graph.explore(dcr).deadlocks(), {0})
+
+        del dcr
+        del state_space
+        del ts
+        del bounded
+
+    def test_petri_net_conversion_cache(self):
+        import shutil
+        import tempfile
+        from pm4py.objects.dcr.utils.cache import ConversionCache
+        # given a DCR graph and a conversion cache on disk
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        path = tempfile.mkdtemp()
+        cache = ConversionCache(path=path)
+        # when the graph is converted twice with the cache, and again with a new cache on the same directory
+        net1, im1, _ = pm4py.convert_to_petri_net(dcr, conversion_cache=cache)
+        net2, im2, _ = pm4py.convert_to_petri_net(dcr, conversion_cache=cache)
+        net3, im3, _ = pm4py.convert_to_petri_net(dcr, conversion_cache=ConversionCache(path=path))
+        # then the graph is converted once, and the cached nets are copies of the same net
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        self.assertIsNot(net1, net2)
+        for net, im in [(net2, im2), (net3, im3)]:
+            self.assertEqual(sorted(p.name for p in net.places), sorted(p.name for p in net1.places))
+            self.assertEqual(sorted(t.name for t in net.transitions), sorted(t.name for t in net1.transitions))
+            self.assertEqual(sorted(p.name for p in im), sorted(p.name for p in im1))
+        # and other options, or another graph, are converted again
+        pm4py.convert_to_petri_net(dcr, conversion_cache=cache, preoptimize=False)
+        dcr.conditions.setdefault('pay compensation', set()).add('register request')
+        pm4py.convert_to_petri_net(dcr, conversion_cache=cache)
+        self.assertEqual((cache.misses, cache.hits), (3, 1))
+        shutil.rmtree(path)
+
+        del log
+        del dcr
+        del cache
+        del net1
+        del net2
+        del net3
+
+    def test_fast_playout(self):
+        from pm4py.algo.simulation.playout.dcr import algorithm as playout
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+        # given a DCR graph
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        parameters = {"noTraces": 50, "max_trace_length": 20, "seed": 7}
+        # when played out with the same seed, in one and in two processes, and as dataframe
+        log1 = playout.apply(dcr, variant=playout.Variants.FAST, parameters=parameters)
+        log2 = playout.apply(dcr, variant=playout.Variants.FAST,
+                             parameters={**parameters, "max_workers": 2, "batch_size": 10})
+        df = playout.apply(dcr, variant=playout.Variants.FAST, parameters={**parameters, "return_type": "dataframe"})
+        # then the traces are the same, and they are accepted by the graph
+        traces = [[e['concept:name'] for e in trace] for trace in log1]
+        self.assertEqual(len(traces), 50)
+        self.assertEqual(traces, [[e['concept:name'] for e in trace] for trace in log2])
+        self.assertEqual([e for trace in traces for e in trace], df['concept:name'].astype(str).tolist())
+        for res in conf_alg(df, dcr, parameters=None):
+            self.assertTrue(res['is_fit'])
+
+        del log
+        del dcr
+        del log1
+        del log2
+        del df
+        del traces
+
+    def test_timed_playout(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+        from pm4py.algo.simulation.playout.dcr import algorithm as playout
+        # given a timed DCR graph, B waiting 2 hours after A, and C due 1 day after A
+        template = deepcopy(dcr_template)
+        template['events'] = {'A', 'B', 'C'}
+        template['labels'] = {'A', 'B', 'C'}
+        template['labelMapping'] = {'A': 'A', 'B': 'B', 'C': 'C'}
+        template['marking']['included'] = {'A', 'B', 'C'}
+        template['conditionsFor'] = {'B': {'A'}}
+        template['responseTo'] = {'A': {'C'}}
+        dcr = TimedDcrGraph(template, timing_dict={('CONDITION', 'A', 'B'): pd.Timedelta(hours=2),
+                                                   ('RESPONSE', 'A', 'C'): pd.Timedelta(days=1)})
+        parameters = {"noTraces": 200, "max_trace_length": 15, "seed": 3, "return_type": "dataframe"}
+        # when played out, in one and in two processes
+        df1 = playout.apply(dcr, variant=playout.Variants.TIMED, parameters=parameters)
+        df2 = playout.apply(dcr, variant=playout.Variants.TIMED,
+                            parameters={**parameters, "max_workers": 2, "batch_size": 50})
+        # then the logs are the same, and every trace respects the delay and the deadline
+        self.assertTrue(df1.equals(df2))
+        for _, trace in df1.groupby("case:concept:name"):
+            self.assertTrue(trace["time:timestamp"].is_monotonic_increasing)
+            last_a, due = None, None
+            for act, timestamp in zip(trace["concept:name"].astype(str), trace["time:timestamp"]):
+                if due is not None:
+                    self.assertLessEqual(timestamp, due)
+                if act == 'A':
+                    last_a, due = timestamp, timestamp + pd.Timedelta(days=1)
+                elif act == 'B':
+                    self.assertGreaterEqual(timestamp - last_a, pd.Timedelta(hours=2))
+                else:
+                    due = None
+
+        del template
+        del dcr
+        del df1
+        del df2
+
+    def test_timed_semantics(self):
+        from copy import deepcopy
+        from datetime import timedelta
+        from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+        from pm4py.objects.dcr.timed.semantics import TimedSemantics
+        # given a timed DCR graph, B waiting 2 hours after A, and C due 1 day after A
+        template = deepcopy(dcr_template)
+        template['events'] = {'A', 'B', 'C'}
+        template['labels'] = {'A', 'B', 'C'}
+        template['labelMapping'] = {'A': 'A', 'B': 'B', 'C': 'C'}
+        template['marking']['included'] = {'A', 'B', 'C'}
+        template['conditionsFor'] = {'B': {'A'}}
+        template['responseTo'] = {'A': {'C'}}
+        dcr = TimedDcrGraph(template, timing_dict={('CONDITION', 'A', 'B'): timedelta(hours=2),
+                                                   ('RESPONSE', 'A', 'C'): timedelta(days=1)})
+        # when A is executed, and time passes
+        TimedSemantics.execute(dcr, 'A')
+        # then B waits for the delay, and time cannot pass the deadline of C
+        self.assertEqual(TimedSemantics.enabled(dcr), {'A', 'C'})
+        self.assertEqual(TimedSemantics.next_delay(dcr), timedelta(hours=2))
+        self.assertEqual(TimedSemantics.next_deadline(dcr), timedelta(days=1))
+        TimedSemantics.execute(dcr, timedelta(hours=3))
+        self.assertEqual(TimedSemantics.enabled(dcr), {'A', 'B', 'C'})
+        self.assertIsNone(TimedSemantics.next_delay(dcr))
+        self.assertEqual(dcr.marking.executed_time, {'A': timedelta(hours=3)})
+        self.assertEqual(dcr.marking.pending_deadline, {'C': timedelta(hours=21)})
+        # the times are derived from the clock, changing them in place fails
+        with self.assertRaises(TypeError):
+            dcr.marking.executed_time['A'] = timedelta(0)
+        with self.assertRaises(AttributeError):
+            dcr.marking.pending_deadline.pop('C')
+        TimedSemantics.execute(dcr, timedelta(days=1))
+        self.assertEqual(dcr.marking.clock, timedelta(hours=3))
+        # and executing A again restarts the delay and the deadline, executing C removes its deadline
+        TimedSemantics.execute(dcr, 'A')
+        self.assertEqual(TimedSemantics.enabled(dcr), {'A', 'C'})
+        self.assertEqual(TimedSemantics.next_deadline(dcr), timedelta(days=1))
+        TimedSemantics.execute(dcr, 'C')
+        self.assertIsNone(TimedSemantics.next_deadline(dcr))
+        self.assertTrue(TimedSemantics.is_accepting(dcr))
+
+        del template
+        del dcr
+
+    def test_compiled_semantics_agree_with_dcr_semantics(self):
+        # given a DCR graph discovered from the running example
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        from pm4py.objects.dcr.semantics import DcrSemantics
+        from pm4py.objects.dcr.compiled.semantics import CompiledSemantics
+        compiled = dcr.compile()
+        initial = {'executed': set(dcr.marking.executed), 'included': set(dcr.marking.included),
+                   'pending': set(dcr.marking.pending)}
+        # when every trace is replayed with both semantics
+        for _, trace in log.groupby("case:concept:name"):
+            marking = compiled.initial_marking
+            dcr.marking.reset(initial)
+            for act in trace["concept:name"]:
+                # then the enabled events and the markings should be the same
+                self.assertEqual(DcrSemantics.enabled(dcr), compiled.decode(CompiledSemantics.enabled(compiled, marking)))
+                self.assertEqual(DcrSemantics.is_enabled(act, dcr),
+                                 CompiledSemantics.is_enabled(compiled.index_of(act), compiled, marking))
+                DcrSemantics.execute(dcr, act)
+                marking = CompiledSemantics.execute(compiled, marking, compiled.index_of(act))
+                self.assertEqual(compiled.encode_marking(dcr.marking), marking)
+            self.assertEqual(DcrSemantics.is_accepting(dcr), CompiledSemantics.is_accepting(compiled, marking))
+
+        del log
+        del dcr
+        del compiled
+
+    def test_semantics_delegate_to_compiled(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.timed.semantics import TimedSemantics
+        # given a timed DCR graph discovered from the running example, and its compiled graph
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log, post_process={'timed'})
+        compiled = dcr.compile()
+        # when every trace is replayed with and without delegating to the compiled graph
+        for _, trace in log.groupby("case:concept:name"):
+            graph = deepcopy(dcr)
+            delegating = deepcopy(dcr)
+            for act in trace["concept:name"]:
+                # then the enabled events and the markings should be the same
+                self.assertEqual(TimedSemantics.enabled(graph), TimedSemantics.enabled(delegating, compiled=compiled))
+                TimedSemantics.execute(graph, act)
+                TimedSemantics.execute(delegating, act, compiled=compiled)
+                self.assertEqual(graph.marking.executed, delegating.marking.executed)
+                self.assertEqual(graph.marking.included, delegating.marking.included)
+                self.assertEqual(graph.marking.pending, delegating.marking.pending)
+                self.assertEqual(graph.marking.pending_deadline, delegating.marking.pending_deadline)
+            self.assertEqual(TimedSemantics.is_accepting(graph),
+                             TimedSemantics.is_accepting(delegating, compiled=compiled))
+
+        del log
+        del dcr
+        del compiled
+        del graph
+        del delegating
+
+    def test_semantics_keep_marking_as_masks(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.semantics import DcrSemantics
+        # given a DCR graph discovered from the running example, and its compiled graph counting the encodings
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        initial = deepcopy(dcr.marking)
+        compiled = dcr.compile()
+        encodings = []
+        encode_marking = compiled.encode_marking
+        compiled.encode_marking = lambda marking: encodings.append(marking) or encode_marking(marking)
+        trace = ["register request", "examine casually", "check ticket", "decide", "reject request"]
+        # when a trace is replayed delegating to the compiled graph
+        for act in trace:
+            DcrSemantics.enabled(dcr, compiled=compiled)
+            DcrSemantics.execute(dcr, act, compiled=compiled)
+        accepting = DcrSemantics.is_accepting(dcr, compiled=compiled)
+        # then the marking is encoded once, and its sets are those of the replay on the sets
+        self.assertEqual(len(encodings), 1)
+        reference = deepcopy(dcr)
+        reference.marking = deepcopy(initial)
+        for act in trace:
+            DcrSemantics.execute(reference, act)
+        self.assertEqual(dcr.marking.executed, reference.marking.executed)
+        self.assertEqual(dcr.marking.included, reference.marking.included)
+        self.assertEqual(dcr.marking.pending, reference.marking.pending)
+        self.assertEqual(accepting, DcrSemantics.is_accepting(reference))
+        # and assigning a set of the marking drops the masks
+        dcr.marking.included = set()
+        self.assertEqual(DcrSemantics.enabled(dcr, compiled=compiled), set())
+        self.assertEqual(len(encodings), 2)
+
+        del log
+        del dcr
+        del initial
+        del compiled
+        del reference
+        del encodings
+
     def test_label_mapping_to_activity(self):
         #given a simple dcr
         dcr = DcrGraph()
@@ -440,6 +856,264 @@ class TestConformanceDCR(unittest.TestCase):
         del dcr
         del conf_res
 
+    def test_rule_checking_variant_cache(self):
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+        from pm4py.objects.dcr.utils.cache import VariantCache
+
+        # given a DCR graph, a log with repeated variants and a variant cache
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        log = pm4py.convert_to_event_log(log)
+        log._list = log._list + [log[0], log[0]]
+        cache = VariantCache(maxsize=10)
+        # when conformance is checked twice with the cache
+        expected = conf_alg(log, dcr, parameters=None)
+        first = conf_alg(log, dcr, parameters={'variant_cache': cache})
+        second = conf_alg(log, dcr, parameters={'variant_cache': cache})
+        # then each variant is checked once, and the results match the results without cache
+        self.assertEqual(cache.misses, len(set(tuple(e['concept:name'] for e in t) for t in log)))
+        self.assertEqual(cache.hits, cache.misses)
+        self.assertEqual(expected, first)
+        self.assertEqual(expected, second)
+        # and the results of the cases of a variant are independent
+        first[0]['deviations'].append(('conditionViolation', ('a', 'b')))
+        self.assertEqual(expected[-1], first[-1])
+
+        del log
+        del dcr
+        del cache
+        del expected
+        del first
+        del second
+
+    def test_fingerprint_preserved_by_json_lines(self):
+        import json
+        from copy import deepcopy
+        from datetime import timedelta
+        from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+        from pm4py.objects.dcr.utils import serialization
+        from pm4py.objects.dcr.utils.cache import ConversionCache, VariantCache, graph_fingerprint
+        # given a timed DCR graph, with its durations as datetime.timedelta
+        template = deepcopy(dcr_template)
+        template['events'] = {'A', 'B', 'C'}
+        template['labels'] = {'A', 'B', 'C'}
+        template['labelMapping'] = {'A': 'A', 'B': 'B', 'C': 'C'}
+        template['marking']['included'] = {'A', 'B', 'C'}
+        template['conditionsFor'] = {'B': {'A'}}
+        template['responseTo'] = {'A': {'C'}}
+        dcr = TimedDcrGraph(template, timing_dict={('CONDITION', 'A', 'B'): timedelta(hours=2),
+                                                   ('RESPONSE', 'A', 'C'): timedelta(days=1)})
+        cache = VariantCache()
+        cache.put(graph_fingerprint(dcr), ('rule_based', ('A', 'C')), [])
+        # when it is written as JSON lines and read back, with its durations as pandas Timedelta
+        encoding = serialization.dumps_canonical(serialization.graph_to_dict(dcr))
+        dcr_imported = serialization.dict_to_graph(json.loads(encoding))
+        # then its fingerprint is its content hash, and the caches are hit
+        self.assertEqual(graph_fingerprint(dcr), serialization.content_hash(dcr))
+        self.assertEqual(graph_fingerprint(dcr), graph_fingerprint(dcr_imported))
+        self.assertEqual(cache.get(graph_fingerprint(dcr_imported), ('rule_based', ('A', 'C'))), [])
+        self.assertEqual(ConversionCache.key(dcr, "classic"), ConversionCache.key(dcr_imported, "classic"))
+
+        del template
+        del dcr
+        del dcr_imported
+        del cache
+        del encoding
+
+    def test_fingerprint_of_subclass(self):
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+        from pm4py.objects.dcr.utils import serialization
+        from pm4py.objects.dcr.utils.cache import ConversionCache, VariantCache, graph_fingerprint
+
+        class MyDcrGraph(DcrGraph):
+            pass
+
+        # given a graph of a user subclass of DcrGraph, with the content of a discovered graph
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        my_dcr = MyDcrGraph(dcr.obj_to_template())
+        cache = VariantCache()
+        # when it is fingerprinted, and its conformance is checked with a variant cache
+        res = conf_alg(log, my_dcr, parameters={'variant_cache': cache})
+        # then the fingerprint is stable and tells the class apart, and the cache is used
+        self.assertEqual(graph_fingerprint(my_dcr), graph_fingerprint(MyDcrGraph(dcr.obj_to_template())))
+        self.assertNotEqual(graph_fingerprint(my_dcr), graph_fingerprint(dcr))
+        self.assertEqual(len(ConversionCache.key(my_dcr, "classic")), 64)
+        self.assertEqual(res, conf_alg(log, dcr, parameters=None))
+        self.assertEqual(cache.misses, len(cache))
+        # and the graph still cannot be written as JSON lines
+        with self.assertRaises(TypeError):
+            serialization.graph_to_dict(my_dcr)
+
+        del log
+        del dcr
+        del my_dcr
+        del cache
+        del res
+
+    def test_rule_checking_unsorted_dataframe(self):
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+
+        # given a DCR graph and a dataframe with the events of the cases interleaved
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log[log['case:concept:name'].isin(['1', '2', '3'])])
+        unsorted = log.sort_values('time:timestamp', kind='stable')
+        # when conformance is checked on the dataframe
+        expected = conf_alg(pm4py.convert_to_event_log(log), dcr, parameters=None)
+        res = conf_alg(unsorted, dcr, parameters=None)
+        # then each case, in order of first occurrence, gets the result of its trace in the event log
+        expected = dict(zip(log['case:concept:name'].unique(), expected))
+        self.assertEqual([expected[case] for case in unsorted['case:concept:name'].unique()], res)
+
+        del log
+        del dcr
+        del unsorted
+        del expected
+        del res
+
+    def test_timed_rule_checking(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+        from pm4py.algo.conformance.dcr import algorithm as conformance
+        # given a timed DCR graph, B waiting 2 hours after A, and C due 1 day after A
+        template = deepcopy(dcr_template)
+        template['events'] = {'A', 'B', 'C'}
+        template['labels'] = {'A', 'B', 'C'}
+        template['labelMapping'] = {'A': 'A', 'B': 'B', 'C': 'C'}
+        template['marking']['included'] = {'A', 'B', 'C'}
+        template['conditionsFor'] = {'B': {'A'}}
+        template['responseTo'] = {'A': {'C'}}
+        dcr = TimedDcrGraph(template, timing_dict={('CONDITION', 'A', 'B'): pd.Timedelta(hours=2),
+                                                   ('RESPONSE', 'A', 'C'): pd.Timedelta(days=1)})
+        # and a log whose second case is not sorted by timestamp
+        start = pd.Timestamp("2024-01-01")
+        rows = [("1", "A", start), ("1", "B", start + pd.Timedelta(hours=3)), ("1", "C", start + pd.Timedelta(hours=5)),
+                ("2", "B", start + pd.Timedelta(hours=1)), ("2", "A", start), ("2", "C", start + pd.Timedelta(days=2)),
+                ("3", "A", start), ("3", "B", start + pd.Timedelta(hours=30)),
+                ("3", "C", start + pd.Timedelta(hours=31))]
+        df = pd.DataFrame(rows, columns=["case:concept:name", "concept:name", "time:timestamp"])
+        df["org:group"] = "clerk"
+        log = log_converter.apply(df, variant=log_converter.Variants.TO_EVENT_LOG)
+        # when checked with the timed conformance, as dataframe and as event log
+        res = conformance.apply(df, dcr, variant=conformance.Variants.TIMED)
+        res_log = conformance.apply(log, dcr, variant=conformance.Variants.TIMED)
+        # then the cases are replayed in the order of their timestamps, and the time violations are reported
+        timed = [[d for d in r['deviations'] if d[0] in ('delayViolation', 'deadlineViolation')] for r in res]
+        self.assertEqual(timed, [[], [('delayViolation', ('A', 'B')), ('deadlineViolation', ('A', 'C'))],
+                                 [('deadlineViolation', ('A', 'C'))]])
+        self.assertFalse(any(d[0] == 'conditionViolation' for r in res for d in r['deviations']))
+        self.assertEqual(res, res_log)
+
+        del template
+        del dcr
+        del df
+        del log
+        del res
+        del res_log
+        del timed
+
+    def test_timed_rule_checking_keeps_case_order(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.timed.obj import TimedDcrGraph
+        from pm4py.algo.conformance.dcr import algorithm as conformance
+        # given a timed DCR graph, B waiting 2 hours after A
+        template = deepcopy(dcr_template)
+        template['events'] = {'A', 'B'}
+        template['labels'] = {'A', 'B'}
+        template['labelMapping'] = {'A': 'A', 'B': 'B'}
+        template['marking']['included'] = {'A', 'B'}
+        template['conditionsFor'] = {'B': {'A'}}
+        dcr = TimedDcrGraph(template, timing_dict={('CONDITION', 'A', 'B'): pd.Timedelta(hours=2)})
+        # and a log whose first case starts after the second one, followed by an empty case
+        start = pd.Timestamp("2024-01-01")
+        rows = [("1", "A", start + pd.Timedelta(days=1)), ("1", "B", start + pd.Timedelta(days=1, hours=1)),
+                ("2", "A", start), ("2", "B", start + pd.Timedelta(hours=3))]
+        df = pd.DataFrame(rows, columns=["case:concept:name", "concept:name", "time:timestamp"])
+        df["org:group"] = "clerk"
+        log = log_converter.apply(df, variant=log_converter.Variants.TO_EVENT_LOG)
+        log.append(Trace())
+        # when checked with the timed conformance
+        res = conformance.apply(log, dcr, variant=conformance.Variants.TIMED)
+        # then there is a result per case, in the order of the log
+        self.assertEqual(len(res), 3)
+        timed = [[d for d in r['deviations'] if d[0] == 'delayViolation'] for r in res]
+        self.assertEqual(timed, [[('delayViolation', ('A', 'B'))], [], []])
+        self.assertTrue(res[2]['is_fit'])
+
+        del template
+        del dcr
+        del df
+        del log
+        del res
+        del timed
+
+    def test_streaming_conformance_equals_rule_checking(self):
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+        from pm4py.streaming.algo.conformance.dcr import algorithm as streaming_conf
+
+        # given a DCR graph discovered from part of a log, and the events of the log interleaved across cases
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log[log['case:concept:name'].isin(['1', '2', '3'])])
+        events = log.sort_values('time:timestamp', kind='stable').to_dict('records')
+        # when the events are received one at a time, and the cases terminated
+        expected = conf_alg(log, dcr, parameters=None)
+        stream = streaming_conf.apply(dcr)
+        for event in events:
+            stream.receive(event)
+        open_cases = stream.get()
+        results = [stream.terminate(case) for case in log['case:concept:name'].unique()]
+        # then each case gets the same result as the rule based conformance
+        self.assertEqual(len(open_cases), len(expected))
+        self.assertEqual(expected, results)
+        self.assertEqual(len(stream.case_dict), 0)
+        self.assertFalse(all(res['is_fit'] for res in results))
+
+        del log
+        del dcr
+        del events
+        del expected
+        del stream
+        del open_cases
+        del results
+
+    def test_streaming_conformance_keeps_evicted_results(self):
+        import time
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+        from pm4py.streaming.algo.conformance.dcr.variants.classic import DcrStreamingConformance
+
+        class RecordingConformance(DcrStreamingConformance):
+            def message_case_evicted(self, case, result):
+                evicted.append((case, result))
+
+        # given a DCR graph, and a case missing its last events, leaving a response pending
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log)
+        partial = log[log['case:concept:name'] == '1'].iloc[:2]
+        expected = conf_alg(partial, dcr, parameters=None)[0]
+        evicted = []
+        stream = RecordingConformance(dcr, parameters={"case_ttl": 60, "max_evicted_cases": 1})
+        for event in partial.to_dict('records'):
+            stream.receive(event)
+        # when the case is idle for longer than the TTL
+        stream.evict_idle_cases(time.monotonic() + 120)
+        # then its result, with the response deviations found when terminated, is kept and reported
+        self.assertEqual(len(stream.case_dict), 0)
+        self.assertEqual(evicted, [('1', expected)])
+        self.assertEqual(stream.evicted_cases['1'], expected)
+        self.assertTrue(any(deviation[0] == 'responseViolation' for deviation in expected['deviations']))
+        diagn_df = stream.get()
+        self.assertEqual(diagn_df['case'].tolist(), ['1'])
+        self.assertTrue(diagn_df['evicted'].tolist()[0])
+        self.assertEqual(diagn_df['no_dev_total'].tolist()[0], expected['no_dev_total'])
+
+        del log
+        del dcr
+        del partial
+        del expected
+        del evicted
+        del stream
+        del diagn_df
+
     def test_condition_violation(self):
         from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
 
@@ -689,6 +1363,39 @@ class TestConformanceDCR(unittest.TestCase):
         del dcr
         del conf_res
 
+    def test_role_index(self):
+        # given a DCR graph with roles
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log, post_process={'roles'}, group_key="org:resource")
+        from pm4py.algo.conformance.dcr.algorithm import apply as conf_alg
+
+        # when the roles of the events are looked up in the index
+        # then they are the roles assigned to them, and the principals are the ones of these roles
+        for event in dcr.events:
+            roles = {role for role, events in dcr.role_assignments.items() if event in events}
+            self.assertEqual(dcr.event_roles.get(event, set()), roles)
+            principals = set()
+            for role in roles:
+                principals.update(dcr.principals_assignments.get(role, set()))
+            self.assertEqual(dcr.event_principals.get(event, set()), principals)
+
+        # when a role is removed from the assignments and conformance is checked
+        role, events = next((role, events) for role, events in dcr.role_assignments.items() if events)
+        event = next(iter(events))
+        dcr.role_assignments[role] = events.difference({event})
+        parameters = get_properties(log, group_key="org:resource")
+        conf_res = conf_alg(log, dcr, parameters=parameters)
+
+        # then the index is rebuilt, and the deviations of each case are reported once
+        self.assertNotIn(role, dcr.event_roles.get(event, set()))
+        for i in conf_res:
+            self.assertEqual(len(i['deviations']), len(set(i['deviations'])))
+
+        del log
+        del dcr
+        del conf_res
+        del parameters
+
     def test_rule_checking_with_log_missing_resource(self):
         # Given an event log and discovering a dcr
         log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
@@ -787,6 +1494,43 @@ class TestConformanceDCR(unittest.TestCase):
         del res
         del collect
 
+    def test_pdc_evaluation(self):
+        import shutil
+        import tempfile
+        from copy import deepcopy
+        from pm4py.algo.evaluation.dcr import algorithm as evaluation
+        # given a PDC folder with a training log, and a ground truth log in which every other case is positive
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"), return_legacy_log_object=True)
+        base_dir = tempfile.mkdtemp()
+        for sub_folder in evaluation.SUB_FOLDERS:
+            os.makedirs(os.path.join(base_dir, "PDC", sub_folder))
+        pm4py.write_xes(log, os.path.join(base_dir, "PDC", "Training Logs", "log.xes"))
+        for i, trace in enumerate(log):
+            trace.attributes["pdc:isPos"] = i % 2 == 0
+        # with a negative case the model trained on the training log does not accept
+        trace = deepcopy(log[1])
+        trace.attributes["concept:name"] = "negative"
+        trace._list.reverse()
+        log.append(trace)
+        pm4py.write_xes(log, os.path.join(base_dir, "PDC", "Ground Truth Logs", "log.xes"))
+        output_path = os.path.join(base_dir, "results.csv")
+        # when it is scored with two configurations, in the calling process and on a pool of processes
+        res = evaluation.score_everything(base_dir, folders=["PDC"], special_folders=[], output_path=output_path)
+        res_parallel = evaluation.score_everything(base_dir, folders=["PDC"], special_folders=[], max_workers=2)
+        # then the model accepts the cases of the training log only, and the results are written
+        self.assertEqual(list(res["Algorithm"]), ["DisCoveR", "DisCoveR_pending"])
+        self.assertEqual(list(res[["TP", "FP", "TN", "FN"]].iloc[0]), [3, 3, 1, 0])
+        self.assertEqual(list(res["Training Fitness"]), [1.0, 1.0])
+        timings = ["Runtime", "Replay Runtime"]
+        self.assertTrue(res.drop(columns=timings).equals(res_parallel.drop(columns=timings)))
+        self.assertEqual(len(pd.read_csv(output_path)), 2)
+        shutil.rmtree(base_dir)
+
+        del log
+        del trace
+        del res
+        del res_parallel
+
 class TestAlignment(unittest.TestCase):
 
     def setUp(self):
@@ -882,6 +1626,153 @@ class TestAlignment(unittest.TestCase):
         del alignment_obj
         del aligned_traces
 
+    def test_alignment_states_are_hashable_markings(self):
+        # given a deviating trace
+        trace = [e["concept:name"] for e in self.first_trace]
+        trace[3] = "reject request"
+        initial_marking = str(self.dcr.marking)
+        graph_handler = self.create_graph_handler(self.dcr)
+        trace_handler = self.create_trace_handler(trace)
+        # when the trace is aligned
+        alignment_obj = Alignment(graph_handler, trace_handler)
+        aligned_traces = alignment_obj.apply_trace()
+        self.check_alignment_cost(aligned_traces)
+        # then the search states are (marking, trace position) tuples and the graph is left untouched
+        for marking, pos in alignment_obj.visited_states:
+            self.assertEqual(len(marking), 3)
+            self.assertTrue(0 <= pos <= len(trace))
+        self.assertEqual(initial_marking, str(self.dcr.marking))
+
+        del trace
+        del graph_handler
+        del trace_handler
+        del alignment_obj
+        del aligned_traces
+
+    def test_lower_bound_heuristic_preserves_costs(self):
+        # given deviating traces, with a swapped, a missing and an unknown activity
+        graph_handler = self.create_graph_handler(self.dcr)
+        traces = []
+        for trace in self.log:
+            activities = [e["concept:name"] for e in trace]
+            traces.append(activities[1:2] + activities[:1] + activities[2:])
+            traces.append(activities[:-1])
+            traces.append(activities + ["unknown activity"])
+        parameters = {Parameters.HEURISTIC: Heuristics.LOWER_BOUND}
+        for trace in traces:
+            # when aligned with and without the lower bound heuristic
+            trace_handler = self.create_trace_handler(trace)
+            expected = Alignment(graph_handler, trace_handler).apply_trace()
+            result = Alignment(graph_handler, trace_handler, parameters=parameters).apply_trace()
+            # then the optimal cost is the same
+            self.assertEqual(expected['cost'], result['cost'])
+
+        del graph_handler
+        del traces
+        del parameters
+
+    def test_anytime_alignment(self):
+        # given a trace with repeated deviations
+        graph_handler = self.create_graph_handler(self.dcr)
+        trace = ['register request'] * 3 + ['pay compensation', 'reject request', 'decide'] * 3 + \
+                ['reinitiate request'] * 2
+        trace_handler = self.create_trace_handler(trace)
+        expected = Alignment(graph_handler, trace_handler).apply_trace()
+        self.assertTrue(expected['optimal'])
+        self.assertEqual(expected['lower_bound'], expected['cost'])
+        for parameters in [{Parameters.MAX_STATES: 50}, {Parameters.MAX_TIME: 0.0}, {Parameters.BEAM_WIDTH: 3},
+                           {Parameters.MAX_STATES: 30, Parameters.HEURISTIC: Heuristics.LOWER_BOUND}]:
+            # when it is aligned within a budget or a beam width
+            result = Alignment(graph_handler, trace_handler, parameters=parameters).apply_trace()
+            # then an alignment of the whole trace is returned, marked as not optimal, with a lower bound
+            self.assertFalse(result['optimal'])
+            self.assertLessEqual(result['lower_bound'], expected['cost'])
+            self.assertLessEqual(expected['cost'], result['cost'])
+            self.assertLessEqual(result['cost'], len(trace))
+            self.assertEqual([move[1] for move in result['alignment'] if move[1] != '>>'],
+                             [self.dcr.get_event(activity) for activity in trace])
+        # and a budget large enough finds the optimal alignment
+        parameters = {Parameters.MAX_STATES: 400, Parameters.HEURISTIC: Heuristics.LOWER_BOUND}
+        result = Alignment(graph_handler, trace_handler, parameters=parameters).apply_trace()
+        self.assertTrue(result['optimal'])
+        self.assertEqual(expected['cost'], result['cost'])
+
+        del graph_handler
+        del trace_handler
+        del expected
+        del result
+
+    def test_prefix_trie_alignment(self):
+        from pm4py.algo.conformance.alignments.dcr import algorithm as alignment_alg
+        # given a log of deviating variants sharing their prefixes, with swapped, missing and unknown activities
+        log = EventLog()
+        for i, trace in enumerate(self.log):
+            activities = [e["concept:name"] for e in trace]
+            variants = [activities, activities[1:2] + activities[:1] + activities[2:], activities[:-1],
+                        activities + ["unknown activity"], activities[:3]]
+            for j, variant in enumerate(variants):
+                log.append(Trace([{"concept:name": a} for a in variant], attributes={"concept:name": f"{i}-{j}"}))
+        # when it is aligned with the optimal variant and sharing the prefixes
+        expected = alignment_alg.apply(log, self.dcr, variant=alignment_alg.Variants.OPTIMAL)
+        result = alignment_alg.apply(log, self.dcr, variant=alignment_alg.Variants.PREFIX_TRIE)
+        # then the costs and fitness are the same, for fewer states searched
+        self.assertEqual([r['cost'] for r in expected], [r['cost'] for r in result])
+        self.assertEqual([r['fitness'] for r in expected], [r['fitness'] for r in result])
+        self.assertLess(sum(r['closed'] for r in result), sum(r['closed'] for r in expected))
+        for trace, res in zip(log, result):
+            self.assertTrue(res['optimal'])
+            self.assertEqual([move[1] for move in res['alignment'] if move[1] != '>>'],
+                             [self.dcr.get_event(e["concept:name"]) for e in trace])
+
+        del log
+        del expected
+        del result
+
+    def test_log_variant_cache(self):
+        from pm4py.objects.dcr.utils.cache import VariantCache
+
+        # given a variant cache
+        cache = VariantCache()
+        # when the log is aligned twice with the cache
+        first = pm4py.optimal_alignment_dcr(self.log, self.dcr, variant_cache=cache)
+        second = pm4py.optimal_alignment_dcr(self.log, self.dcr, variant_cache=cache)
+        # then the second alignment only reuses the cached variants
+        self.assertEqual(len(cache), cache.misses)
+        self.assertEqual(cache.hits, len(self.log))
+        self.assertEqual([row['cost'] for row in first], [row['cost'] for row in second])
+
+        del cache
+        del first
+        del second
+
+    def test_multiprocess_alignment_preserves_case_order(self):
+        from pm4py.algo.conformance.alignments.dcr.variants import optimal_multithreaded
+
+        from pm4py.algo.conformance.alignments.dcr.variants import optimal
+
+        # given a log with a deviating case and an empty case in the middle
+        log = EventLog([trace for trace in self.log])
+        log.append(Trace([event for event in self.log[1]][1:]))
+        log.append(Trace())
+        log.append(self.log[0])
+        # when the log is aligned by the worker pool
+        expected = optimal.apply(log, self.dcr)
+        log_alignment = optimal_multithreaded.LogAlignment(log, parameters={"max_workers": 2})
+        result = log_alignment.perform_log_alignment(self.dcr, parameters={})
+        # then there is one result per case, in the order of the cases, and the throughput of the workers is reported
+        self.assertEqual(len(result), len(log))
+        self.assertEqual([row['cost'] for row in expected], [row['cost'] for row in result])
+        self.assertEqual(len(optimal_multithreaded.apply_original(log, self.dcr)), len(log))
+        self.assertEqual(sum(stats['variants'] for stats in log_alignment.worker_stats.values()), len(log) - 1)
+        # and the alignments of the cases of a variant are independent
+        result[-1]['alignment'].append(('>>', 'extra'))
+        self.assertEqual(result[0]['alignment'], expected[0]['alignment'])
+
+        del log
+        del expected
+        del log_alignment
+        del result
+
     def test_log_simple_interface(self):
         log_path = os.path.join("input_data", "running-example.xes")
         self.log = pm4py.read_xes(log_path)
@@ -1111,6 +2002,52 @@ class TestImportExportDCR(unittest.TestCase):
         del log
         del dcr_imported_after_export
 
+    def test_import_export_json_lines(self):
+        from copy import deepcopy
+        from pm4py.objects.dcr.utils.serialization import content_hash
+        from pm4py.objects.dcr.timed.semantics import TimedSemantics
+        from pm4py.objects.dcr.importer.variants import json_lines
+        # given a timed DCR graph with roles, and a marking after executing an event
+        log = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        dcr, _ = pm4py.discover_dcr(log, post_process={'roles', 'timed'}, group_key="org:resource")
+        marking = deepcopy(dcr.marking)
+        dcr_copy = deepcopy(dcr)
+        TimedSemantics.execute(dcr_copy, "register request")
+        markings = {"1": marking, "2": dcr_copy.marking}
+
+        # when the graph is exported with the markings, compressed, and imported
+        self.test_file = os.path.join("test_output_data", "running_example.jsonl.gz")
+        dcr_exporter.apply(dcr, self.test_file, variant=dcr_exporter.JSON_LINES, markings=markings)
+        dcr_imported = dcr_importer.apply(self.test_file, variant=dcr_importer.JSON_LINES)
+        _, markings_imported = json_lines.import_with_markings(self.test_file)
+
+        # then the graph, its class, its hash and the markings are preserved
+        self.assertIs(type(dcr_imported), type(dcr))
+        self.assertEqual(dcr, dcr_imported)
+        self.assertEqual(dcr.role_assignments, dcr_imported.role_assignments)
+        self.assertEqual(dcr.timedconditions, dcr_imported.timedconditions)
+        self.assertEqual(dcr.timedresponses, dcr_imported.timedresponses)
+        self.assertEqual(content_hash(dcr), content_hash(dcr_imported))
+        self.assertEqual(set(markings_imported.keys()), {"1", "2"})
+        for case in markings:
+            self.assertEqual(markings[case].executed, markings_imported[case].executed)
+            self.assertEqual(markings[case].included, markings_imported[case].included)
+            self.assertEqual(markings[case].pending, markings_imported[case].pending)
+            self.assertEqual(markings[case].pending_deadline, markings_imported[case].pending_deadline)
+
+        # and a modified file is rejected
+        content = dcr_exporter.Variants.JSON_LINES.value.export_to_string(dcr)
+        content = content.replace('"register request"', '"register"')
+        with self.assertRaises(ValueError):
+            dcr_importer.deserialize(content, variant=dcr_importer.JSON_LINES)
+
+        del log
+        del dcr
+        del dcr_copy
+        del dcr_imported
+        del markings
+        del markings_imported
+
     def export_file_simple(self, event_log_file):
         log = pm4py.read_xes(event_log_file)
         dcr, _ = apply(log)